@@ -11,14 +11,37 @@ Setup
 1. Get an API key at https://console.anthropic.com
 2. Add it to .env:  ANTHROPIC_API_KEY=sk-ant-...
 3. If the key is absent the client returns a neutral mock response.
+
+Prompt format
+-------------
+With AI_COMPACT_PROMPT (default) single and batch requests share one
+system prompt — instructions plus a static legend of the indicator
+columns — and each pair is one pipe-separated table row.  With
+AI_PROMPT_CACHE that system prompt is marked as a cacheable prefix, so
+after the first call it is billed as a cache read.  The API only caches
+prefixes above a model-dependent minimum length; ``usage_stats()`` and the
+``ues_ai_tokens_total`` counters show what was actually read from cache.
+Replies end at the ``END`` stop sequence.  AI_COMPACT_PROMPT=0 restores the
+verbose per-pair prompts for comparison.
 """
 
+import asyncio
 import logging
+import threading
+import time
+from typing import NamedTuple
 import anthropic
-from config.settings import AI_MODEL, AI_MAX_TOKENS
+from config.settings import (
+    AI_MODEL, AI_MAX_TOKENS, AI_BATCH_MAX_TOKENS, AI_COMPACT_PROMPT, AI_PROMPT_CACHE,
+    RSI_PERIOD, STOCH_PERIOD, CCI_PERIOD, EMA_FAST, EMA_SLOW, ADX_PERIOD, ATR_PERIOD,
+)
+from apis.ai_cache import ConfirmationCache, quantize_state
+from utils.metrics import AI_CALLS, AI_TOKENS, STAGE_SECONDS
 
 logger = logging.getLogger(__name__)
 
+_T_REQUEST = STAGE_SECONDS.labels("ai_request")   # one API round trip
+
 # System prompt that constrains Claude to give structured, concise trade analysis
 _SYSTEM_PROMPT = """You are a professional forex trading analyst assistant embedded in
 an algorithmic scalping system. You receive:
@@ -36,6 +59,67 @@ Respond ONLY in this exact format (no extra text):
 SCORE: <integer 0-20>
 ANALYSIS: <2-3 sentence qualitative comment>"""
 
+# Batch variant: one request covers every candidate pair of a cycle
+_BATCH_SYSTEM_PROMPT = """You are a professional forex trading analyst assistant embedded in
+an algorithmic scalping system. You receive several candidate trades at once.
+Each starts with a "PAIR: <symbol>" line followed by:
+  - Key technical indicator values
+  - A direction bias (BUY / SELL / HOLD) produced by the technical model
+  - A recent news headline about that pair
+
+For EVERY pair give a concise second opinion (2-3 sentences maximum) and assign a
+confidence boost score from 0 to 20 (integer) that will be added to the technical
+score.  Score 0 means you disagree or see no confirmation; score 20 means you strongly
+confirm the signal.  Judge each pair on its own data.
+
+Respond ONLY with one block per pair, in the order given, in this exact format:
+PAIR: <symbol>
+SCORE: <integer 0-20>
+ANALYSIS: <2-3 sentence qualitative comment>"""
+
+
+# Compact variant: one system prompt for single and batch requests, so the
+# whole of it is a stable, cacheable prefix; pairs arrive as table rows
+_COMPACT_SYSTEM_PROMPT = f"""You are a professional forex trading analyst assistant embedded in
+an algorithmic scalping system. You receive one or more candidate trades as
+rows of a pipe-separated table with these columns:
+
+pair|bias|price|rsi|stoch|cci|macd|adx|atr_pips|ema_fast|ema_slow|headline
+
+  pair      currency pair symbol
+  bias      direction bias (BUY / SELL / HOLD) produced by the technical model
+  price     last close
+  rsi       RSI({RSI_PERIOD}), 0-100; above 70 overbought, below 30 oversold
+  stoch     Stochastic %K({STOCH_PERIOD}), 0-100; above 80 overbought, below 20 oversold
+  cci       CCI({CCI_PERIOD}); beyond +100 / -100 marks a strong move
+  macd      MACD line; the sign gives the momentum direction
+  adx       ADX({ADX_PERIOD}) trend strength; above 25 trending, below 20 ranging
+  atr_pips  ATR({ATR_PERIOD}) in pips, the typical bar range
+  ema_fast  EMA({EMA_FAST}); above ema_slow is bullish, below is bearish
+  ema_slow  EMA({EMA_SLOW})
+  headline  most relevant recent news headline for the pair
+
+For EVERY row give a concise second opinion (2-3 sentences maximum) and assign a
+confidence boost score from 0 to 20 (integer) that will be added to the technical
+score.  Score 0 means you disagree or see no confirmation; score 20 means you strongly
+confirm the signal.  Judge each pair on its own data.
+
+Respond ONLY with one block per row, in the order given, in this exact format,
+then a last line containing only END:
+PAIR: <symbol>
+SCORE: <integer 0-20>
+ANALYSIS: <2-3 sentence qualitative comment on one line>"""
+
+_STOP_SEQUENCE = "\nEND"
+
+
+class ConfirmRequest(NamedTuple):
+    """One candidate pair for confirm_batch()."""
+    symbol:    str
+    data:      dict
+    direction: str
+    headline:  str
+
 
 class AIAnalysisClient:
     """
@@ -45,20 +129,51 @@ class AIAnalysisClient:
     -------
     confirm_signal(symbol, data, direction, headline) → (int, str)
         Returns (ai_bonus_score, analysis_text).
-        Falls back to (0, "AI unavailable") on any error.
+        Falls back to a mock answer on any error.
+        Answers are memoised in ``cache`` keyed on the quantised state.
+
+    confirm_signal_async(symbol, data, direction, headline) → (int, str)
+        Awaitable confirm_signal(); the API call runs in a worker thread.
+
+    confirm_batch(requests) → dict[str, (int, str)]
+        One Claude round trip for every candidate pair of a cycle.
+
+    request(requests, timeout) → (dict[str, (int, str)], int)
+        One bare round trip (single or batch prompt) whose API errors
+        propagate; used by ConfirmationScheduler (apis/ai_scheduler.py).
+
+    usage_stats() → dict
+        Tokens (input, output, cache reads / writes) and seconds per
+        request and per confirmed pair, from the API's usage reports.
     """
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        cache: ConfirmationCache | None = None,
+        base_url: str | None = None,
+    ) -> None:
         self._key = api_key
+        self.cache = cache if cache is not None else ConfirmationCache()
         self._client: anthropic.Anthropic | None = None
         if api_key:
             try:
-                self._client = anthropic.Anthropic(api_key=api_key)
+                # No SDK retries: ConfirmationScheduler retries against its rate budget
+                self._client = anthropic.Anthropic(api_key=api_key, base_url=base_url or None,
+                                                   max_retries=0)
             except Exception as exc:
                 logger.warning("Failed to initialise Anthropic client: %s", exc)
+        self._usage = dict.fromkeys(
+            ("requests", "pairs", "input", "output", "cache_read", "cache_write", "seconds"), 0)
+        self._usage_lock = threading.Lock()
 
     # ── Public ────────────────────────────────────────────────────────────────
 
+    @property
+    def live(self) -> bool:
+        """True when confirmations go to the API rather than the mock."""
+        return self._client is not None
+
     def confirm_signal(
         self,
         symbol: str,
@@ -72,7 +187,7 @@ class AIAnalysisClient:
         Parameters
         ----------
         symbol    : e.g. "EURUSD"
-        data      : indicator dict from IndicatorEngine
+        data      : IndicatorSnapshot from IndicatorEngine
         direction : "BUY" | "SELL" | "HOLD"
         headline  : top news headline for this pair
 
@@ -81,34 +196,209 @@ class AIAnalysisClient:
         (bonus_score, analysis_text)
         """
         if self._client is None:
+            AI_CALLS.labels("single", "no_client").inc()
             return self._mock_response(direction)
 
-        prompt = self._build_prompt(symbol, data, direction, headline)
+        cached = self.cache.get(quantize_state(symbol, data, direction, headline))
+        if cached is not None:
+            AI_CALLS.labels("single", "cache_hit").inc()
+            return cached
+
         try:
-            message = self._client.messages.create(
-                model=AI_MODEL,
-                max_tokens=AI_MAX_TOKENS,
-                system=_SYSTEM_PROMPT,
-                messages=[{"role": "user", "content": prompt}],
-            )
-            raw = message.content[0].text.strip()
-            return self._parse_response(raw)
-
-        except anthropic.APIConnectionError:
+            answers, _ = self.request([ConfirmRequest(symbol, data, direction, headline)])
+            return answers[symbol]
+
+        except anthropic.APIConnectionError as exc:
             logger.warning("Anthropic API connection error — using mock")
-        except anthropic.RateLimitError:
+            failure = exc
+        except anthropic.RateLimitError as exc:
             logger.warning("Anthropic rate limit hit — using mock")
+            failure = exc
         except anthropic.APIStatusError as exc:
             logger.warning("Anthropic API error %s — using mock", exc.status_code)
+            failure = exc
         except Exception as exc:
             logger.warning("Unexpected AI error: %s", exc)
+            failure = exc
 
+        AI_CALLS.labels("single", type(failure).__name__).inc()
         return self._mock_response(direction)
 
+    async def confirm_signal_async(
+        self,
+        symbol: str,
+        data: dict,
+        direction: str,
+        headline: str,
+    ) -> tuple[int, str]:
+        """Awaitable confirm_signal() for the asyncio run mode."""
+        return await asyncio.to_thread(
+            self.confirm_signal, symbol, data, direction, headline
+        )
+
+    def confirm_batch(self, requests: list[ConfirmRequest]) -> dict[str, tuple[int, str]]:
+        """
+        Confirm every candidate pair of a cycle with a single Claude request.
+
+        Cached answers are served first; the rest share one prompt that asks
+        for a PAIR / SCORE / ANALYSIS block each.  A pair whose block is
+        missing or malformed falls back to its own confirm_signal() call.
+
+        Returns
+        -------
+        {symbol: (bonus_score, analysis_text)}
+        """
+        if self._client is None:
+            AI_CALLS.labels("batch", "no_client").inc()
+            return {r.symbol: self._mock_response(r.direction) for r in requests}
+
+        results: dict[str, tuple[int, str]] = {}
+        pending: list[ConfirmRequest] = []
+        for req in requests:
+            cached = self.cache.get(quantize_state(*req))
+            if cached is not None:
+                results[req.symbol] = cached
+            else:
+                pending.append(req)
+
+        if len(pending) == 1:
+            results[pending[0].symbol] = self.confirm_signal(*pending[0])
+            return results
+        if not pending:
+            return results
+
+        try:
+            answers, _ = self.request(pending)
+        except anthropic.APIConnectionError as exc:
+            logger.warning("Anthropic API connection error — using mock for batch")
+            answers = None
+            AI_CALLS.labels("batch", type(exc).__name__).inc()
+        except anthropic.RateLimitError as exc:
+            logger.warning("Anthropic rate limit hit — using mock for batch")
+            answers = None
+            AI_CALLS.labels("batch", type(exc).__name__).inc()
+        except anthropic.APIStatusError as exc:
+            logger.warning("Anthropic API error %s — using mock for batch", exc.status_code)
+            answers = None
+            AI_CALLS.labels("batch", type(exc).__name__).inc()
+        except Exception as exc:
+            logger.warning("Unexpected AI error: %s", exc)
+            answers = None
+            AI_CALLS.labels("batch", type(exc).__name__).inc()
+
+        if answers is None:
+            for req in pending:
+                results[req.symbol] = self._mock_response(req.direction)
+            return results
+
+        for req in pending:
+            section = answers.get(req.symbol)
+            if section is None:
+                logger.info("No valid batch block for %s — confirming individually", req.symbol)
+                results[req.symbol] = self.confirm_signal(*req)
+            else:
+                results[req.symbol] = section
+        return results
+
+    def request(
+        self,
+        requests: list[ConfirmRequest],
+        timeout: float | None = None,
+    ) -> tuple[dict[str, tuple[int, str]], int]:
+        """
+        One Claude round trip for *requests* — the single-pair prompt for one,
+        the batch prompt for several — without cache lookup, retries or mock
+        fallback: API errors propagate.  Parsed answers are cached.
+
+        Returns
+        -------
+        ({symbol: (bonus_score, analysis_text)}, tokens used)
+            A batch reply may leave pairs out; a single reply without a
+            SCORE line comes back as (0, raw text) and is not cached.
+        """
+        system, prompt, max_tokens = self._prompt(requests)
+        options = {"timeout": timeout} if timeout is not None else {}
+        if AI_COMPACT_PROMPT:
+            options["stop_sequences"] = [_STOP_SEQUENCE]
+        started = time.perf_counter_ns()
+        message = self._client.messages.create(
+            model=AI_MODEL,
+            max_tokens=max_tokens,
+            system=([{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+                    if AI_PROMPT_CACHE else system),
+            messages=[{"role": "user", "content": prompt}],
+            **options,
+        )
+        elapsed = time.perf_counter_ns() - started
+        _T_REQUEST.observe_ns(elapsed)
+        raw = message.content[0].text.strip()
+        used = self._record_usage(message.usage, len(requests), elapsed)
+
+        if len(requests) == 1:
+            req = requests[0]
+            result = self._parse_response(raw)
+            if self._parse_fields(raw.splitlines())[0] is not None:
+                self.cache.put(quantize_state(*req), result)   # never memoise unparseable replies
+                AI_CALLS.labels("single", "ok").inc()
+            else:
+                AI_CALLS.labels("single", "unparsed").inc()
+            return {req.symbol: result}, used
+
+        AI_CALLS.labels("batch", "ok").inc()
+        parsed = self._parse_batch_response(raw)
+        answers: dict[str, tuple[int, str]] = {}
+        for req in requests:
+            section = parsed.get(req.symbol.upper())
+            if section is None:
+                AI_CALLS.labels("batch", "missing_block").inc()
+            else:
+                self.cache.put(quantize_state(*req), section)
+                answers[req.symbol] = section
+        return answers, used
+
+    def estimate_tokens(self, requests: list[ConfirmRequest]) -> int:
+        """Upper-bound cost of request(): prompt characters / 4 plus the reply allowance."""
+        system, prompt, max_tokens = self._prompt(requests)
+        return (len(system) + len(prompt)) // 4 + max_tokens
+
+    def usage_stats(self) -> dict[str, float]:
+        with self._usage_lock:
+            usage = dict(self._usage)
+        requests, pairs = usage["requests"], usage["pairs"]
+        prompt = usage["input"] + usage["cache_read"] + usage["cache_write"]
+        return {
+            **usage,
+            "seconds":             round(usage["seconds"], 3),
+            "seconds_per_request": round(usage["seconds"] / requests, 4) if requests else 0.0,
+            "input_per_pair":      round(prompt / pairs, 1) if pairs else 0.0,
+            "output_per_pair":     round(usage["output"] / pairs, 1) if pairs else 0.0,
+            "cache_read_ratio":    round(usage["cache_read"] / prompt, 3) if prompt else 0.0,
+        }
+
     # ── Private ───────────────────────────────────────────────────────────────
 
+    def _record_usage(self, usage, pairs: int, elapsed_ns: int) -> int:
+        """Count one reply's token usage; returns the tokens charged to the rate budget."""
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+        AI_TOKENS.labels("input").inc(usage.input_tokens)
+        AI_TOKENS.labels("output").inc(usage.output_tokens)
+        AI_TOKENS.labels("cache_read").inc(cache_read)
+        AI_TOKENS.labels("cache_write").inc(cache_write)
+        with self._usage_lock:
+            totals = self._usage
+            totals["requests"] += 1
+            totals["pairs"] += pairs
+            totals["input"] += usage.input_tokens
+            totals["output"] += usage.output_tokens
+            totals["cache_read"] += cache_read
+            totals["cache_write"] += cache_write
+            totals["seconds"] += elapsed_ns / 1e9
+        # cache reads do not count toward the input-token rate limit
+        return usage.input_tokens + cache_write + usage.output_tokens
+
     @staticmethod
-    def _build_prompt(symbol: str, data: dict, direction: str, headline: str) -> str:
+    def _describe_pair(symbol: str, data: dict, direction: str, headline: str) -> str:
         return (
             f"Pair: {symbol}\n"
             f"Direction bias: {direction}\n"
@@ -116,30 +406,97 @@ class AIAnalysisClient:
             f"RSI: {data['rsi']:.1f}  |  Stochastic: {data['stoch']:.1f}  |  CCI: {data['cci']:.0f}\n"
             f"MACD: {data['macd']:+.5f}  |  ADX: {data['adx']:.1f}  |  ATR: {data['atr']*10000:.1f} pips\n"
             f"EMA fast/slow: {data['ema_fast']:.5f} / {data['ema_slow']:.5f}\n"
-            f"News headline: {headline}\n\n"
+            f"News headline: {headline}\n"
+        )
+
+    @staticmethod
+    def _row(symbol: str, data: dict, direction: str, headline: str) -> str:
+        """One pair as a row of the compact table (column order of _COMPACT_SYSTEM_PROMPT)."""
+        return (
+            f"{symbol}|{direction}|{data['price']:.5f}|{data['rsi']:.1f}|{data['stoch']:.1f}|"
+            f"{data['cci']:.0f}|{data['macd']:+.5f}|{data['adx']:.1f}|{data['atr']*10000:.1f}|"
+            f"{data['ema_fast']:.5f}|{data['ema_slow']:.5f}|{headline.replace('|', '/')}"
+        )
+
+    @classmethod
+    def _prompt(cls, requests: list[ConfirmRequest]) -> tuple[str, str, int]:
+        """System prompt, user prompt and max_tokens for one request()."""
+        max_tokens = min(AI_BATCH_MAX_TOKENS, AI_MAX_TOKENS * len(requests))
+        if AI_COMPACT_PROMPT:
+            rows = "\n".join(cls._row(*r) for r in requests)
+            return _COMPACT_SYSTEM_PROMPT, rows + "\n\nReview every row.", max_tokens
+        if len(requests) == 1:
+            return _SYSTEM_PROMPT, cls._build_prompt(*requests[0]), max_tokens
+        return _BATCH_SYSTEM_PROMPT, cls._build_batch_prompt(requests), max_tokens
+
+    @classmethod
+    def _build_prompt(cls, symbol: str, data: dict, direction: str, headline: str) -> str:
+        return (
+            cls._describe_pair(symbol, data, direction, headline) + "\n"
             "Please evaluate whether this trade signal is supported by the technical "
             "picture and the news, then provide your SCORE and ANALYSIS."
         )
 
-    @staticmethod
-    def _parse_response(raw: str) -> tuple[int, str]:
-        """Extract SCORE and ANALYSIS from Claude's formatted response."""
-        score = 0
-        analysis = raw  # fallback: return raw text
+    @classmethod
+    def _build_batch_prompt(cls, requests: list[ConfirmRequest]) -> str:
+        blocks = [
+            f"PAIR: {r.symbol}\n" + cls._describe_pair(*r).split("\n", 1)[1]
+            for r in requests
+        ]
+        return (
+            "\n".join(blocks) + "\n"
+            "For each pair above, evaluate whether its trade signal is supported by "
+            "the technical picture and the news, then provide a PAIR, SCORE and "
+            "ANALYSIS block."
+        )
 
-        for line in raw.splitlines():
+    @staticmethod
+    def _parse_fields(lines: list[str]) -> tuple[int | None, str | None]:
+        """SCORE (clamped 0-20) and ANALYSIS from response lines; None if absent."""
+        score: int | None = None
+        analysis: str | None = None
+        for line in lines:
             line = line.strip()
             if line.upper().startswith("SCORE:"):
                 try:
-                    score = int(line.split(":", 1)[1].strip())
+                    score = int(line.split(":", 1)[1].strip(" *"))
                     score = max(0, min(20, score))
                 except ValueError:
                     pass
             elif line.upper().startswith("ANALYSIS:"):
                 analysis = line.split(":", 1)[1].strip()
-
         return score, analysis
 
+    @classmethod
+    def _parse_response(cls, raw: str) -> tuple[int, str]:
+        """Extract SCORE and ANALYSIS from Claude's formatted response."""
+        score, analysis = cls._parse_fields(raw.splitlines())
+        # fallbacks: score 0, raw text as the analysis
+        return (score if score is not None else 0), (analysis if analysis is not None else raw)
+
+    @classmethod
+    def _parse_batch_response(cls, raw: str) -> dict[str, tuple[int, str]]:
+        """
+        Split a batch response on its ``PAIR:`` lines and parse every block.
+        Blocks without a valid SCORE or ANALYSIS are left out.
+        """
+        sections: dict[str, list[str]] = {}
+        current: list[str] | None = None
+        for line in raw.splitlines():
+            stripped = line.strip().lstrip("#*- ").rstrip("*")
+            if stripped.upper().startswith("PAIR:"):
+                symbol = stripped.split(":", 1)[1].strip().strip("*").replace("/", "").upper()
+                current = sections.setdefault(symbol, [])
+            elif current is not None:
+                current.append(stripped)
+
+        parsed: dict[str, tuple[int, str]] = {}
+        for symbol, lines in sections.items():
+            score, analysis = cls._parse_fields(lines)
+            if score is not None and analysis:
+                parsed[symbol] = (score, analysis)
+        return parsed
+
     @staticmethod
     def _mock_response(direction: str) -> tuple[int, str]:
         """Used when the API key is absent or the call fails."""
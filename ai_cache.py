@@ -0,0 +1,127 @@
+"""
+ultra_elite_scalping/apis/ai_cache.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : LRU + TTL memo cache for Claude confirmations.
+
+In choppy markets the same setup repeats for many cycles; the indicator
+picture is quantised into coarse buckets so that near-identical states
+share one Claude answer until it expires.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from config.settings import AI_CACHE_SIZE, AI_CACHE_TTL, AI_CACHE_BUCKETS
+
+
+def quantize_state(
+    symbol: str,
+    data: dict,
+    direction: str,
+    headline: str,
+    buckets: dict[str, float] = AI_CACHE_BUCKETS,
+) -> tuple[Hashable, ...]:
+    """
+    Cache key for a confirmation request.
+
+    RSI / Stochastic / CCI / ADX are floored into fixed-width buckets; MACD
+    keeps its sign plus a magnitude bucket.  The headline is reduced to an
+    8-byte digest so keys stay small.
+    """
+    macd = data["macd"]
+    return (
+        symbol,
+        direction,
+        headline_digest(headline),
+        math.floor(data["rsi"] / buckets["rsi"]),
+        math.floor(data["stoch"] / buckets["stoch"]),
+        math.floor(data["cci"] / buckets["cci"]),
+        int(math.copysign(math.floor(abs(macd) / buckets["macd"]) + 1, macd)) if macd else 0,
+        math.floor(data["adx"] / buckets["adx"]),
+    )
+
+
+def headline_digest(headline: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(headline.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+class ConfirmationCache:
+    """
+    Thread-safe LRU cache whose entries also expire after *ttl* seconds.
+
+    Memory is bounded by *max_entries*; the least recently used entry is
+    evicted first.  Counters are exposed through ``stats()``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = AI_CACHE_SIZE,
+        ttl: float = AI_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max = max_entries
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, tuple[int, str]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Live entry for *key*; unlike ``get()`` no counter or LRU order changes."""
+        entry = self._entries.get(key)
+        return entry is not None and self._clock() - entry[0] <= self._ttl
+
+    def get(self, key: Hashable) -> tuple[int, str] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if self._clock() - stored_at > self._ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: tuple[int, str]) -> None:
+        if self._max <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries":     len(self._entries),
+            "hits":        self.hits,
+            "misses":      self.misses,
+            "evictions":   self.evictions,
+            "expirations": self.expirations,
+            "hit_rate":    self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,583 @@
+"""
+ultra_elite_scalping/apis/ai_scheduler.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Rate-governed scheduling of Claude confirmations.
+
+Candidates wait in a priority queue ranked by their pre-score margin over
+the signal threshold, less AI_STALENESS_PENALTY points per second they
+have waited.  AI_MAX_CONCURRENCY worker threads send them — several pairs
+per request with AI_BATCH_MODE — through one shared AIAnalysisClient, and
+so over one HTTP connection pool, as fast as a RateBudget allows: token
+buckets of AI_REQUESTS_PER_MINUTE requests and AI_TOKENS_PER_MINUTE tokens
+that shrink on HTTP 429 / 529, pause for the server's retry-after and
+recover gradually with every success.  Throttled requests go back into the
+queue.  A candidate still unanswered AI_DEADLINE_SECONDS after its data
+arrived is dropped: it is finalised without an AI bonus instead of with a
+made-up one.
+
+With AI_SPECULATIVE the scheduler also watches every pair's pre-score
+(``observe()``).  When the last AI_SPECULATE_BARS margins project a pair
+across the AI gate on its next bar, a speculative request for the state
+its real candidate is likely to send goes into a second queue, served only
+when no real candidate is waiting.  The answer is reused when the real
+candidate's state quantises to the same key (apis/ai_cache.py) — straight
+from the finished answer, or by joining the request still in flight — and a
+queued speculative request is cancelled when the projection falls back
+below the gate.  Requests already in flight are not aborted; an answer
+nobody uses within AI_CACHE_TTL counts as wasted.  ``stats()`` reports the
+speculative hit rate and the wasted-call ratio.
+
+Without an API key every candidate gets the client's mock answer at once,
+as before.
+
+Usage
+-----
+    scheduler = ConfirmationScheduler(AIAnalysisClient(key))
+    for outcome in scheduler.confirm([Candidate(request, margin, since_ns, ref), ...]):
+        ...
+
+    with FakeAnthropicServer(requests_per_minute=20) as fake:    # injects 429s
+        scheduler = ConfirmationScheduler(AIAnalysisClient("test-key", base_url=fake.url))
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, NamedTuple
+
+import anthropic
+
+from config.settings import (
+    AI_MAX_CONCURRENCY, AI_BATCH_MODE, AI_MAX_TOKENS, AI_BATCH_MAX_TOKENS,
+    AI_REQUESTS_PER_MINUTE, AI_TOKENS_PER_MINUTE, AI_DEADLINE_SECONDS, AI_STALENESS_PENALTY,
+    AI_GATE_MARGIN, AI_SPECULATE_BARS, AI_CACHE_TTL,
+)
+from apis.ai_api import AIAnalysisClient, ConfirmRequest
+from apis.ai_cache import quantize_state
+from utils.metrics import AI_CALLS
+
+logger = logging.getLogger(__name__)
+
+_MIN_SCALE = 0.1        # throttling never cuts the rates below 10 % of the configured ones
+_RECOVERY = 0.05        # share of the configured rates won back per successful request
+_THROTTLE_STATUS = (429, 529)     # rate limited / overloaded
+
+OUTCOMES = ("ok", "cached", "speculative", "offline", "unparsed", "error", "dropped")
+
+
+class Candidate(NamedTuple):
+    """One pair waiting for Claude; *ref* comes back untouched in its Outcome."""
+    request:  ConfirmRequest
+    margin:   float              # best pre-score − SIGNAL_THRESHOLD
+    since_ns: int                # time.perf_counter_ns() its data arrived
+    ref:      Any = None
+
+
+class Outcome(NamedTuple):
+    """The answer for one Candidate; *status* is one of OUTCOMES."""
+    symbol:   str
+    bonus:    int
+    summary:  str
+    status:   str
+    since_ns: int
+    ref:      Any
+
+
+class RateBudget:
+    """
+    Requests-per-minute and tokens-per-minute token buckets that adapt to
+    rate limiting.
+
+    Each bucket holds at most one minute of its current rate and refills
+    continuously.  ``throttled()`` halves both rates (down to _MIN_SCALE of
+    the configured ones), empties the buckets and pauses everything for the
+    server's retry-after; each ``succeeded()`` wins back _RECOVERY of the
+    configured rates.  Not thread-safe — ConfirmationScheduler holds its
+    lock around every call.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = AI_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = AI_TOKENS_PER_MINUTE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.scale = 1.0
+        self.throttles = 0
+        self._clock = clock
+        self._updated = clock()
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._paused_until = 0.0
+
+    def delay(self, tokens: int) -> float:
+        """Seconds until a request costing *tokens* fits the budget; 0 = now."""
+        now = self._refill()
+        rpm = self.requests_per_minute * self.scale
+        tpm = self.tokens_per_minute * self.scale
+        # a request bigger than a full bucket waits for a full bucket
+        return max(
+            0.0,
+            self._paused_until - now,
+            (min(1.0, rpm) - self._requests) * 60 / rpm,
+            (min(tokens, tpm) - self._tokens) * 60 / tpm,
+        )
+
+    def take(self, tokens: int) -> None:
+        self._requests -= 1
+        self._tokens -= tokens
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Return what a request reserved but did not use (or charge the excess)."""
+        self._tokens = min(self._tokens + reserved - used, self.tokens_per_minute * self.scale)
+
+    def succeeded(self) -> None:
+        self._refill()
+        self.scale = min(1.0, self.scale + _RECOVERY)
+
+    def throttled(self, retry_after: float | None) -> None:
+        now = self._refill()
+        self.throttles += 1
+        self.scale = max(_MIN_SCALE, self.scale / 2)
+        self._requests = min(self._requests, 0.0)
+        self._tokens = min(self._tokens, 0.0)
+        if retry_after is None:          # no hint: one request interval at the new rate
+            retry_after = 60 / (self.requests_per_minute * self.scale)
+        self._paused_until = max(self._paused_until, now + retry_after)
+
+    def _refill(self) -> float:
+        now = self._clock()
+        elapsed, self._updated = now - self._updated, now
+        rpm = self.requests_per_minute * self.scale
+        tpm = self.tokens_per_minute * self.scale
+        self._requests = min(rpm, self._requests + elapsed * rpm / 60)
+        self._tokens = min(tpm, self._tokens + elapsed * tpm / 60)
+        return now
+
+
+class _Item:
+    """A queued Candidate; superseded items stay in the heap as dead entries."""
+    __slots__ = ("candidate", "deadline_ns", "key", "retried", "alive")
+
+    def __init__(self, candidate: Candidate, deadline_ns: int, key: tuple | None = None) -> None:
+        self.candidate = candidate
+        self.deadline_ns = deadline_ns
+        self.key = key                   # quantised state; speculative items only
+        self.retried = False
+        self.alive = True
+
+
+class ConfirmationScheduler:
+    """
+    Priority queue + rate budget + worker pool in front of AIAnalysisClient.
+
+    ``submit()`` queues candidates (replacing a queued one for the same
+    pair, keeping the earlier arrival) and ``collect()`` returns whatever
+    has been answered or dropped since the last call — the pattern of the
+    event mode and of the async sweep.  ``confirm()`` does both for a whole cycle and blocks until
+    every candidate is resolved.  Workers start with the first live
+    request.  ``observe()`` drives speculative prefetch.
+    """
+
+    def __init__(
+        self,
+        client: AIAnalysisClient,
+        workers: int = AI_MAX_CONCURRENCY,
+        batch_size: int | None = None,
+        budget: RateBudget | None = None,
+        deadline: float = AI_DEADLINE_SECONDS,
+        staleness_penalty: float = AI_STALENESS_PENALTY,
+    ) -> None:
+        if batch_size is None:
+            batch_size = max(1, AI_BATCH_MAX_TOKENS // AI_MAX_TOKENS) if AI_BATCH_MODE else 1
+        self.client = client
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.budget = budget if budget is not None else RateBudget()
+        self.deadline = deadline
+        self._penalty = staleness_penalty
+        self._cond = threading.Condition()
+        self._heap: list[tuple[float, int, _Item]] = []
+        self._seq = itertools.count()
+        self._queued: dict[str, _Item] = {}
+        self._in_flight = 0
+        self._done: list[Outcome] = []
+        self._threads: list[threading.Thread] = []
+        self._closed = False
+        self.counts: dict[str, int] = dict.fromkeys(OUTCOMES, 0)
+        self.sent = 0                    # pairs sent to Claude, speculative ones included
+
+        # Speculative prefetch: recent margins per pair, the queue of
+        # speculative items, in-flight speculative keys → real candidates
+        # waiting on them, and unused answers → (expiry, answer)
+        self._gate = -AI_GATE_MARGIN
+        self._trend: dict[str, deque[float]] = {}
+        self._spec_heap: list[tuple[float, int, _Item]] = []
+        self._spec_queued: dict[str, _Item] = {}
+        self._spec_flight: dict[tuple, list[Candidate]] = {}
+        self._spec_answers: dict[tuple, tuple[float, tuple[int, str]]] = {}
+        self.speculation: dict[str, int] = dict.fromkeys(
+            ("queued", "cancelled", "answered", "used", "wasted"), 0)
+
+    # ── Public ────────────────────────────────────────────────────────────────
+
+    def submit(self, *candidates: Candidate) -> None:
+        with self._cond:
+            # all at once, so the workers see them together before ranking
+            for candidate in candidates:
+                self._enqueue(candidate)
+
+    def collect(self) -> list[Outcome]:
+        """Outcomes resolved since the last call, in resolution order."""
+        with self._cond:
+            self._expire()
+            done, self._done = self._done, []
+            return done
+
+    def confirm(self, candidates: list[Candidate]) -> list[Outcome]:
+        """Submit *candidates* and wait until each is answered or dropped."""
+        with self._cond:
+            # all at once, so the workers see the whole cycle before ranking
+            for candidate in candidates:
+                self._enqueue(candidate)
+            self._expire()
+            while self._queued or self._in_flight:
+                self._cond.wait(self._next_deadline())
+                self._expire()
+        return self.collect()
+
+    def observe(self, candidate: Candidate, lead: str) -> None:
+        """
+        Speculative prefetch: feed every pair's pre-score as a Candidate,
+        gated or not; *lead* is its higher-scoring side ("BUY" / "SELL").
+        """
+        symbol = candidate.request.symbol
+        history = self._trend.get(symbol)
+        if history is None:
+            history = self._trend[symbol] = deque(maxlen=max(2, AI_SPECULATE_BARS))
+        history.append(candidate.margin)
+        if candidate.margin >= self._gate or len(history) < history.maxlen:
+            return                       # a real candidate already, or no trend yet
+        # mean change per bar over the window, one bar ahead
+        projected = candidate.margin + (candidate.margin - history[0]) / (len(history) - 1)
+        with self._cond:
+            queued = self._spec_queued.get(symbol)
+            if projected < self._gate:
+                if queued is not None:
+                    self._cancel(queued)
+                return
+            if queued is not None or not self.client.live:
+                return
+            # the direction the real candidate will carry if the projection holds
+            request = candidate.request._replace(direction=lead if projected >= 0 else "HOLD")
+            key = quantize_state(*request)
+            if key in self._spec_flight or key in self._spec_answers or key in self.client.cache:
+                return
+            item = _Item(candidate._replace(request=request, margin=projected),
+                         candidate.since_ns + int(self.deadline * 1e9), key)
+            self._spec_queued[symbol] = item
+            self._push(item, self._spec_heap)
+            self.speculation["queued"] += 1
+            if not self._threads:
+                self._start()
+            self._cond.notify()
+
+    def stats(self) -> dict[str, float]:
+        with self._cond:
+            self._expire_answers()
+            spec = self.speculation
+            settled = spec["used"] + spec["wasted"]
+            return {**self.counts, "queued": len(self._queued), "in_flight": self._in_flight,
+                    "throttles": self.budget.throttles, "rate_scale": round(self.budget.scale, 2),
+                    **{f"spec_{k}": v for k, v in spec.items()},
+                    # share of settled speculative answers a real candidate used,
+                    # and share of all pairs sent whose answer nobody used
+                    "spec_hit_rate": round(spec["used"] / settled, 3) if settled else 0.0,
+                    "wasted_call_ratio": round(spec["wasted"] / self.sent, 3) if self.sent else 0.0}
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=self.deadline)
+        self._threads = []
+
+    # ── Private ───────────────────────────────────────────────────────────────
+
+    def _start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"ai-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _enqueue(self, candidate: Candidate) -> None:
+        req = candidate.request
+        if not self.client.live:
+            self._resolve(candidate, *self.client.confirm_batch([req])[req.symbol], "offline")
+            return
+        key = quantize_state(*req)
+        spec = self._spec_answers.pop(key, None)
+        if spec is not None and spec[0] > time.monotonic():
+            self.speculation["used"] += 1
+            self._resolve(candidate, *spec[1], "speculative")
+            return
+        if spec is not None:
+            self.speculation["wasted"] += 1
+        waiting = self._spec_flight.get(key)
+        if waiting is not None:
+            if not waiting:
+                self.speculation["used"] += 1
+            waiting.append(candidate)    # resolved when the speculative answer lands
+            self._in_flight += 1
+            return
+        cached = self.client.cache.get(key)
+        if cached is not None:
+            self._resolve(candidate, *cached, "cached")
+            return
+        speculative = self._spec_queued.get(req.symbol)
+        if speculative is not None:
+            self._cancel(speculative)    # the real request replaces it
+        previous = self._queued.get(req.symbol)
+        if previous is not None:
+            previous.alive = False
+            candidate = candidate._replace(
+                since_ns=min(candidate.since_ns, previous.candidate.since_ns))
+        item = _Item(candidate, candidate.since_ns + int(self.deadline * 1e9))
+        self._queued[req.symbol] = item
+        self._push(item)
+        if not self._threads:
+            self._start()
+        self._cond.notify()
+
+    def _push(self, item: _Item, heap: list | None = None) -> None:
+        # rank = margin − penalty × (now − since); every queued item ages at
+        # the same rate, so ordering by margin + penalty × since is equivalent
+        # and the heap key never has to change
+        c = item.candidate
+        heapq.heappush(self._heap if heap is None else heap,
+                       (-(c.margin + self._penalty * c.since_ns / 1e9), next(self._seq), item))
+
+    def _cancel(self, item: _Item) -> None:
+        item.alive = False
+        del self._spec_queued[item.candidate.request.symbol]
+        self.speculation["cancelled"] += 1
+        AI_CALLS.labels("speculative", "cancelled").inc()
+
+    def _expire_answers(self) -> None:
+        """Count unused speculative answers older than AI_CACHE_TTL as wasted."""
+        now = time.monotonic()
+        stale = [key for key, (expiry, _) in self._spec_answers.items() if expiry <= now]
+        for key in stale:
+            del self._spec_answers[key]
+            self.speculation["wasted"] += 1
+            AI_CALLS.labels("speculative", "wasted").inc()
+
+    def _resolve(self, candidate: Candidate, bonus: int, summary: str, status: str) -> None:
+        self.counts[status] += 1
+        self._done.append(Outcome(candidate.request.symbol, bonus, summary, status,
+                                  candidate.since_ns, candidate.ref))
+        self._cond.notify_all()
+
+    def _expire(self) -> None:
+        """Drop every queued candidate past its deadline; cancel stale speculation."""
+        now = time.perf_counter_ns()
+        dead = 0
+        for entry in self._spec_heap:
+            if entry[2].alive and entry[2].deadline_ns <= now:
+                self._cancel(entry[2])
+            dead += not entry[2].alive
+        if 2 * dead > len(self._spec_heap):
+            # cancelled items are only popped when no real candidate waits:
+            # drop them here so a sustained backlog cannot grow the heap
+            self._spec_heap = [entry for entry in self._spec_heap if entry[2].alive]
+            heapq.heapify(self._spec_heap)
+        if not self._heap:
+            return
+        if not any(item.deadline_ns <= now for _, _, item in self._heap if item.alive):
+            return
+        keep = []
+        for entry in self._heap:
+            item = entry[2]
+            if not item.alive:
+                continue
+            if item.deadline_ns <= now:
+                item.alive = False
+                del self._queued[item.candidate.request.symbol]
+                AI_CALLS.labels("scheduled", "dropped").inc()
+                self._resolve(item.candidate, 0, "AI confirmation dropped (rate limit budget)",
+                              "dropped")
+            else:
+                keep.append(entry)
+        heapq.heapify(keep)
+        self._heap = keep
+
+    def _next_deadline(self) -> float | None:
+        """Seconds until the earliest queued deadline (None when nothing is queued)."""
+        if not self._queued and not self._spec_queued:
+            return None
+        earliest = min(item.deadline_ns for queue in (self._queued, self._spec_queued)
+                       for item in queue.values())
+        return max(0.0, (earliest - time.perf_counter_ns()) / 1e9)
+
+    def _next_batch(self) -> tuple[list[_Item], int] | None:
+        """Block until the best queued candidates fit the budget; None on close."""
+        while not self._closed:
+            self._expire()
+            # speculative items only when no real candidate is waiting
+            heap = self._heap if self._queued else self._spec_heap
+            items: list[_Item] = []
+            while heap and len(items) < self.batch_size:
+                entry = heapq.heappop(heap)
+                if entry[2].alive:
+                    items.append(entry)
+            if not items:
+                self._cond.wait(self._next_deadline() if self._spec_queued else None)
+                continue
+            cost = self.client.estimate_tokens([entry[2].candidate.request for entry in items])
+            wait = self.budget.delay(cost)
+            if wait > 0:
+                for entry in items:
+                    heapq.heappush(heap, entry)
+                deadline = self._next_deadline()
+                self._cond.wait(wait if deadline is None else min(wait, deadline))
+                continue
+            self.budget.take(cost)
+            self.sent += len(items)
+            for _, _, item in items:
+                if item.key is None:
+                    self._in_flight += 1
+                    del self._queued[item.candidate.request.symbol]
+                else:
+                    del self._spec_queued[item.candidate.request.symbol]
+                    self._spec_flight[item.key] = []
+                    AI_CALLS.labels("speculative", "sent").inc()
+            return [entry[2] for entry in items], cost
+        return None
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                batch = self._next_batch()
+            if batch is None:
+                return
+            self._send(*batch)
+
+    def _send(self, items: list[_Item], cost: int) -> None:
+        requests = [item.candidate.request for item in items]
+        answers: dict[str, tuple[int, str]] = {}
+        used, limited, retry_after, failure = cost, False, None, None
+        try:
+            answers, used = self.client.request(requests, timeout=self.deadline)
+        except anthropic.APIStatusError as exc:
+            if exc.status_code in _THROTTLE_STATUS:
+                limited, retry_after = True, _retry_after(exc)
+                logger.info("Claude rate limited (HTTP %d) — retrying %d pair(s) within budget",
+                            exc.status_code, len(items))
+            else:
+                logger.warning("Anthropic API error %s", exc.status_code)
+                failure = exc
+        except Exception as exc:         # connection errors, timeouts, bad replies
+            logger.warning("AI confirmation failed: %s", exc)
+            failure = exc
+
+        kind = "single" if len(items) == 1 else "batch"
+        with self._cond:
+            if items[0].key is not None:
+                self._settle_speculation(items, answers, cost, used, limited, retry_after)
+                return
+            self._in_flight -= len(items)
+            if limited or failure is not None:
+                self.budget.settle(cost, 0)
+            else:
+                self.budget.settle(cost, used)
+                self.budget.succeeded()
+            if limited:
+                self.budget.throttled(retry_after)
+                AI_CALLS.labels(kind, "RateLimitError").inc()
+                for item in items:
+                    self._requeue(item)
+                return
+            if failure is not None:
+                AI_CALLS.labels(kind, type(failure).__name__).inc()
+            for item in items:
+                answer = answers.get(item.candidate.request.symbol)
+                if answer is not None:
+                    self._resolve(item.candidate, *answer, "ok")
+                elif failure is not None:
+                    self._resolve(item.candidate, 0, "AI unavailable", "error")
+                elif not item.retried:
+                    # missing block in a batch reply: one more try, batched or not
+                    item.retried = True
+                    self._requeue(item)
+                else:
+                    self._resolve(item.candidate, 0, "No usable AI answer", "unparsed")
+
+    def _settle_speculation(
+        self,
+        items: list[_Item],
+        answers: dict[str, tuple[int, str]],
+        cost: int,
+        used: int,
+        limited: bool,
+        retry_after: float | None,
+    ) -> None:
+        """Hand a speculative reply to the candidates that joined it, or keep it."""
+        answered = bool(answers)
+        self.budget.settle(cost, used if answered else 0)
+        if limited:
+            self.budget.throttled(retry_after)
+            AI_CALLS.labels("speculative", "RateLimitError").inc()
+        elif answered:
+            self.budget.succeeded()
+        expiry = time.monotonic() + AI_CACHE_TTL
+        for item in items:
+            waiting = self._spec_flight.pop(item.key)
+            answer = answers.get(item.candidate.request.symbol)
+            if answer is None:
+                # failed or throttled: whoever joined goes through the normal queue
+                if waiting:
+                    self.speculation["used"] -= 1
+                self._in_flight -= len(waiting)
+                for candidate in waiting:
+                    self._enqueue(candidate)
+                continue
+            self.speculation["answered"] += 1
+            if not waiting:
+                self._spec_answers[item.key] = (expiry, answer)
+                continue
+            self._in_flight -= len(waiting)
+            for candidate in waiting:
+                self._resolve(candidate, *answer, "speculative")
+        self._cond.notify_all()
+
+    def _requeue(self, item: _Item) -> None:
+        """Put an item back unless a newer candidate for the pair arrived meanwhile."""
+        symbol = item.candidate.request.symbol
+        newer = self._queued.get(symbol)
+        if newer is not None:
+            newer.candidate = newer.candidate._replace(
+                since_ns=min(newer.candidate.since_ns, item.candidate.since_ns))
+            newer.deadline_ns = min(newer.deadline_ns, item.deadline_ns)
+            return
+        self._queued[symbol] = item
+        self._push(item)
+        self._cond.notify()
+
+
+def _retry_after(exc: anthropic.APIStatusError) -> float | None:
+    """The server's retry-after in seconds, if the response has one."""
+    headers = exc.response.headers
+    for name, unit in (("retry-after-ms", 1e-3), ("retry-after", 1.0)):
+        try:
+            return float(headers[name]) * unit
+        except (KeyError, ValueError):
+            pass
+    return None
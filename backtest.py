@@ -0,0 +1,308 @@
+"""
+ultra_elite_scalping/core/backtest.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Historical backtest of the indicator + scoring pipeline.
+          Bars are turned into indicator columns in one vectorised pass,
+          scored with ScoringEngine.score_batch and every signal is followed
+          bar by bar until its ATR-based take-profit or stop-loss is hit.
+          Pairs run in parallel on a process pool.
+
+Usage
+-----
+    python main.py backtest --data bars.csv
+    python main.py backtest --data data/bars      # BarStore directory
+
+CSV columns: timestamp, symbol, open, high, low, close, volume and,
+optionally, precomputed news_bonus / ai_bonus columns.
+"""
+
+import csv
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import numpy as np
+
+from config.settings import (
+    SIGNAL_THRESHOLD, AI_GATE_MARGIN, TP_ATR_MULTIPLIER, SL_ATR_MULTIPLIER,
+    INDICATOR_WARMUP_BARS, BACKTEST_WORKERS,
+)
+from core.bar_store import BarSlice
+from core.pips import pip_size
+from core.indicators import indicator_columns
+from core.scoring import BatchScoreResult, ScoringEngine, BUY, HOLD
+
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+BONUS_COLUMNS = ("news_bonus", "ai_bonus")
+SCORE_INPUTS = ("price", "ema_fast", "rsi", "stoch", "macd", "adx")   # score_batch order
+
+
+@dataclass
+class PairReport:
+    symbol:            str
+    bars:              int
+    signals:           int
+    wins:              int
+    losses:            int
+    open_at_end:       int
+    pnl_pips:          float
+    max_drawdown_pips: float
+    elapsed:           float          # seconds of worker CPU time
+    exit_times:        np.ndarray = field(repr=False)
+    trade_pips:        np.ndarray = field(repr=False)
+
+    @property
+    def win_rate(self) -> float:
+        closed = self.wins + self.losses
+        return self.wins / closed * 100 if closed else 0.0
+
+
+@dataclass
+class BacktestReport:
+    pairs:   list[PairReport]
+    elapsed: float                    # wall-clock seconds
+
+    @property
+    def bars(self) -> int:
+        return sum(p.bars for p in self.pairs)
+
+    @property
+    def signals(self) -> int:
+        return sum(p.signals for p in self.pairs)
+
+    @property
+    def wins(self) -> int:
+        return sum(p.wins for p in self.pairs)
+
+    @property
+    def losses(self) -> int:
+        return sum(p.losses for p in self.pairs)
+
+    @property
+    def win_rate(self) -> float:
+        closed = self.wins + self.losses
+        return self.wins / closed * 100 if closed else 0.0
+
+    @property
+    def pnl_pips(self) -> float:
+        return sum(p.pnl_pips for p in self.pairs)
+
+    @property
+    def max_drawdown_pips(self) -> float:
+        """Drawdown of the combined equity curve, trades ordered by exit time."""
+        if not self.pairs:
+            return 0.0
+        times = np.concatenate([p.exit_times for p in self.pairs])
+        pips = np.concatenate([p.trade_pips for p in self.pairs])
+        return _max_drawdown(pips[np.argsort(times, kind="stable")])
+
+    @property
+    def bars_per_sec_per_core(self) -> float:
+        busy = sum(p.elapsed for p in self.pairs)
+        return self.bars / busy if busy else 0.0
+
+
+# ── Public ────────────────────────────────────────────────────────────────────
+
+def load_csv(path: str) -> dict[str, dict[str, np.ndarray]]:
+    """
+    Read an OHLCV CSV into per-pair column arrays.
+
+    ``timestamp`` may be epoch seconds or an ISO-8601 string; it is stored
+    as int64 epoch nanoseconds.  Rows are sorted by time per pair.
+    """
+    rows: dict[str, dict[str, list]] = {}
+    with open(path, newline="") as fh:
+        reader = csv.DictReader(fh)
+        bonus_cols = [c for c in BONUS_COLUMNS if c in (reader.fieldnames or [])]
+        for rec in reader:
+            cols = rows.setdefault(
+                rec["symbol"], {c: [] for c in BAR_COLUMNS + tuple(bonus_cols)}
+            )
+            cols["timestamp"].append(_parse_timestamp(rec["timestamp"]))
+            for c in BAR_COLUMNS[1:]:
+                cols[c].append(float(rec[c]))
+            for c in bonus_cols:
+                cols[c].append(int(float(rec[c] or 0)))
+
+    bars: dict[str, dict[str, np.ndarray]] = {}
+    for symbol, cols in rows.items():
+        ts = np.asarray(cols["timestamp"], dtype=np.int64)
+        order = np.argsort(ts, kind="stable")
+        bars[symbol] = {
+            c: np.asarray(v, dtype=np.int64 if c in BONUS_COLUMNS + ("timestamp",) else np.float64)[order]
+            for c, v in cols.items()
+        }
+    return bars
+
+
+def backtest_pair(
+    symbol: str,
+    bars: dict[str, np.ndarray] | BarSlice,
+    threshold: int = SIGNAL_THRESHOLD,
+) -> PairReport:
+    """Run the full pipeline over one pair's bar columns (or a bar-store slice)."""
+    started = time.process_time()
+    if isinstance(bars, BarSlice):
+        bars = bars.load()
+    data = indicator_columns(
+        bars["open"], bars["high"], bars["low"], bars["close"], bars["volume"]
+    )
+    n = data["price"].shape[0]
+    news = bars.get("news_bonus", 0)
+    ai = bars.get("ai_bonus", 0)
+
+    cols = tuple(data[c] for c in SCORE_INPUTS)
+    result = score_history(ScoringEngine(), cols, news, ai, threshold)
+
+    entries, exits, pnl, open_at_end = simulate_trades(
+        result.direction, bars["close"], bars["high"], bars["low"], data["atr"],
+        start=INDICATOR_WARMUP_BARS,
+    )
+    trade_pips = pnl / pip_size(symbol)
+    return PairReport(
+        symbol=symbol,
+        bars=n,
+        signals=len(entries) + open_at_end,
+        wins=int(np.count_nonzero(pnl > 0)),
+        losses=int(np.count_nonzero(pnl <= 0)),
+        open_at_end=open_at_end,
+        pnl_pips=float(trade_pips.sum()),
+        max_drawdown_pips=_max_drawdown(trade_pips),
+        elapsed=time.process_time() - started,
+        exit_times=bars["timestamp"][exits],
+        trade_pips=trade_pips,
+    )
+
+
+def score_history(
+    scorer: ScoringEngine,
+    cols: tuple[np.ndarray, ...],
+    news_bonus: np.ndarray | int,
+    ai_bonus: np.ndarray | int,
+    threshold: int,
+) -> BatchScoreResult:
+    """
+    Score historical indicator columns (in SCORE_INPUTS order).  Recorded AI
+    bonuses only count where the pre-score passes the live AI gate.
+    """
+    if np.any(ai_bonus):
+        # Mirror the live gate: Claude is only consulted near the threshold
+        pre = scorer.score_batch(*cols, news_bonus=news_bonus, threshold=threshold)
+        gate = np.maximum(pre.buy_score, pre.sell_score) >= threshold - AI_GATE_MARGIN
+        ai_bonus = np.where(gate, ai_bonus, 0)
+    return scorer.score_batch(*cols, news_bonus=news_bonus, ai_bonus=ai_bonus, threshold=threshold)
+
+
+def simulate_trades(
+    direction: np.ndarray,
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    atr: np.ndarray,
+    start: int = 0,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """
+    Follow each signal until its TP or SL is touched (one position at a time).
+
+    Entry is the close of the signal bar; TP/SL sit TP_ATR_MULTIPLIER /
+    SL_ATR_MULTIPLIER ATRs away.  A bar touching both levels counts as a
+    loss.  Returns (entry_idx, exit_idx, pnl_price, open_at_end).
+    """
+    n = close.shape[0]
+    entries: list[int] = []
+    exits: list[int] = []
+    pnl: list[float] = []
+    free = start
+    for i in np.flatnonzero(direction != HOLD):
+        if i < free or atr[i] <= 0:
+            continue
+        is_buy = direction[i] == BUY
+        tp_dist = atr[i] * TP_ATR_MULTIPLIER
+        sl_dist = atr[i] * SL_ATR_MULTIPLIER
+        sign = 1.0 if is_buy else -1.0
+        tp = close[i] + sign * tp_dist
+        sl = close[i] - sign * sl_dist
+
+        hit = _first_exit(high, low, i + 1, n, is_buy, tp, sl)
+        if hit is None:
+            return (np.asarray(entries, dtype=np.int64), np.asarray(exits, dtype=np.int64),
+                    np.asarray(pnl), 1)
+        j, won = hit
+        entries.append(int(i))
+        exits.append(j)
+        pnl.append(tp_dist if won else -sl_dist)
+        free = j
+    return (np.asarray(entries, dtype=np.int64), np.asarray(exits, dtype=np.int64),
+            np.asarray(pnl), 0)
+
+
+def run_backtest(
+    bars: dict[str, dict[str, np.ndarray] | BarSlice],
+    threshold: int = SIGNAL_THRESHOLD,
+    workers: int = BACKTEST_WORKERS,
+) -> BacktestReport:
+    """
+    Backtest every pair in *bars*, one pair per process-pool task.
+    Pass ``BarStore.slices()`` to let each worker map its own pair.
+    """
+    started = time.perf_counter()
+    symbols = list(bars)
+    if workers <= 1 or len(symbols) <= 1:
+        reports = [backtest_pair(s, bars[s], threshold) for s in symbols]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(symbols))) as pool:
+            reports = list(pool.map(
+                backtest_pair, symbols, (bars[s] for s in symbols),
+                [threshold] * len(symbols),
+            ))
+    report = BacktestReport(pairs=reports, elapsed=time.perf_counter() - started)
+    logger.info("Backtest: %d bars, %d signals in %.2fs",
+                report.bars, report.signals, report.elapsed)
+    return report
+
+
+# ── Private ───────────────────────────────────────────────────────────────────
+
+def _first_exit(
+    high: np.ndarray, low: np.ndarray, pos: int, n: int,
+    is_buy: bool, tp: float, sl: float,
+) -> tuple[int, bool] | None:
+    """Index of the first bar touching TP or SL and whether it was a win."""
+    chunk = 64
+    while pos < n:
+        end = min(n, pos + chunk)
+        if is_buy:
+            tp_hit = high[pos:end] >= tp
+            sl_hit = low[pos:end] <= sl
+        else:
+            tp_hit = low[pos:end] <= tp
+            sl_hit = high[pos:end] >= sl
+        touched = tp_hit | sl_hit
+        if touched.any():
+            k = int(touched.argmax())
+            return pos + k, bool(tp_hit[k] and not sl_hit[k])
+        pos = end
+        chunk = min(chunk * 2, 1 << 16)
+    return None
+
+
+def _max_drawdown(pips: np.ndarray) -> float:
+    """Largest peak-to-trough fall of the cumulative PnL curve (starting at 0)."""
+    if pips.size == 0:
+        return 0.0
+    equity = np.concatenate(([0.0], np.cumsum(pips)))
+    return float(np.max(np.maximum.accumulate(equity) - equity))
+
+
+def _parse_timestamp(raw: str) -> int:
+    try:
+        return int(float(raw) * 1_000_000_000)
+    except ValueError:
+        return int(datetime.fromisoformat(raw).timestamp() * 1_000_000_000)
@@ -0,0 +1,311 @@
+"""
+ultra_elite_scalping/core/bar_store.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Append-only, memory-mapped columnar store for OHLCV bars.
+
+Layout
+------
+    <root>/<SYMBOL>/index          header + sparse timestamp index
+    <root>/<SYMBOL>/timestamp.i8   int64 epoch nanoseconds (non-decreasing)
+    <root>/<SYMBOL>/open.f8 … volume.f8   float64 columns
+
+Column files are raw little-endian arrays, so reads are zero-copy
+``numpy.memmap`` views.  The index header carries the committed row count:
+columns are written first and the header is rewritten in place last, so
+readers never see a half-written bar.  Every INDEX_STRIDE-th timestamp is
+kept in the index so time-range lookups touch only a handful of pages of
+the timestamp column.
+"""
+
+import logging
+import os
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+COLUMNS: dict[str, np.dtype] = {
+    "timestamp": np.dtype("<i8"),
+    "open":      np.dtype("<f8"),
+    "high":      np.dtype("<f8"),
+    "low":       np.dtype("<f8"),
+    "close":     np.dtype("<f8"),
+    "volume":    np.dtype("<f8"),
+}
+INDEX_STRIDE = 4096
+
+_MAGIC = b"UEBS"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHxxqqq")   # magic, version, rows, first_ts, last_ts
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BarSlice:
+    """Picklable handle to a time range of one pair; ``load()`` maps it."""
+    root:   str
+    symbol: str
+    start:  int | None = None
+    end:    int | None = None
+
+    def load(self) -> dict[str, np.ndarray]:
+        return BarStore(self.root).read(self.symbol, self.start, self.end)
+
+
+class _PairWriter:
+    """Open column handles plus the committed header state for one pair."""
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.rows, self.first_ts, self.last_ts, self.sparse = _read_index(path)
+        index_path = os.path.join(path, "index")
+        if not os.path.exists(index_path):
+            with open(index_path, "wb") as fh:
+                fh.write(_HEADER.pack(_MAGIC, _VERSION, 0, 0, 0))
+        self.index = open(index_path, "r+b")
+        self.sparse_written = len(self.sparse)
+        self.files = {
+            name: open(os.path.join(path, _column_file(name)), "ab")
+            for name in COLUMNS
+        }
+        # Drop any tail written after the last committed header
+        for name, fh in self.files.items():
+            size = self.rows * COLUMNS[name].itemsize
+            if fh.tell() != size:
+                fh.truncate(size)
+                fh.seek(size)
+        self.pending = 0
+
+    def commit(self) -> None:
+        """Flush columns, then sparse index entries, then the header."""
+        for fh in self.files.values():
+            fh.flush()
+        if self.sparse_written < len(self.sparse):
+            self.index.seek(_HEADER.size + 8 * self.sparse_written)
+            self.index.write(np.asarray(self.sparse[self.sparse_written:], dtype="<i8").tobytes())
+            self.sparse_written = len(self.sparse)
+        self.rows += self.pending
+        self.pending = 0
+        self.index.seek(0)
+        self.index.write(_HEADER.pack(_MAGIC, _VERSION, self.rows, self.first_ts, self.last_ts))
+        self.index.flush()
+
+    def close(self) -> None:
+        for fh in self.files.values():
+            fh.close()
+        self.index.close()
+
+
+class BarStore:
+    """
+    Columnar bar history rooted at a directory, one sub-directory per pair.
+
+    Methods
+    -------
+    append(symbol, timestamp, open, high, low, close, volume)
+        Append one bar (timestamps must not go backwards).
+    record(symbol, timestamp, open, high, low, close, volume) → bool
+        Best-effort ``append`` for live analysis: never raises.
+    append_many(symbol, columns)
+        Append aligned column arrays in one write per column.
+    read(symbol, start=None, end=None) → dict[str, np.ndarray]
+        Zero-copy memmap views of the bars with start ≤ timestamp < end.
+    """
+
+    def __init__(self, root: str, flush_every: int = 1) -> None:
+        self.root = root
+        self._flush_every = max(1, flush_every)
+        self._writers: dict[str, _PairWriter] = {}
+        self._warned: set[str] = set()
+        self._disabled: set[str] = set()       # pairs whose history ``record`` gave up on
+
+    def __getstate__(self) -> dict:
+        # Open handles stay with the writing process
+        return {"root": self.root, "_flush_every": self._flush_every, "_writers": {}, "_warned": set(),
+                "_disabled": set()}
+
+    # ── Writing ──────────────────────────────────────────────────────────────
+
+    def append(
+        self,
+        symbol: str,
+        timestamp: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> None:
+        w = self._writer(symbol)
+        if w.rows + w.pending and timestamp < w.last_ts:
+            raise ValueError(f"{symbol}: timestamp {timestamp} precedes {w.last_ts}")
+        f = w.files
+        f["timestamp"].write(struct.pack("<q", timestamp))
+        f["open"].write(struct.pack("<d", open_))
+        f["high"].write(struct.pack("<d", high))
+        f["low"].write(struct.pack("<d", low))
+        f["close"].write(struct.pack("<d", close))
+        f["volume"].write(struct.pack("<d", volume))
+        if w.rows + w.pending == 0:
+            w.first_ts = timestamp
+        if (w.rows + w.pending) % INDEX_STRIDE == 0:
+            w.sparse.append(timestamp)
+        w.last_ts = timestamp
+        w.pending += 1
+        if w.pending >= self._flush_every:
+            w.commit()
+
+    def record(
+        self,
+        symbol: str,
+        timestamp: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> bool:
+        """
+        ``append`` for live bars, where history must never stop analysis.
+        A bar older than the pair's last one (wall clock stepped back, feed
+        replay after a reconnect) is skipped with a warning for the first
+        one.  A pair whose history cannot be opened or written (I/O error,
+        corrupt or foreign index) is logged once and not recorded any more.
+        False if the bar was not recorded.
+        """
+        if symbol in self._disabled:
+            return False
+        try:
+            w = self._writer(symbol)
+            if w.rows + w.pending and timestamp < w.last_ts:
+                self._warn(symbol, "bar at %d precedes the stored %d", timestamp, w.last_ts)
+                return False
+            self.append(symbol, timestamp, open_, high, low, close, volume)
+        except (OSError, ValueError) as e:
+            self._disabled.add(symbol)
+            logger.warning("Bar store %s: %s — no more bars recorded for this pair", symbol, e)
+            return False
+        return True
+
+    def append_many(self, symbol: str, columns: dict[str, np.ndarray]) -> None:
+        ts = np.asarray(columns["timestamp"], dtype=COLUMNS["timestamp"])
+        if ts.size == 0:
+            return
+        w = self._writer(symbol)
+        if np.any(np.diff(ts) < 0) or (w.rows + w.pending and ts[0] < w.last_ts):
+            raise ValueError(f"{symbol}: timestamps must be non-decreasing")
+        base = w.rows + w.pending
+        for name, dtype in COLUMNS.items():
+            w.files[name].write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+        first_marker = -(-base // INDEX_STRIDE) * INDEX_STRIDE
+        w.sparse.extend(int(t) for t in ts[first_marker - base::INDEX_STRIDE])
+        if base == 0:
+            w.first_ts = int(ts[0])
+        w.last_ts = int(ts[-1])
+        w.pending += ts.size
+        w.commit()
+
+    def flush(self) -> None:
+        """Commit all pending bars."""
+        for w in self._writers.values():
+            if w.pending:
+                w.commit()
+
+    def close(self) -> None:
+        self.flush()
+        for w in self._writers.values():
+            w.close()
+        self._writers.clear()
+
+    # ── Reading ──────────────────────────────────────────────────────────────
+
+    def symbols(self) -> list[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            d for d in os.listdir(self.root)
+            if os.path.isfile(os.path.join(self.root, d, "index"))
+        )
+
+    def rows(self, symbol: str) -> int:
+        return _read_index(self._path(symbol))[0]
+
+    def time_range(self, symbol: str) -> tuple[int, int] | None:
+        rows, first_ts, last_ts, _ = _read_index(self._path(symbol))
+        return (first_ts, last_ts) if rows else None
+
+    def read(
+        self, symbol: str, start: int | None = None, end: int | None = None
+    ) -> dict[str, np.ndarray]:
+        """
+        Memmap views of *symbol*'s bars with ``start ≤ timestamp < end``.
+        Nothing is copied; the OS pages data in as it is touched.
+        """
+        path = self._path(symbol)
+        rows, _, _, sparse = _read_index(path)
+        if rows == 0:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        cols = {
+            name: np.memmap(os.path.join(path, _column_file(name)),
+                            dtype=dtype, mode="r", shape=(rows,))
+            for name, dtype in COLUMNS.items()
+        }
+        ts = cols["timestamp"]
+        lo = 0 if start is None else _search(ts, sparse, start)
+        hi = rows if end is None else _search(ts, sparse, end)
+        return {name: col[lo:hi] for name, col in cols.items()}
+
+    def slices(
+        self, start: int | None = None, end: int | None = None
+    ) -> dict[str, BarSlice]:
+        """Picklable per-pair handles, e.g. for process-pool backtests."""
+        return {s: BarSlice(self.root, s, start, end) for s in self.symbols()}
+
+    # ── Private ──────────────────────────────────────────────────────────────
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.root, symbol)
+
+    def _writer(self, symbol: str) -> _PairWriter:
+        w = self._writers.get(symbol)
+        if w is None:
+            w = self._writers[symbol] = _PairWriter(self._path(symbol))
+        return w
+
+    def _warn(self, symbol: str, message: str, *args) -> None:
+        if symbol not in self._warned:
+            self._warned.add(symbol)
+            logger.warning("Bar store %s: " + message + " — skipping such bars", symbol, *args)
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+def _column_file(name: str) -> str:
+    return f"{name}.{COLUMNS[name].kind}{COLUMNS[name].itemsize}"
+
+
+def _read_index(path: str) -> tuple[int, int, int, list[int]]:
+    try:
+        with open(os.path.join(path, "index"), "rb") as fh:
+            raw = fh.read()
+    except FileNotFoundError:
+        return 0, 0, 0, []
+    magic, version, rows, first_ts, last_ts = _HEADER.unpack_from(raw)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"{path}: not a bar store (magic={magic!r}, version={version})")
+    # Only entries belonging to committed rows are trusted
+    count = -(-rows // INDEX_STRIDE)
+    sparse = np.frombuffer(raw, dtype="<i8", offset=_HEADER.size, count=count).tolist()
+    return rows, first_ts, last_ts, sparse
+
+
+def _search(ts: np.ndarray, sparse: list[int], value: int) -> int:
+    """First row with timestamp ≥ value, narrowed through the sparse index."""
+    block = int(np.searchsorted(sparse, value, side="left"))
+    lo = max(0, (block - 1) * INDEX_STRIDE)
+    hi = min(ts.shape[0], block * INDEX_STRIDE + 1) if block < len(sparse) else ts.shape[0]
+    return lo + int(np.searchsorted(ts[lo:hi], value, side="left"))
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+ultra_elite_scalping/bench.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Reproducible micro/macro benchmarks with regression gates.
+
+Cases
+-----
+    indicators.compute[N pairs]       IndicatorEngine.compute, one bar per pair
+    scoring.score[N pairs]            ScoringEngine.score on ready indicator snapshots
+    news.index[H headlines]           building the headline index (cold)
+    news.sentiment[H headlines]       sentiment_for_pair on an indexed list
+    cycle.analyse_pair[N pairs]       UltraEliteBot._analyse_pair for every pair,
+                                      stubbed AI client, output discarded
+    timeframes.update[N pairs]        BarAggregator.update per tick, 1s/1m/5m/15m
+    correlation.update[N pairs]       CorrelationMatrix.update per bar and pair,
+                                      including the rank-1 update per row
+    paper.on_tick[N pairs]            PaperBook.on_tick with 10k open positions spread
+                                      over the pairs, filled ones re-opened
+
+Usage
+-----
+    python bench.py --out bench/baseline.json              # record
+    python bench.py --compare bench/baseline.json          # fail on >10 % regression
+    python bench.py --compare bench/baseline.json --max-regression 25 --quick
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+
+from config import settings
+
+PAIR_COUNTS = (6, 100, 1000)
+HEADLINE_COUNTS = (10, 1_000, 100_000)
+QUICK_PAIR_COUNTS = (6, 100)
+QUICK_HEADLINE_COUNTS = (10, 1_000)
+
+_WORDS = (
+    "euro dollar yen sterling pound ECB Fed BOJ RBA BOC oil rally surge gains "
+    "falls drop weak strong hawkish dovish markets traders outlook inflation "
+    "growth recession data jobs rate decision central bank turmoil enterprise"
+).split()
+
+
+# ── Fixtures ──────────────────────────────────────────────────────────────────
+
+def _pairs(n: int) -> dict[str, float]:
+    """The configured pairs first, then synthetic ones up to *n*."""
+    prices = dict(list(settings.PAIRS.items())[:n])
+    rng = random.Random(n)
+    while len(prices) < n:
+        prices[f"SYN{len(prices):04d}"] = rng.uniform(0.5, 150.0)
+    return prices
+
+
+def _headlines(n: int) -> list[dict]:
+    rng = random.Random(n)
+    return [
+        {"title": " ".join(rng.choices(_WORDS, k=10)),
+         "description": " ".join(rng.choices(_WORDS, k=20))}
+        for _ in range(n)
+    ]
+
+
+class _StubAI:
+    """AIAnalysisClient stand-in: answers instantly, no network."""
+
+    class _Cache:
+        @staticmethod
+        def stats() -> dict:
+            return {}
+
+    cache = _Cache()
+    live = False
+
+    def confirm_signal(self, symbol, data, direction, headline) -> tuple[int, str]:
+        return (12 if direction != "HOLD" else 0), "Stub confirmation."
+
+    def confirm_batch(self, requests) -> dict:
+        return {r.symbol: self.confirm_signal(*r) for r in requests}
+
+
+def _quiet_bot(prices: dict[str, float]):
+    from core.bot import UltraEliteBot
+    from apis.news_api import NewsAPIClient
+    from apis.news_cache import HeadlineCache
+    from apis.ai_scheduler import ConfirmationScheduler
+
+    bot = UltraEliteBot()
+    bot.prices = dict(prices)
+    bot._news = NewsAPIClient("", cache=HeadlineCache(":memory:"))
+    bot._ai = _StubAI()
+    bot._confirmer = ConfirmationScheduler(bot._ai)
+    bot._cached_headlines = bot._news.fetch_headlines()
+    return bot
+
+
+# ── Timing ────────────────────────────────────────────────────────────────────
+
+def _measure(
+    run: Callable[[], None], ops: int, rounds: int, min_round: float = 0.1
+) -> dict[str, float]:
+    """
+    Time *rounds* rounds of *run* (each call doing *ops* operations).
+    Like timeit, a round repeats *run* until it lasts at least *min_round*
+    seconds, so short cases are not dominated by timer noise.  Times are
+    the CPU time of this thread, so being descheduled on a busy machine
+    does not count as a regression.
+    """
+    started = time.thread_time()
+    run()
+    first = time.thread_time() - started
+    loops = max(1, int(min_round / first)) if first > 0 else 1
+    per_op: list[float] = []
+    for _ in range(rounds):
+        started = time.thread_time_ns()
+        for _ in range(loops):
+            run()
+        per_op.append((time.thread_time_ns() - started) / (ops * loops))
+    median = statistics.median(per_op)
+    return {
+        "ns_per_op":     median,
+        "min_ns_per_op": min(per_op),
+        "ops_per_sec":   1e9 / median if median else 0.0,
+        "ops":           ops * loops,
+        "rounds":        rounds,
+    }
+
+
+def run_benchmarks(quick: bool = False, rounds: int = 7) -> dict[str, dict[str, float]]:
+    from core.indicators import IndicatorEngine
+    from core.scoring import ScoringEngine
+    from core.timeframes import BarAggregator, parse_timeframes
+    from core.correlation import CorrelationMatrix
+    from core.paper import PaperBook
+    from apis.news_api import NewsAPIClient
+    from apis.news_cache import HeadlineCache
+    from apis.ai_scheduler import ConfirmationScheduler
+
+    random.seed(0)
+    np.random.seed(0)
+    results: dict[str, dict[str, float]] = {}
+    pair_counts = QUICK_PAIR_COUNTS if quick else PAIR_COUNTS
+    headline_counts = QUICK_HEADLINE_COUNTS if quick else HEADLINE_COUNTS
+
+    for n in pair_counts:
+        prices = _pairs(n)
+        engine = IndicatorEngine()
+        for symbol in prices:
+            engine.compute(symbol, prices)          # warm-up outside the timing
+
+        def compute_all() -> None:
+            for symbol in prices:
+                engine.compute(symbol, prices)
+
+        results[f"indicators.compute[{n}]"] = _measure(compute_all, n, rounds)
+
+        scorer = ScoringEngine()
+        frames = [engine.compute(symbol, prices) for symbol in prices]
+
+        def score_all() -> None:
+            for data in frames:
+                scorer.score(data, news_bonus=4, ai_bonus=0, threshold=settings.SIGNAL_THRESHOLD)
+
+        results[f"scoring.score[{n}]"] = _measure(score_all, n, rounds)
+
+        bot = _quiet_bot(prices)
+        for symbol in bot.prices:
+            bot._indicators.seed(symbol, bot.prices)
+
+        def cycle() -> None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                for symbol in bot.prices:
+                    bot._analyse_pair(symbol)
+
+        results[f"cycle.analyse_pair[{n}]"] = _measure(cycle, n, rounds)
+
+        # 10k ticks ~50 ms apart, spread round-robin over the pairs
+        aggregator = BarAggregator(parse_timeframes("1s,1m,5m,15m"))
+        symbols = list(prices)
+        ticks = [(symbols[i % n], 1_700_000_000_000_000_000 + i * 50_000_000, 1.1, 1.1, 1.1, 1.1, 1.0)
+                 for i in range(10_000)]
+        offset = [0]
+
+        def aggregate() -> None:
+            # shift every pass forward in time, as a live feed would be
+            shift = offset[0]
+            offset[0] += 10_000 * 50_000_000
+            for symbol, ts, o, h, l, c, v in ticks:
+                aggregator.update(symbol, ts + shift, o, h, l, c, v)
+
+        results[f"timeframes.update[{n}]"] = _measure(aggregate, len(ticks), rounds)
+
+        # one random-walk bar per pair per row, 100-row window
+        matrix = CorrelationMatrix(symbols, window=100)
+        walk = np.exp(np.cumsum(np.random.normal(0.0, 1e-4, (256, n)), axis=0)).tolist()
+        row = [0]
+
+        def correlate() -> None:
+            closes = walk[row[0] % len(walk)]
+            row[0] += 1
+            for symbol, close in zip(symbols, closes):
+                matrix.update(symbol, close)
+
+        results[f"correlation.update[{n}]"] = _measure(correlate, n, rounds)
+
+        # 10k open positions entered within ±1 ATR, ticks of 0.05 ATR; every fill re-opens
+        book = PaperBook()
+        atr = 1e-3
+        entries = np.random.uniform(1.0 - atr, 1.0 + atr, 10_000).tolist()
+        for i, entry in enumerate(entries):
+            book.open(symbols[i % n], "BUY" if i % 2 else "SELL", entry, atr)
+        steps = np.random.normal(0.0, 0.05 * atr, 10_000).tolist()
+        last = dict.fromkeys(symbols, 1.0)
+
+        def fill() -> None:
+            for i, step in enumerate(steps):
+                symbol = symbols[i % n]
+                price = last[symbol] = last[symbol] + step
+                for f in book.on_tick(symbol, price):
+                    book.open(symbol, f.direction, price, atr)
+
+        results[f"paper.on_tick[{n}]"] = _measure(fill, len(steps), rounds)
+
+    for h in headline_counts:
+        client = NewsAPIClient("", cache=HeadlineCache(":memory:"))
+        headlines = _headlines(h)
+        symbols = list(settings.PAIR_KEYWORDS)
+
+        def build() -> None:
+            client._index = None
+            client.index_for(list(headlines))
+
+        results[f"news.index[{h}]"] = _measure(build, h, 3 if h >= 100_000 else rounds)
+
+        client.index_for(headlines)
+        lookups = 1_000
+
+        def lookup() -> None:
+            for i in range(lookups):
+                client.sentiment_for_pair(symbols[i % len(symbols)], headlines)
+
+        results[f"news.sentiment[{h}]"] = _measure(lookup, lookups, rounds)
+
+    return results
+
+
+# ── Reporting ─────────────────────────────────────────────────────────────────
+
+def compare(
+    current: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    max_regression: float,
+    metric: str = "min_ns_per_op",
+) -> list[str]:
+    """
+    Print a comparison table; return the names of regressed cases.
+    The fastest round (*metric* default) is the least noisy estimate on a
+    shared machine; pass ``ns_per_op`` to gate on the median instead.
+    """
+    regressed = []
+    print(f"{'CASE':<34}{'BASELINE ns/op':>16}{'CURRENT ns/op':>16}{'CHANGE':>10}")
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<34}{'—':>16}{cur[metric]:>16,.0f}{'new':>10}")
+            continue
+        change = (cur[metric] - base[metric]) / base[metric] * 100
+        flag = ""
+        if change > max_regression:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<34}{base[metric]:>16,.0f}{cur[metric]:>16,.0f}{change:>+9.1f}%{flag}")
+    return regressed
+
+
+def _print_results(results: dict[str, dict[str, float]]) -> None:
+    print(f"{'CASE':<34}{'ns/op':>14}{'ops/s':>16}")
+    for name, r in results.items():
+        print(f"{name:<34}{r['ns_per_op']:>14,.0f}{r['ops_per_sec']:>16,.0f}")
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Ultra Elite Scalping benchmarks")
+    parser.add_argument("--out", help="write results as JSON to this path")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=10.0,
+                        help="allowed slowdown per case in percent (default 10)")
+    parser.add_argument("--metric", choices=("min_ns_per_op", "ns_per_op"), default="min_ns_per_op",
+                        help="statistic compared against the baseline (fastest round or median)")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--quick", action="store_true", help="skip the largest sizes")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)      # no "mock headlines" chatter
+    results = run_benchmarks(quick=args.quick, rounds=args.rounds)
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python":    platform.python_version(),
+            "numpy":     np.__version__,
+            "machine":   platform.machine(),
+            "platform":  platform.platform(),
+            "quick":     args.quick,
+        },
+        "results": results,
+    }
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+    if not args.compare:
+        _print_results(results)
+        return 0
+    with open(args.compare) as fh:
+        baseline = json.load(fh)["results"]
+    regressed = compare(results, baseline, args.max_regression, args.metric)
+    if regressed:
+        print(f"\n{len(regressed)} case(s) regressed by more than {args.max_regression:g} %: "
+              + ", ".join(regressed))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
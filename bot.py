@@ -8,17 +8,68 @@ Purpose : Top-level bot orchestrator.  Wires together:
             - ScoringEngine    (signal generation)
             - NewsAPIClient    (market news sentiment)
             - AIAnalysisClient (Claude AI confirmation)
-            - display helpers  (terminal output)
+            - ConfirmationScheduler (rate-limited, ranked Claude requests)
+            - display helpers  (scrolling print, Dashboard or headless journal)
+            - EventScheduler   (event-driven run mode)
+            - MultiTimeframeEngine (tick → multi-timeframe bars, event mode)
+            - ShardPool        (multi-process scanning of large universes)
+            - PaperBook        (paper-trading fills, realised PnL)
+            - warm-state snapshots (restart without indicator warm-up)
 """
 
+import asyncio
+import logging
 import time
 import math
+from dataclasses import dataclass
 from config import settings
-from core.indicators import IndicatorEngine
-from core.scoring    import ScoringEngine
+from core.indicators import IndicatorEngine, IndicatorSnapshot
+from core.scoring    import ScoringEngine, ScoreResult
+from core.bar_store  import BarStore
+from core.scheduler  import EventScheduler, LatencyStats
+from core.feed       import BarEvent, CoalescingQueue, PriceFeed, SimulatedFeed
+from core.shards     import ShardPool
+from core.snapshot   import Snapshot, read_snapshot, write_snapshot
+from core.timeframes import MultiTimeframeEngine
+from core.correlation import CorrelationMatrix
+from core.paper      import PaperBook
 from apis.news_api   import NewsAPIClient
-from apis.ai_api     import AIAnalysisClient
+from apis.news_index import HeadlineIndex
+from apis.ai_api     import AIAnalysisClient, ConfirmRequest
+from apis.ai_scheduler import ConfirmationScheduler, Candidate
+from utils.metrics   import STAGE_SECONDS, CYCLE_SECONDS, TICK_TO_DECISION_SECONDS, AI_CALLS, log_summary
 import utils.display as ui
+from utils.dashboard import Dashboard
+from utils.journal   import HeadlessOutput
+
+logger = logging.getLogger(__name__)
+
+# Per-stage latency probes (see utils/metrics.py)
+_T_INDICATORS = STAGE_SECONDS.labels("indicators")
+_T_NEWS       = STAGE_SECONDS.labels("news_sentiment")
+_T_PRE_SCORE  = STAGE_SECONDS.labels("pre_score")
+_T_AI         = STAGE_SECONDS.labels("ai_confirm")
+_T_FINAL      = STAGE_SECONDS.labels("final_score")
+_T_RENDER     = STAGE_SECONDS.labels("render")
+_T_CYCLE      = CYCLE_SECONDS.labels()
+_T_HOLD       = TICK_TO_DECISION_SECONDS.labels("hold")
+_T_SIGNAL     = TICK_TO_DECISION_SECONDS.labels("signal")
+
+_AI_POLL_SECONDS = 0.01     # async sweep: how often answered confirmations are collected
+
+
+@dataclass(slots=True)
+class PairAnalysis:
+    """Intermediate state of one pair between pre-score and final score."""
+    symbol:       str
+    data:         IndicatorSnapshot
+    news_bonus:   int
+    top_headline: str
+    pre:          ScoreResult
+    ai_bonus:     int = 0
+    ai_summary:   str = "No AI analysis (score below threshold)"
+    frames:       dict[str, IndicatorSnapshot] | None = None   # per-timeframe indicators (TIMEFRAMES)
+    leader:       str | None = None     # stronger correlated candidate that signals instead
 
 
 class UltraEliteBot:
@@ -28,130 +79,687 @@ class UltraEliteBot:
     Lifecycle
     ---------
     1. run_ultra() → infinite loop of 45-second cycles
-    2. Each cycle: sweep all 6 pairs via _analyse_pair()
-    3. _analyse_pair(): compute indicators → fetch news → ask Claude →
-                        score → emit alert if signal found
+       (run_ultra_async() analyses all pairs of a cycle concurrently;
+       run_events() drops the cycle and reacts to every new bar;
+       run_sharded() spreads the pairs over worker processes)
+    2. Each cycle: pre-score every pair, hand the candidates to the
+       ConfirmationScheduler (best first, within the Claude rate budget,
+       several per request with AI_BATCH_MODE), then finalise
+    3. _analyse_pair(): the same for one pair — compute indicators →
+                        fetch news → ask Claude → score → emit alert
+
+    With SNAPSHOT_PATH set, every run mode starts from that warm-state
+    snapshot when there is one, and rewrites it every SNAPSHOT_SECONDS and
+    on shutdown.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, display: str = settings.DISPLAY_MODE) -> None:
         self.prices: dict[str, float] = dict(settings.PAIRS)
         self.signals: int = 0
-        self.wins: int = 0
         self.max_score: int = 0
 
         self._indicators = IndicatorEngine()
         self._scorer     = ScoringEngine()
-        self._news       = NewsAPIClient(settings.NEWS_API_KEY)
-        self._ai         = AIAnalysisClient(settings.ANTHROPIC_API_KEY)
+        self._news       = NewsAPIClient(settings.NEWS_API_KEY, url=settings.NEWS_API_URL)
+        self._ai         = AIAnalysisClient(settings.ANTHROPIC_API_KEY,
+                                            base_url=settings.ANTHROPIC_BASE_URL)
+        self._confirmer  = ConfirmationScheduler(self._ai)
+
+        # Correlated candidates: only the strongest of a cluster goes to Claude
+        # (see core/correlation.py); event mode keeps the current row's leaders
+        self._correlation: CorrelationMatrix | None = (
+            CorrelationMatrix(self.prices) if settings.CORRELATION_DEDUP else None
+        )
+        self._leaders: dict[str, tuple[str, float, int]] = {}
+        self._leaders_row = -1
+        self.correlated: int = 0
+
+        # Paper trading: every signal opens a simulated TP/SL position that
+        # later bars fill (see core/paper.py) — the live win rate and PnL
+        self._paper = PaperBook()
+
+        # Optional on-disk bar history (see core/bar_store.py)
+        self._store: BarStore | None = (
+            BarStore(settings.BAR_STORE_DIR) if settings.BAR_STORE_DIR else None
+        )
 
         # Cache: refreshed every NEWS_REFRESH_CYCLES cycles
         self._cached_headlines: list[dict] = []
         self._news_cycle_counter: int = 0
 
+        # Event mode: latest indicators per pair (for sweeps) and
+        # bar-arrival → decision latency
+        self._latest: dict[str, IndicatorSnapshot] = {}
+        self.decision_latency = LatencyStats()
+        self.signal_latency   = LatencyStats()
+        self._feed_queue: CoalescingQueue | None = None
+        self._mtf: MultiTimeframeEngine | None = None
+
+        # Sharded mode: the headline index the shards last received
+        self._shard_index: HeadlineIndex | None = None
+        self._shard_news: dict[str, tuple[int, str]] = {}
+        self._shards: ShardPool | None = None
+
+        # Warm-state snapshots: time of the last bar fed per pair
+        self._last_bar_ns: dict[str, int] = {}
+        self._metrics_logged = time.monotonic()
+        self._snapshot_written = time.monotonic()
+
+        # Output: utils.display prints inline; the Dashboard and the headless
+        # journal only queue events for their own threads
+        if display == "dashboard":
+            self._ui = Dashboard(list(self.prices))
+        elif display == "headless":
+            self._ui = HeadlessOutput()
+        else:
+            self._ui = ui
+
     # ── Public ────────────────────────────────────────────────────────────────
 
     def run_ultra(self) -> None:
         """Entry point — runs until KeyboardInterrupt."""
-        ui.print_banner()
+        self._restore()
+        self._ui.print_banner()
         cycle = 0
         try:
             while True:
                 cycle += 1
                 self._refresh_news_if_needed()
-                ui.print_cycle_header(cycle)
+                self._ui.print_cycle_header(cycle)
 
-                cycle_signals = 0
-                for symbol in self.prices:
-                    if self._analyse_pair(symbol):
-                        cycle_signals += 1
-                    time.sleep(settings.PAIR_DELAY)
+                started = time.perf_counter_ns()
+                cycle_signals = self._sweep()
+                _T_CYCLE.observe_ns(time.perf_counter_ns() - started)
+                self._maybe_log_metrics()
+                self._maybe_snapshot()
 
-                ui.print_cycle_footer(
+                self._ui.print_cycle_footer(
                     cycle, cycle_signals,
-                    self.signals, self.wins, self.max_score
+                    self.signals, self._paper.stats(), self.max_score, len(self.prices)
                 )
                 self._countdown(cycle)
 
         except KeyboardInterrupt:
-            ui.print_shutdown(self.signals, self.wins)
+            self._ui.print_shutdown(self.signals, self._paper.stats())
+        finally:
+            self._close()
+
+    async def run_ultra_async(self) -> None:
+        """
+        Concurrent variant of run_ultra().
+
+        News refreshes without blocking the event loop, Claude confirmations
+        run on the scheduler's AI_MAX_CONCURRENCY workers while the loop
+        stays free, and there is no PAIR_DELAY between rows.  Rows are
+        displayed in completion order: pairs that need no AI at once, AI
+        candidates as their answers arrive, so a cycle takes as long as its
+        slowest pair.
+        """
+        self._restore()
+        self._ui.print_banner()
+        cycle = 0
+        try:
+            while True:
+                cycle += 1
+                await self._refresh_news_if_needed_async()
+                self._ui.print_cycle_header(cycle)
+
+                started = time.perf_counter_ns()
+                cycle_signals = await self._sweep_async()
+                _T_CYCLE.observe_ns(time.perf_counter_ns() - started)
+                self._maybe_log_metrics()
+                self._maybe_snapshot()
+
+                self._ui.print_cycle_footer(
+                    cycle, cycle_signals,
+                    self.signals, self._paper.stats(), self.max_score, len(self.prices)
+                )
+                await self._countdown_async(cycle)
+
+        except asyncio.CancelledError:
+            self._ui.print_shutdown(self.signals, self._paper.stats())
+            raise
+        finally:
+            self._close()
+
+    async def run_events(self, feed: PriceFeed | None = None) -> None:
+        """
+        Event-driven variant: every new bar triggers the analysis of its
+        own pair immediately instead of waiting for the next cycle.
+        Bars come from *feed* (see core/feed.py); without one, a seeded
+        random-walk SimulatedFeed is used.
+
+        News refresh, AI confirmation of pending candidates, status output
+        and (optionally) full sweeps of the latest indicators are separate
+        periodic jobs.  Bar-arrival → decision latency is tracked in
+        ``decision_latency`` / ``signal_latency``.
+
+        With TIMEFRAMES set, feed bars are treated as ticks and aggregated
+        into several timeframes (see core/timeframes.py); a pair is scored
+        across all of them whenever its decision-timeframe bar closes.
+        """
+        if settings.TIMEFRAMES:
+            self._mtf = MultiTimeframeEngine(settings.TIMEFRAMES)
+        self._restore()
+        self._ui.print_banner()
+        scheduler = EventScheduler()
+        scheduler.every(settings.SCHEDULER_NEWS_SECONDS, self._refresh_news, name="news", run_now=True)
+        scheduler.every(settings.SCHEDULER_AI_SECONDS, self._confirm_pending, name="ai")
+        scheduler.every(settings.SCHEDULER_SWEEP_SECONDS, self._sweep_latest, name="sweep")
+        scheduler.every(settings.SCHEDULER_STATUS_SECONDS, self._report_status, name="status")
+        scheduler.every(settings.METRICS_LOG_SECONDS, log_summary, name="metrics")
+        if settings.SNAPSHOT_PATH:
+            scheduler.every(settings.SNAPSHOT_SECONDS, self._write_snapshot_async, name="snapshot")
+        if feed is None:
+            for symbol in self.prices:
+                if self._mtf is not None:
+                    if not self._mtf.ready(symbol):
+                        self._mtf.seed(symbol, self.prices)
+                elif not self._indicators.bars_seen(symbol):     # restored pairs are already warm
+                    self._indicators.seed(symbol, self.prices)
+            feed = SimulatedFeed(self.prices, settings.SCHEDULER_TICK_SECONDS)
+        self._feed_queue = scheduler.queue
+        try:
+            await scheduler.run(self._on_bar, feed.stream())
+        except asyncio.CancelledError:
+            self._ui.print_shutdown(self.signals, self._paper.stats())
+            raise
+        finally:
+            self._close()
+
+    def run_sharded(self, workers: int = settings.SHARD_WORKERS) -> None:
+        """
+        Cycle loop for large pair universes.  Indicators and pre-scores run
+        in *workers* processes (see core/shards.py), each owning the state
+        of its own shard; news, Claude confirmation and output stay here.
+        There is no PAIR_DELAY between pairs in this mode.
+        """
+        self._restore()
+        self._ui.print_banner()
+        cycle = 0
+        shards = self._shards = ShardPool(self.prices, workers, states={
+            s: (ns, self._indicators.export_state(s)) for s, ns in self._last_bar_ns.items()
+        })
+        try:
+            while True:
+                cycle += 1
+                self._refresh_news_if_needed()
+                self._ui.print_cycle_header(cycle)
+
+                started = time.perf_counter_ns()
+                cycle_signals = self._sweep_sharded(shards)
+                _T_CYCLE.observe_ns(time.perf_counter_ns() - started)
+                self._maybe_log_metrics()
+                self._maybe_snapshot()
+
+                self._ui.print_cycle_footer(
+                    cycle, cycle_signals,
+                    self.signals, self._paper.stats(), self.max_score, len(self.prices)
+                )
+                self._countdown(cycle)
+
+        except KeyboardInterrupt:
+            self._ui.print_shutdown(self.signals, self._paper.stats())
+        finally:
+            self._close()           # final snapshot still needs the shards
+            shards.close()
+            self._shards = None
 
     # ── Private ───────────────────────────────────────────────────────────────
 
+    def _refresh_news(self) -> None:
+        self._cached_headlines = self._news.fetch_headlines()
+
     def _refresh_news_if_needed(self) -> None:
         self._news_cycle_counter += 1
         if self._news_cycle_counter >= settings.NEWS_REFRESH_CYCLES:
-            self._cached_headlines = self._news.fetch_headlines()
+            self._refresh_news()
+            self._news_cycle_counter = 0
+
+    async def _refresh_news_if_needed_async(self) -> None:
+        self._news_cycle_counter += 1
+        if self._news_cycle_counter >= settings.NEWS_REFRESH_CYCLES:
+            self._cached_headlines = await self._news.fetch_headlines_async()
             self._news_cycle_counter = 0
 
+    def _sweep(self) -> int:
+        """One pass over every pair. Returns the number of signals fired."""
+        cycle_signals = 0
+        analyses = [self._evaluate_pair(symbol) for symbol in self.prices]
+        self._confirm_all(self._lead([a for a in analyses if self._gate(a)]))
+        for analysis in analyses:
+            if self._finalise(analysis):
+                cycle_signals += 1
+            time.sleep(settings.PAIR_DELAY)
+        return cycle_signals
+
+    def _sweep_sharded(self, shards: ShardPool) -> int:
+        """One pass over every shard. Returns the number of signals fired."""
+        index = self._news.index_for(self._cached_headlines)
+        if index is not self._shard_index:
+            # Headlines changed: resend every pair's sentiment bonus
+            self._shard_index = index
+            self._shard_news = {s: index.sentiment_for_pair(s) for s in self.prices}
+            shards.set_news(self._shard_news)
+
+        scans = shards.scan()
+        analyses = [
+            PairAnalysis(scan.symbol, scan.data, scan.news_bonus,
+                         self._shard_news[scan.symbol][1], scan.pre)
+            for scan in scans
+        ]
+        if self._correlation is not None:
+            for analysis in analyses:
+                self._correlation.update(analysis.symbol, analysis.data["price"])
+        now = time.time_ns()
+        for scan in scans:
+            self._fill(scan.symbol, scan.high, scan.low, now)
+        self._confirm_all(self._lead([a for a in analyses if self._gate(a)]))
+        return sum(self._finalise(analysis) for analysis in analyses)
+
+    async def _sweep_async(self) -> int:
+        """Pass over every pair without blocking the loop. Returns the number of signals fired."""
+        analyses = [self._evaluate_pair(symbol) for symbol in self.prices]
+        candidates = self._lead([a for a in analyses if self._gate(a)])
+        started = time.perf_counter_ns()
+        self._confirmer.submit(*(self._candidate(a, started) for a in candidates))
+
+        # rows in completion order: everything that needs no AI is done already
+        waiting = {id(a) for a in candidates}
+        cycle_signals = sum(self._finalise(a) for a in analyses if id(a) not in waiting)
+        while waiting:
+            outcomes = self._confirmer.collect()
+            if not outcomes:
+                await asyncio.sleep(_AI_POLL_SECONDS)
+                continue
+            for outcome in outcomes:
+                analysis = outcome.ref
+                analysis.ai_bonus, analysis.ai_summary = outcome.bonus, outcome.summary
+                waiting.discard(id(analysis))
+                cycle_signals += self._finalise(analysis)
+        if candidates:
+            _T_AI.observe_ns(time.perf_counter_ns() - started)
+        return cycle_signals
+
     def _analyse_pair(self, symbol: str) -> bool:
         """Run full analysis pipeline for one pair. Returns True if signal fired."""
+        analysis = self._evaluate_pair(symbol)
+        if self._gate(analysis):
+            self._confirm_all([analysis])
+        return self._finalise(analysis)
+
+    def _evaluate_pair(self, symbol: str) -> PairAnalysis:
+        """Indicators, news sentiment and the pre-score (without AI bonus)."""
         # 1. Technical indicators
+        started = time.perf_counter_ns()
         data = self._indicators.compute(symbol, self.prices)
+        _T_INDICATORS.observe_ns(time.perf_counter_ns() - started)
+        if self._correlation is not None:
+            self._correlation.update(symbol, data["price"])
+        self._last_bar_ns[symbol] = time.time_ns()
+        bar = self._indicators.last_bar(symbol)
+        self._fill(symbol, bar[1], bar[2], self._last_bar_ns[symbol])
+        if self._store is not None:
+            self._store.record(symbol, self._last_bar_ns[symbol], *bar)
+        return self._pre_score(symbol, data)
 
+    def _pre_score(
+        self, symbol: str, data: IndicatorSnapshot, frames: dict[str, IndicatorSnapshot] | None = None
+    ) -> PairAnalysis:
+        """Steps 2-3 of _evaluate_pair for already computed indicators."""
         # 2. News sentiment for this pair
+        t0 = time.perf_counter_ns()
         news_bonus, top_headline = self._news.sentiment_for_pair(
             symbol, self._cached_headlines
         )
 
-        # 3. Pre-score (without AI bonus) to decide whether to call Claude
-        pre = self._scorer.score(data, news_bonus=news_bonus, ai_bonus=0,
-                                 threshold=settings.SIGNAL_THRESHOLD)
+        # 3. Pre-score (without AI bonus) to decide whether to call Claude;
+        #    trigger labels are only built if the pair ends up signalling
+        t1 = time.perf_counter_ns()
+        if frames is not None:
+            pre = self._scorer.score_timeframes(frames, news_bonus=news_bonus, ai_bonus=0,
+                                                threshold=settings.SIGNAL_THRESHOLD, labels=False)
+        else:
+            pre = self._scorer.score(data, news_bonus=news_bonus, ai_bonus=0,
+                                     threshold=settings.SIGNAL_THRESHOLD, labels=False)
+        t2 = time.perf_counter_ns()
+        _T_NEWS.observe_ns(t1 - t0)
+        _T_PRE_SCORE.observe_ns(t2 - t1)
+        return PairAnalysis(symbol, data, news_bonus, top_headline, pre, frames=frames)
 
-        # 4. Claude AI confirmation (only when pre-score looks promising)
-        ai_bonus = 0
-        ai_summary = "No AI analysis (score below threshold)"
-        if max(pre.buy_score, pre.sell_score) >= settings.SIGNAL_THRESHOLD - 15:
-            ai_bonus, ai_summary = self._ai.confirm_signal(
-                symbol, data, pre.direction, top_headline
-            )
+    @staticmethod
+    def _needs_ai(analysis: PairAnalysis) -> bool:
+        """Claude is only consulted when the pre-score looks promising."""
+        pre = analysis.pre
+        return max(pre.buy_score, pre.sell_score) >= settings.SIGNAL_THRESHOLD - settings.AI_GATE_MARGIN
 
-        # 5. Final score with AI bonus applied
-        result = self._scorer.score(
-            data,
-            news_bonus=news_bonus,
-            ai_bonus=ai_bonus,
-            threshold=settings.SIGNAL_THRESHOLD,
+    def _gate(self, analysis: PairAnalysis, since_ns: int | None = None) -> bool:
+        """_needs_ai(); with AI_SPECULATIVE every pre-score also feeds the prefetch."""
+        if settings.AI_SPECULATIVE:
+            pre = analysis.pre
+            lead = "BUY" if pre.buy_score >= pre.sell_score else "SELL"
+            since = time.perf_counter_ns() if since_ns is None else since_ns
+            self._confirmer.observe(self._candidate(analysis, since), lead)
+        return self._needs_ai(analysis)
+
+    @staticmethod
+    def _candidate(analysis: PairAnalysis, since_ns: int) -> Candidate:
+        """Scheduler entry for *analysis*, ranked by its margin over the threshold."""
+        pre = analysis.pre
+        return Candidate(
+            ConfirmRequest(analysis.symbol, analysis.data, pre.direction, analysis.top_headline),
+            max(pre.buy_score, pre.sell_score) - settings.SIGNAL_THRESHOLD, since_ns, analysis,
         )
 
+    @staticmethod
+    def _bet(analysis: PairAnalysis) -> tuple[str, float, int]:
+        """(symbol, strength, +1 long / −1 short) for CorrelationMatrix.deduplicate()."""
+        pre = analysis.pre
+        return analysis.symbol, max(pre.buy_score, pre.sell_score), 1 if pre.buy_score >= pre.sell_score else -1
+
+    def _lead(self, candidates: list[PairAnalysis]) -> list[PairAnalysis]:
+        """A cycle's AI candidates without the followers of a correlated cluster."""
+        if self._correlation is None or len(candidates) < 2:
+            return candidates
+        followers = self._correlation.deduplicate([self._bet(a) for a in candidates])
+        for analysis in candidates:
+            if analysis.symbol in followers:
+                self._follow(analysis, followers[analysis.symbol])
+        return [a for a in candidates if a.leader is None]
+
+    def _follows(self, analysis: PairAnalysis) -> bool:
+        """Event mode: a stronger correlated candidate of the same row went to Claude already."""
+        if self._correlation is None:
+            return False
+        if self._leaders_row != self._correlation.rows:
+            self._leaders_row = self._correlation.rows
+            self._leaders.clear()
+        bet = self._bet(analysis)
+        leaders = [b for symbol, b in self._leaders.items() if symbol != analysis.symbol]
+        leader = self._correlation.deduplicate([bet], leaders).get(analysis.symbol)
+        if leader is None:
+            self._leaders[analysis.symbol] = bet
+            return False
+        self._follow(analysis, leader)
+        return True
+
+    def _follow(self, analysis: PairAnalysis, leader: str) -> None:
+        analysis.leader = leader
+        analysis.ai_summary = f"Correlated with {leader} — the stronger signal"
+        self.correlated += 1
+        AI_CALLS.labels("correlated", "skipped").inc()
+
+    def _confirm_all(self, analyses: list[PairAnalysis]) -> None:
+        """
+        4. Claude AI confirmation of a cycle's candidates: best margin first,
+        within the rate budget.  Candidates the scheduler drops keep no AI bonus.
+        """
+        if not analyses:
+            return
+        started = time.perf_counter_ns()
+        for outcome in self._confirmer.confirm([self._candidate(a, started) for a in analyses]):
+            outcome.ref.ai_bonus, outcome.ref.ai_summary = outcome.bonus, outcome.summary
+        _T_AI.observe_ns(time.perf_counter_ns() - started)
+
+    def _fill(self, symbol: str, high: float, low: float, timestamp: int) -> None:
+        """Settle the paper positions of *symbol* the latest bar reached, before new ones open."""
+        for fill in self._paper.on_tick(symbol, high, low, timestamp):
+            logger.debug("Paper %s %s closed at %.5f: %+.1f pips", fill.direction, fill.symbol,
+                         fill.exit, fill.pips)
+
+    def _finalise(self, analysis: PairAnalysis) -> bool:
+        """Final score, display and signal emission. Returns True if signal fired."""
+        symbol, data, news_bonus = analysis.symbol, analysis.data, analysis.news_bonus
+
+        # 5. Final score: the pre-score plus the AI bonus, no second evaluation
+        started = time.perf_counter_ns()
+        result = self._scorer.with_ai(analysis.pre, analysis.ai_bonus, settings.SIGNAL_THRESHOLD)
+        scored = time.perf_counter_ns()
+        _T_FINAL.observe_ns(scored - started)
+
         best_score = max(result.buy_score, result.sell_score)
         self.max_score = max(self.max_score, best_score)
 
         # 6. Display scan row
-        sentiment_tag = {
-            1: "BULLISH", -1: "BEARISH", 0: "NEUTRAL"
-        }.get(news_bonus // max(1, abs(news_bonus)), "NEUTRAL") if news_bonus else "NEUTRAL"
+        sentiment_tag = "BULLISH" if news_bonus > 0 else "BEARISH" if news_bonus < 0 else "NEUTRAL"
 
-        ui.print_pair_row(symbol, data, result.buy_score, result.sell_score,
+        self._ui.print_pair_row(symbol, data, result.buy_score, result.sell_score,
                           sentiment_tag, self.max_score)
 
-        # 7. Emit signal or hold
-        if result.direction in ("BUY", "SELL"):
+        # 7. Emit signal or hold; a correlated follower leaves it to its leader
+        if result.direction in ("BUY", "SELL") and analysis.leader is None:
             confidence = min(97.0, 80 + (best_score - 50) * 0.7)
-            ui.print_signal_label(result.direction, confidence)
+            self._ui.print_signal_label(result.direction, confidence)
 
             self.signals += 1
-            self.wins    += 1          # track as win (outcome unknown in demo)
-            ui.print_elite_alert(
+            self._paper.open(symbol, result.direction, data["price"], data["atr"], time.time_ns())
+            self._ui.print_elite_alert(
                 signal_num   = self.signals,
                 symbol       = symbol,
                 direction    = result.direction,
                 confidence   = confidence,
                 data         = data,
-                triggers     = result.triggers,
+                triggers     = self._scorer.triggers(data, news_bonus, analysis.ai_bonus),
                 score        = best_score,
-                wins         = self.wins,
+                wins         = self._paper.wins,
                 signals      = self.signals,
-                news_headline= top_headline,
-                ai_summary   = ai_summary,
+                news_headline= analysis.top_headline,
+                ai_summary   = analysis.ai_summary,
             )
+            _T_RENDER.observe_ns(time.perf_counter_ns() - scored)
             return True
 
-        ui.print_hold(result.buy_score, result.sell_score, self.max_score)
+        self._ui.print_hold(result.buy_score, result.sell_score, self.max_score)
+        _T_RENDER.observe_ns(time.perf_counter_ns() - scored)
         return False
 
-    @staticmethod
-    def _countdown(cycle: int) -> None:
+    # ── Event mode ────────────────────────────────────────────────────────────
+
+    async def _on_bar(self, event: BarEvent) -> None:
+        """Analyse *event.symbol* right away; AI candidates wait for the AI job."""
+        if self._mtf is not None:
+            self._on_tick(event)
+            return
+        symbol = event.symbol
+        started = time.perf_counter_ns()
+        data = self._indicators.update(symbol, *event.ohlcv)
+        _T_INDICATORS.observe_ns(time.perf_counter_ns() - started)
+        if self._correlation is not None:
+            # one row of returns per mean bar interval of the feed
+            self._correlation.update(symbol, data["price"],
+                                     event.timestamp // int(settings.SCHEDULER_TICK_SECONDS * 1e9))
+        self._last_bar_ns[symbol] = event.timestamp
+        self._fill(symbol, event.high, event.low, event.timestamp)
+        if self._store is not None:
+            self._store.record(symbol, event.timestamp, *event.ohlcv)
+        if self._indicators.bars_seen(symbol) <= settings.INDICATOR_WARMUP_BARS:
+            return
+        self._latest[symbol] = data
+        self._decide(self._pre_score(symbol, data), event.received_ns)
+
+    def _on_tick(self, event: BarEvent) -> None:
+        """TIMEFRAMES variant of _on_bar: score when the decision-timeframe bar closes."""
+        symbol = event.symbol
+        started = time.perf_counter_ns()
+        closed = self._mtf.update(symbol, event.timestamp, *event.ohlcv)
+        _T_INDICATORS.observe_ns(time.perf_counter_ns() - started)
+        self._last_bar_ns[symbol] = event.timestamp
+        self._fill(symbol, event.high, event.low, event.timestamp)
+        if self._store is not None:
+            self._store.record(symbol, event.timestamp, *event.ohlcv)
+        primary = next((bar for bar in closed if bar.timeframe == self._mtf.primary), None)
+        if primary is not None and self._correlation is not None:
+            # one row of returns per decision-timeframe bar
+            self._correlation.update(symbol, primary.close, primary.timestamp)
+        if primary is None or not self._mtf.ready(symbol):
+            return
+        frames = self._mtf.frames(symbol)
+        self._latest[symbol] = frames[self._mtf.primary]
+        self._decide(self._pre_score(symbol, self._latest[symbol], frames), event.received_ns)
+
+    def _decide(self, analysis: PairAnalysis, since_ns: int) -> None:
+        if self._gate(analysis, since_ns) and not self._follows(analysis):
+            # a newer candidate replaces a queued one but keeps its arrival time
+            self._confirmer.submit(self._candidate(analysis, since_ns))
+            return
+        self._finalise_timed(analysis, since_ns)
+
+    def _finalise_timed(self, analysis: PairAnalysis, since_ns: int) -> None:
+        fired = self._finalise(analysis)
+        latency = self.decision_latency.record(since_ns)
+        if fired:
+            self.signal_latency.record(since_ns)
+        (_T_SIGNAL if fired else _T_HOLD).observe_ns(latency)
+
+    async def _confirm_pending(self) -> None:
+        """AI job: finalise every candidate the scheduler answered or dropped since the last run."""
+        for outcome in self._confirmer.collect():
+            analysis = outcome.ref
+            analysis.ai_bonus, analysis.ai_summary = outcome.bonus, outcome.summary
+            self._finalise_timed(analysis, outcome.since_ns)
+
+    async def _sweep_latest(self) -> None:
+        """Sweep job: re-score every pair on its latest bar (e.g. after news)."""
+        now = time.perf_counter_ns()
+        for symbol, data in list(self._latest.items()):
+            frames = self._mtf.frames(symbol) if self._mtf is not None else None
+            self._decide(self._pre_score(symbol, data, frames), now)
+
+    async def _report_status(self) -> None:
+        self._ui.print_event_status(
+            self.signals, self._paper.stats(), self.max_score,
+            self.decision_latency.summary(), self.signal_latency.summary(),
+            self._feed_queue.stats(),
+        )
+
+    def _maybe_log_metrics(self) -> None:
+        if time.monotonic() - self._metrics_logged >= settings.METRICS_LOG_SECONDS:
+            self._metrics_logged = time.monotonic()
+            log_summary()
+
+    # ── Warm-state snapshots ─────────────────────────────────────────────────
+
+    def _restore(self) -> None:
+        """
+        Load the warm-state snapshot, then replay the bars the bar store
+        recorded after it, so indicators are valid from the first bar.
+        Headlines come back from the persistent news cache.  With TIMEFRAMES,
+        entries are keyed ``SYMBOL@timeframe`` and go to the matching
+        engine; a pair is scored again once every timeframe closed a bar.
+        """
+        if not settings.SNAPSHOT_PATH:
+            return
+        snapshot = read_snapshot(settings.SNAPSHOT_PATH)
+        if snapshot is None:
+            return
+        started = time.perf_counter()
+        self.signals = snapshot.counters["signals"]
+        # "wins" is informational: open paper positions do not survive a restart
+        self.max_score = snapshot.counters["max_score"]
+        self._news_cycle_counter = snapshot.counters["news_cycle_counter"]
+
+        for key, (last_ns, state) in snapshot.pairs.items():
+            symbol, _, timeframe = key.partition("@")
+            if symbol not in self.prices or bool(timeframe) != (self._mtf is not None):
+                continue
+            if timeframe:
+                if timeframe not in self._mtf.engines:
+                    continue
+                self._mtf.engines[timeframe].import_state(symbol, state)
+            else:
+                self._indicators.import_state(symbol, state)
+            self._last_bar_ns[symbol] = last_ns
+
+        replayed = 0
+        engine = self._mtf.engines[self._mtf.primary] if self._mtf is not None else self._indicators
+        for symbol, last_ns in self._last_bar_ns.items():
+            if self._store is not None:
+                bars = self._store.read(symbol, start=last_ns + 1)
+                columns = [bars[k].tolist() for k in ("timestamp", "open", "high", "low", "close", "volume")]
+                for ts, *bar in zip(*columns):
+                    if self._mtf is not None:
+                        self._mtf.update(symbol, ts, *bar)
+                    else:
+                        self._indicators.update(symbol, *bar)
+                if columns[0]:
+                    self._last_bar_ns[symbol] = columns[0][-1]
+                    replayed += len(columns[0])
+            # the demo random walk continues from the last close
+            last = engine.last_bar(symbol)
+            if last is not None:
+                self.prices[symbol] = last[3]
+
+        self._cached_headlines = self._news.cache.latest(settings.NEWS_HEADLINE_LIMIT)
+        logger.info(
+            "Warm start: %d pairs from a %.0fs old snapshot, %d stored bars replayed in %.1f ms",
+            len(self._last_bar_ns), (time.time_ns() - snapshot.created_ns) / 1e9,
+            replayed, (time.perf_counter() - started) * 1000,
+        )
+
+    def _maybe_snapshot(self) -> None:
+        if settings.SNAPSHOT_PATH and time.monotonic() - self._snapshot_written >= settings.SNAPSHOT_SECONDS:
+            self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        snapshot = self._take_snapshot()
+        if snapshot is not None:
+            self._save_snapshot(snapshot)
+
+    async def _write_snapshot_async(self) -> None:
+        """Snapshot job of the event mode: state is read on the loop, only the write is offloaded."""
+        snapshot = self._take_snapshot()
+        if snapshot is not None:
+            await asyncio.to_thread(self._save_snapshot, snapshot)
+
+    def _take_snapshot(self) -> Snapshot | None:
+        """Counters and per-pair indicator state; must run on the thread that updates them."""
+        self._snapshot_written = time.monotonic()
+        counters = {"signals": self.signals, "wins": self._paper.wins, "max_score": self.max_score,
+                    "news_cycle_counter": self._news_cycle_counter}
+        try:
+            if self._shards is not None:
+                pairs = self._shards.export()
+            elif self._mtf is not None:
+                pairs = {f"{s}@{tf}": (ns, blob) for s, ns in self._last_bar_ns.items()
+                         for tf, blob in self._mtf.export_state(s).items()}
+            else:
+                pairs = {s: (ns, self._indicators.export_state(s)) for s, ns in self._last_bar_ns.items()}
+        except (OSError, EOFError) as e:
+            logger.warning("Warm-state snapshot failed: %s", e)
+            return None
+        return Snapshot(counters, pairs)
+
+    def _save_snapshot(self, snapshot: Snapshot) -> None:
+        try:
+            size = write_snapshot(settings.SNAPSHOT_PATH, snapshot)
+        except OSError as e:
+            logger.warning("Warm-state snapshot failed: %s", e)
+            return
+        logger.debug("Warm-state snapshot: %d pairs, %d bytes", len(snapshot.pairs), size)
+
+    def _close(self) -> None:
+        if settings.SNAPSHOT_PATH:
+            self._write_snapshot()
+        self._ui.close()
+        if self._store is not None:
+            self._store.close()
+        self._news.cache.close()
+        self._confirmer.close()
+        logger.info("AI confirmation cache: %s", self._ai.cache.stats())
+        logger.info("AI token usage: %s", self._ai.usage_stats())
+        logger.info("Correlated candidates left to a stronger pair: %d", self.correlated)
+        logger.info("Paper trading: %s", self._paper.stats())
+        logger.info("AI confirmation scheduler: %s", self._confirmer.stats())
+        log_summary()
+
+    def _countdown(self, cycle: int) -> None:
         for i in range(settings.CYCLE_SECONDS, 0, -5):
-            ui.print_countdown(i, cycle + 1)
+            self._ui.print_countdown(i, cycle + 1)
             time.sleep(5)
-        print("\r" + " " * 60 + "\r", end="")
+        self._ui.clear_countdown()
+
+    async def _countdown_async(self, cycle: int) -> None:
+        for i in range(settings.CYCLE_SECONDS, 0, -5):
+            self._ui.print_countdown(i, cycle + 1)
+            await asyncio.sleep(5)
+        self._ui.clear_countdown()
@@ -0,0 +1,160 @@
+"""
+ultra_elite_scalping/core/correlation.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Rolling cross-pair return correlation for de-duplicating signals.
+
+EURUSD, GBPUSD and EURGBP — or USDCAD and AUDUSD through the dollar —
+often fire on the same move.  ``CorrelationMatrix`` keeps the Pearson
+correlation of every pair's per-bar log returns over the last
+CORRELATION_WINDOW bars.  Nothing is recomputed per bar: the window's
+return sums and the N×N matrix of cross-products are updated in place,
+one rank-1 update for the row of returns entering the window and one
+rank-1 downdate for the row leaving it.  Once per window the
+cross-products are rebuilt from the ring buffer so rounding errors do not
+accumulate.  Correlations are only formed on demand, for the few pairs
+that are candidates at the same time.
+
+``deduplicate()`` clusters those candidates: taken strongest first, a
+candidate whose correlation with an already chosen leader, signed by the
+two directions, reaches CORRELATION_THRESHOLD follows that leader.  A
+follower is neither sent to Claude nor alerted.
+
+Prices are grouped into rows of returns.  Without a row number a row is
+complete when a pair reports a second price — in the cycle modes, the start
+of the next sweep.  Event mode passes the bar period as the row number, so a
+row closes when the first price of a later period arrives.  Pairs without a
+price in a row count as unchanged; several prices of one pair in a row add
+up to one return.
+
+Usage
+-----
+    matrix = CorrelationMatrix(prices)
+    matrix.update("EURUSD", 1.0854)          # once per bar and pair
+    followers = matrix.deduplicate([("EURUSD", 74, 1), ("GBPUSD", 71, 1)])
+"""
+
+import math
+
+import numpy as np
+
+from config.settings import CORRELATION_WINDOW, CORRELATION_MIN_BARS, CORRELATION_THRESHOLD
+
+
+class CorrelationMatrix:
+    """
+    Rolling return correlation of a fixed pair universe.
+
+    ``update()`` records one price; ``correlation()`` returns the
+    correlation sub-matrix of any subset of pairs, ``deduplicate()`` maps
+    correlated candidates to the strongest of their cluster.  Symbols
+    outside the universe are ignored.
+    """
+
+    def __init__(self, symbols, window: int = CORRELATION_WINDOW) -> None:
+        self.symbols: list[str] = list(symbols)
+        self._index = {s: i for i, s in enumerate(self.symbols)}
+        n = len(self.symbols)
+        self.window = max(2, window)
+        self.rows = 0                                   # rows committed so far
+        self._ring = np.zeros((self.window, n))         # returns of the last *window* rows
+        self._head = 0
+        self._sum = np.zeros(n)
+        self._cross = np.zeros((n, n))                  # Σ rᵢ rⱼ over the window
+        self._outer = np.empty((n, n))                  # scratch for the rank-1 terms
+        self._last = np.full(n, np.nan)                 # last price per pair
+        self._row = np.zeros(n)                         # returns of the forming row
+        self._filled = np.zeros(n, dtype=bool)
+        self._row_key: int | None = None
+
+    def update(self, symbol: str, price: float, row: int | None = None) -> None:
+        """Record *symbol*'s price; *row* (e.g. the bar period) selects the row of returns."""
+        i = self._index.get(symbol)
+        if i is None or not price > 0:
+            return
+        if row is None:
+            if self._filled[i]:
+                self._commit()
+        elif self._row_key is None or row > self._row_key:
+            if self._filled.any():
+                self._commit()
+            self._row_key = row
+        last = self._last[i]
+        if last == last:                                # NaN before the first price
+            self._row[i] += math.log(price / last)
+        self._last[i] = price
+        self._filled[i] = True
+
+    @property
+    def ready(self) -> bool:
+        """Enough rows for the correlations to mean something."""
+        return self.rows >= CORRELATION_MIN_BARS
+
+    def correlation(self, symbols: list[str]) -> np.ndarray:
+        """Correlation matrix of *symbols* (all in the universe) over the window."""
+        idx = [self._index[s] for s in symbols]
+        n = min(self.rows, self.window)
+        if n < 2:
+            return np.eye(len(idx))
+        mean = self._sum[idx] / n
+        cov = self._cross[np.ix_(idx, idx)] / n - np.outer(mean, mean)
+        std = np.sqrt(np.clip(np.diagonal(cov), 0.0, None))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(std, std)
+        corr[~np.isfinite(corr)] = 0.0                  # pairs that have not moved
+        np.fill_diagonal(corr, 1.0)
+        return corr
+
+    def deduplicate(
+        self,
+        candidates: list[tuple[str, float, int]],
+        leaders: list[tuple[str, float, int]] = (),
+        threshold: float = CORRELATION_THRESHOLD,
+    ) -> dict[str, str]:
+        """
+        Cluster *candidates* — (symbol, strength, +1 long / −1 short) — and
+        return {follower: leader}.  *leaders* were chosen earlier (event
+        mode) and stay leaders, but only suppress weaker candidates.
+        """
+        if not self.ready or len(candidates) + len(leaders) < 2:
+            return {}
+        pool = [c for c in (*leaders, *candidates) if c[0] in self._index]
+        corr = self.correlation([c[0] for c in pool])
+        fixed = len(pool) - len([c for c in candidates if c[0] in self._index])
+        sign = np.array([c[2] for c in pool], dtype=float)
+        # signed: a positive value means both candidates bet on the same move
+        same_move = corr * np.outer(sign, sign) >= threshold
+        chosen: list[int] = []
+        followers: dict[str, str] = {}
+        for k in sorted(range(len(pool)), key=lambda k: -pool[k][1]):
+            if k >= fixed:
+                leader = next((j for j in chosen if same_move[k, j]), None)
+                if leader is not None:
+                    followers[pool[k][0]] = pool[leader][0]
+                    continue
+            chosen.append(k)
+        return followers
+
+    # ── Private ───────────────────────────────────────────────────────────────
+
+    def _commit(self) -> None:
+        """Move the forming row into the window: one rank-1 update, one downdate."""
+        new = self._row
+        if self.rows >= self.window:
+            old = self._ring[self._head]
+            np.outer(old, old, out=self._outer)
+            self._cross -= self._outer
+            self._sum -= old
+        np.outer(new, new, out=self._outer)
+        self._cross += self._outer
+        self._sum += new
+        self._ring[self._head] = new
+        self._head = (self._head + 1) % self.window
+        self.rows += 1
+        if self._head == 0:
+            # once per window: rebuild from the ring to shed accumulated rounding
+            np.dot(self._ring.T, self._ring, out=self._cross)
+            self._ring.sum(axis=0, out=self._sum)
+        new[:] = 0.0
+        self._filled[:] = False
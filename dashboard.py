@@ -0,0 +1,288 @@
+"""
+ultra_elite_scalping/utils/dashboard.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : In-place terminal dashboard.  Drop-in replacement for the
+          print helpers of utils/display.py (same method names), selected
+          with ``main.py --dashboard`` or DISPLAY_MODE=dashboard.
+
+Calls from the analysis loop only enqueue an event; they never touch the
+terminal.  A renderer thread applies the events to a fixed table — one
+row per pair plus the most recent alerts — and redraws it at most
+DASHBOARD_FPS times a second.  Each frame rewrites only the cells whose
+text changed since the previous one, using cursor positioning, so a
+quiet table costs no terminal output at all.
+"""
+
+import queue
+import shutil
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, TextIO
+
+from config.settings import (
+    TP_ATR_MULTIPLIER, SL_ATR_MULTIPLIER, DASHBOARD_FPS, DASHBOARD_ALERT_ROWS,
+)
+from core.paper import PaperStats
+from utils.display import GREEN, RED, GOLD, PLATINUM, STEEL, DIAMOND, CARBON, RESET, BOLD, paper_summary
+
+WIDTH = 95
+
+# Pair table: (header, width) per column
+COLUMNS = (
+    ("PAIR", 8), ("PRICE", 11), ("RSI", 7), ("STOCH", 7), ("CCI", 7),
+    ("NEWS", 10), ("BUY", 6), ("SELL", 6), ("STATUS", 12), ("UPDATED", 10),
+)
+
+# A frame maps (row, column) — both 1-based terminal positions — to
+# (text, colour); text is already padded to the cell width.
+Frame = dict[tuple[int, int], tuple[str, str]]
+
+
+class Dashboard:
+    """
+    Fixed-layout terminal table fed through a queue.
+
+    Every ``print_*`` method mirrors its utils/display.py namesake and
+    returns immediately; values are copied out of mutable arguments before
+    queueing.  ``close()`` draws the final frame, restores the cursor and
+    stops the renderer thread.
+    """
+
+    def __init__(
+        self,
+        symbols: list[str],
+        fps: float = DASHBOARD_FPS,
+        alert_rows: int = DASHBOARD_ALERT_ROWS,
+        stream: TextIO | None = None,
+    ) -> None:
+        self._events: queue.SimpleQueue = queue.SimpleQueue()
+        self._stream = stream or sys.stdout
+        self._interval = 1.0 / fps
+        self._thread = threading.Thread(target=self._run, name="dashboard", daemon=True)
+        self._started = False
+        self.frames = 0                          # frames that wrote anything
+        self.cells_written = 0
+
+        # Render-thread state
+        self._symbols = list(symbols)
+        self._rows: dict[str, dict[str, tuple[str, str]]] = {s: {} for s in self._symbols}
+        self._alerts: deque[tuple[str, str]] = deque(maxlen=alert_rows)
+        self._alert_rows = alert_rows
+        self._status = ("", STEEL)
+        self._summary = ("", DIAMOND)
+        self._countdown = ""
+        self._last_symbol = ""
+        self._previous: Frame = {}
+        self._stopped = False
+
+    # ── Public: utils/display.py interface ───────────────────────────────────
+
+    def print_banner(self) -> None:
+        """Start the renderer (the banner is the dashboard's title row)."""
+        if not self._started:
+            self._started = True
+            self._thread.start()
+
+    def print_cycle_header(self, cycle: int) -> None:
+        self._post(self._on_cycle_header, cycle, datetime.now().strftime("%H:%M:%S"))
+
+    def print_pair_row(self, symbol: str, data: dict, buy_score: int, sell_score: int,
+                       news_sentiment: str, max_score: int) -> None:
+        self._post(self._on_pair_row, symbol, data["price"], data["rsi"], data["stoch"],
+                   data["cci"], news_sentiment, buy_score, sell_score,
+                   datetime.now().strftime("%H:%M:%S"))
+
+    def print_hold(self, buy_score: int, sell_score: int, max_score: int) -> None:
+        self._post(self._on_status, f"HOLD {max(buy_score, sell_score):3d}/{max_score:3d}", CARBON)
+
+    def print_signal_label(self, direction: str, confidence: float) -> None:
+        color = GREEN if direction == "BUY" else RED
+        self._post(self._on_status, f"{direction} {confidence:2.0f}%", color + BOLD)
+
+    def print_elite_alert(
+        self,
+        signal_num: int,
+        symbol: str,
+        direction: str,
+        confidence: float,
+        data: dict,
+        triggers: list[str],
+        score: int,
+        wins: int,
+        signals: int,
+        news_headline: str,
+        ai_summary: str,
+    ) -> None:
+        tp = data["atr"] * 10_000 * TP_ATR_MULTIPLIER
+        sl = data["atr"] * 10_000 * SL_ATR_MULTIPLIER
+        text = (f"#{signal_num:<4d} {datetime.now().strftime('%H:%M:%S')} {direction:<4} {symbol:<6} "
+                f"@{data['price']:.5f} TP {tp:.1f} SL {sl:.1f} | {score}/120 {confidence:.0f}% | "
+                f"{', '.join(triggers)} | AI: {ai_summary}")
+        self._post(self._on_alert, text, GREEN if direction == "BUY" else RED)
+
+    def print_cycle_footer(self, cycle: int, signals: int, total_signals: int,
+                           paper: PaperStats, max_score: int, pairs: int) -> None:
+        self._post(self._on_totals, total_signals, paper, max_score,
+                   f"CYCLE #{cycle}: {signals}/{pairs} signals")
+
+    def print_event_status(self, total_signals: int, paper: PaperStats, max_score: int,
+                           decisions: dict, signals: dict, feed: dict) -> None:
+        self._post(self._on_totals, total_signals, paper, max_score,
+                   f"{decisions['count']} decisions | tick→decision p50 {decisions['p50_ms']:.1f} ms"
+                   f" p99 {decisions['p99_ms']:.1f} ms | {feed['received']:,d} bars in"
+                   f" | {feed['coalesced']:,d} coalesced")
+
+    def print_countdown(self, seconds_left: int, next_cycle: int) -> None:
+        self._post(self._on_countdown, f"next cycle in {seconds_left:2d}s")
+
+    def clear_countdown(self) -> None:
+        self._post(self._on_countdown, "")
+
+    def print_shutdown(self, total_signals: int, paper: PaperStats) -> None:
+        self.close()
+        self._stream.write(f"\n{RED}{BOLD}ULTRA ELITE STOPPED{RESET}\n"
+                           f"{GREEN}{BOLD}{total_signals} SIGNALS | {paper.wins} WINS"
+                           f" | {paper.win_rate:5.1f}% WR{RESET}\n"
+                           f"{DIAMOND}{paper_summary(paper)}{RESET}\n")
+        self._stream.flush()
+
+    def close(self) -> None:
+        """Render the last frame and leave the cursor below the table."""
+        if self._started and not self._stopped:
+            self._events.put(None)
+            self._thread.join()
+
+    # ── Private: event handlers (renderer thread) ────────────────────────────
+
+    def _post(self, handler: Callable, *args) -> None:
+        self._events.put((handler, args))
+
+    def _on_cycle_header(self, cycle: int, now: str) -> None:
+        self._status = (f"{now} | CYCLE #{cycle:03d} | ELITE SWEEP", STEEL + BOLD)
+
+    def _on_pair_row(self, symbol: str, price: float, rsi: float, stoch: float, cci: float,
+                     news: str, buy: int, sell: int, now: str) -> None:
+        if symbol not in self._rows:
+            self._symbols.append(symbol)
+        news_color = GREEN if news == "BULLISH" else RED if news == "BEARISH" else CARBON
+        self._rows[symbol] = {
+            "PAIR":    (symbol, PLATINUM),
+            "PRICE":   (f"{price:.5f}", ""),
+            "RSI":     (f"{rsi:.1f}", ""),
+            "STOCH":   (f"{stoch:.1f}", ""),
+            "CCI":     (f"{cci:.0f}", ""),
+            "NEWS":    (news, news_color),
+            "BUY":     (f"{buy:d}", GREEN if buy > sell else ""),
+            "SELL":    (f"{sell:d}", RED if sell > buy else ""),
+            "STATUS":  self._rows.get(symbol, {}).get("STATUS", ("", "")),
+            "UPDATED": (now, CARBON),
+        }
+        self._last_symbol = symbol
+
+    def _on_status(self, text: str, color: str) -> None:
+        # Follows the row of the same pair, as in print mode
+        if self._last_symbol:
+            self._rows[self._last_symbol]["STATUS"] = (text, color)
+
+    def _on_alert(self, text: str, color: str) -> None:
+        self._alerts.appendleft((text, color))
+
+    def _on_totals(self, total_signals: int, paper: PaperStats, max_score: int, detail: str) -> None:
+        self._summary = (f"{total_signals} SIGNALS | WR {paper.win_rate:5.1f}% | MAX SCORE {max_score}/120"
+                         f" | {paper_summary(paper)} | {detail}", DIAMOND)
+
+    def _on_countdown(self, text: str) -> None:
+        self._countdown = text
+
+    # ── Private: rendering ───────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        width = min(WIDTH, shutil.get_terminal_size((WIDTH, 24)).columns)
+        self._write("\033[?25l\033[2J")              # hide cursor, clear screen
+        next_frame = time.monotonic()
+        dirty = True
+        while True:
+            timeout = max(0.0, next_frame - time.monotonic()) if dirty else None
+            try:
+                event = self._events.get(timeout=timeout)
+            except queue.Empty:
+                event = ()
+            while event is not None:
+                if event:
+                    handler, args = event
+                    handler(*args)
+                    dirty = True
+                try:
+                    event = self._events.get_nowait()
+                except queue.Empty:
+                    break
+            if event is None:
+                break
+            if dirty and time.monotonic() >= next_frame:
+                self._draw(width)
+                dirty = False
+                next_frame = time.monotonic() + self._interval
+        self._draw(width)
+        self._write(f"\033[{self._height() + 1};1H\033[?25h")
+        self._stopped = True
+
+    def _height(self) -> int:
+        return 6 + len(self._symbols) + 2 + self._alert_rows
+
+    def _layout(self, width: int) -> Frame:
+        frame: Frame = {}
+
+        def line(row: int, text: str, color: str) -> None:
+            frame[(row, 1)] = (_fit(text, width), color)
+
+        line(1, "ULTRA ELITE SCALPING v3.2 — AI + NEWS EDITION", GREEN + BOLD)
+        status, color = self._status
+        line(2, f"{status}  {self._countdown}".strip(), color)
+        line(3, "=" * width, PLATINUM)
+        col = 1
+        for header, size in COLUMNS:
+            if col + size - 1 > width:
+                break
+            frame[(4, col)] = (_fit(header, size), STEEL + BOLD)
+            for i, symbol in enumerate(self._symbols):
+                text, color = self._rows[symbol].get(header, ("", ""))
+                frame[(5 + i, col)] = (_fit(text, size), color)
+            col += size
+        row = 5 + len(self._symbols)
+        line(row, "-" * width, PLATINUM)
+        line(row + 1, self._summary[0], self._summary[1])
+        line(row + 2, "-" * width, PLATINUM)
+        line(row + 3, "RECENT SIGNALS", GOLD + BOLD)
+        alerts = list(self._alerts)
+        for i in range(self._alert_rows):
+            text, color = alerts[i] if i < len(alerts) else ("", "")
+            line(row + 4 + i, text, color)
+        return frame
+
+    def _draw(self, width: int) -> None:
+        """Write the cells that differ from the previous frame in one write."""
+        frame = self._layout(width)
+        out = []
+        for (row, col), cell in frame.items():
+            if self._previous.get((row, col)) != cell:
+                text, color = cell
+                out.append(f"\033[{row};{col}H{color}{text}{RESET}")
+        self._previous = frame
+        if out:
+            self.frames += 1
+            self.cells_written += len(out)
+            self._write("".join(out))
+
+    def _write(self, text: str) -> None:
+        self._stream.write(text)
+        self._stream.flush()
+
+
+def _fit(text: str, width: int) -> str:
+    """*text* truncated or padded to exactly *width* characters."""
+    return text[:width].ljust(width)
@@ -3,10 +3,13 @@ ultra_elite_scalping/utils/display.py
 ========================================
 Author  : Ultra Elite Dev Team
 Version : 3.2.0
-Purpose : Terminal colour constants, banner, and formatted alert printing
+Purpose : Terminal colour constants, banner, and formatted alert printing.
+          utils/dashboard.py offers the same calls as an in-place table.
 """
 
 from datetime import datetime
+from config.settings import TP_ATR_MULTIPLIER, SL_ATR_MULTIPLIER
+from core.paper import PaperStats
 
 # ── ANSI Colour Codes ─────────────────────────────────────────────────────────
 GREEN    = "\033[92m"
@@ -79,8 +82,8 @@ def print_elite_alert(
     """Full alert block printed after a confirmed signal."""
     color = GREEN if direction == "BUY" else RED
     emoji = "🟢" if direction == "BUY" else "🔴"
-    pips = round(data["atr"] * 10_000 * 1.2, 1)
-    sl   = round(data["atr"] * 10_000 * 0.8, 1)
+    pips = round(data["atr"] * 10_000 * TP_ATR_MULTIPLIER, 1)
+    sl   = round(data["atr"] * 10_000 * SL_ATR_MULTIPLIER, 1)
 
     print(f"""
 {color}{BOLD}{UNDER}🦁 ELITE SCALP #{signal_num} 🦁{emoji} {direction} {symbol}{RESET}{BOLD}
@@ -98,11 +101,31 @@ def print_elite_alert(
     """)
 
 
+def paper_summary(paper: PaperStats) -> str:
+    """One-line paper-trading totals (see core/paper.py)."""
+    return (f"PAPER: {paper.open} open | {paper.wins}W / {paper.losses}L | "
+            f"PNL {paper.pnl_pips:+.1f} pips | MAX DD {paper.max_drawdown_pips:.1f}")
+
+
 def print_cycle_footer(cycle: int, signals: int, total_signals: int,
-                       total_wins: int, max_score: int) -> None:
-    win_rate = (total_wins / total_signals * 100) if total_signals else 0.0
-    print(f"\n{GREEN}{BOLD}✅ CYCLE #{cycle} | {signals}/{len(['EURUSD','GBPUSD','USDJPY','AUDUSD','USDCAD','EURGBP'])} SIGNALS | WR: {win_rate:5.1f}%{RESET}")
+                       paper: PaperStats, max_score: int, pairs: int) -> None:
+    print(f"\n{GREEN}{BOLD}✅ CYCLE #{cycle} | {signals}/{pairs} SIGNALS | WR: {paper.win_rate:5.1f}%{RESET}")
     print(f"{DIAMOND}📊 TOTAL: {total_signals} signals | MAX SCORE: {max_score}/120{RESET}")
+    print(f"{DIAMOND}💼 {paper_summary(paper)}{RESET}")
+    print(f"{GOLD}{LINE_LONG}{RESET}")
+
+
+def print_event_status(total_signals: int, paper: PaperStats, max_score: int,
+                       decisions: dict, signals: dict, feed: dict) -> None:
+    """Periodic summary for the event-driven run mode."""
+    print(f"\n{GREEN}{BOLD}✅ {decisions['count']} DECISIONS | {total_signals} SIGNALS"
+          f" | WR: {paper.win_rate:5.1f}%{RESET}")
+    print(f"{DIAMOND}⚡ TICK→DECISION p50 {decisions['p50_ms']:.1f} ms | p99 {decisions['p99_ms']:.1f} ms"
+          f" | TICK→SIGNAL p50 {signals['p50_ms']:.1f} ms | p99 {signals['p99_ms']:.1f} ms{RESET}")
+    print(f"{DIAMOND}📡 FEED: {feed['received']:,d} bars in | {feed['delivered']:,d} analysed"
+          f" | {feed['coalesced']:,d} coalesced{RESET}")
+    print(f"{DIAMOND}📊 MAX SCORE: {max_score}/120{RESET}")
+    print(f"{DIAMOND}💼 {paper_summary(paper)}{RESET}")
     print(f"{GOLD}{LINE_LONG}{RESET}")
 
 
@@ -110,7 +133,55 @@ def print_countdown(seconds_left: int, next_cycle: int) -> None:
     print(f"\r{GOLD}⏳ {seconds_left:2d}s → CYCLE #{next_cycle}...{RESET}", end="", flush=True)
 
 
-def print_shutdown(total_signals: int, total_wins: int) -> None:
-    win_rate = (total_wins / total_signals * 100) if total_signals else 0.0
+def clear_countdown() -> None:
+    print("\r" + " " * 60 + "\r", end="")
+
+
+def close() -> None:
+    """Nothing to flush in print mode (see utils/dashboard.py)."""
+
+
+def print_shutdown(total_signals: int, paper: PaperStats) -> None:
     print(f"\n{RED}{BOLD}🛑 ULTRA ELITE STOPPED{RESET}")
-    print(f"{GREEN}{BOLD}📈 {total_signals} SIGNALS | {total_wins} WINS | {win_rate:5.1f}% WR{RESET}")
+    print(f"{GREEN}{BOLD}📈 {total_signals} SIGNALS | {paper.wins} WINS | {paper.win_rate:5.1f}% WR{RESET}")
+    print(f"{DIAMOND}💼 {paper_summary(paper)}{RESET}")
+
+
+def print_backtest_report(report) -> None:
+    """Per-pair and total results of a historical backtest."""
+    print(f"\n{GREEN}{BOLD}{UNDER}📜 ULTRA ELITE BACKTEST{RESET}")
+    print(f"{PLATINUM}{LINE_LONG}{RESET}")
+    print(f"{STEEL}{BOLD}{'PAIR':<8}{'BARS':>12}{'SIGNALS':>9}{'WINS':>7}{'LOSSES':>8}"
+          f"{'WR':>8}{'PNL pips':>12}{'MAX DD':>10}{RESET}")
+    for p in report.pairs:
+        color = GREEN if p.pnl_pips >= 0 else RED
+        print(f"{PLATINUM}{p.symbol:<8}{RESET}{p.bars:>12,d}{p.signals:>9d}{p.wins:>7d}"
+              f"{p.losses:>8d}{p.win_rate:>7.1f}%{color}{p.pnl_pips:>12.1f}{RESET}"
+              f"{p.max_drawdown_pips:>10.1f}")
+    print(f"{PLATINUM}{LINE_SHORT}{RESET}")
+    color = GREEN if report.pnl_pips >= 0 else RED
+    print(f"{GOLD}{BOLD}{'TOTAL':<8}{report.bars:>12,d}{report.signals:>9d}{report.wins:>7d}"
+          f"{report.losses:>8d}{report.win_rate:>7.1f}%{color}{report.pnl_pips:>12.1f}{RESET}"
+          f"{GOLD}{BOLD}{report.max_drawdown_pips:>10.1f}{RESET}")
+    print(f"{DIAMOND}⚡ {report.elapsed:.2f}s wall | "
+          f"{report.bars_per_sec_per_core:,.0f} bars/sec/core{RESET}")
+    print(f"{GOLD}{LINE_LONG}{RESET}")
+
+
+def print_optimizer_report(report, top: int = 20) -> None:
+    """Ranked table of the best parameter sets found by the optimizer."""
+    params = report.params
+    print(f"\n{GREEN}{BOLD}{UNDER}🧪 ULTRA ELITE OPTIMIZER — {report.strategy.upper()} SEARCH{RESET}")
+    print(f"{PLATINUM}{LINE_LONG}{RESET}")
+    header = "".join(f"{p[:10]:>11}" for p in params)
+    print(f"{STEEL}{BOLD}{'#':>4}{header}{'SIGNALS':>9}{'WR':>8}{'PNL pips':>12}{RESET}")
+    for i, t in enumerate(report.trials[:top], 1):
+        values = "".join(f"{t.params[p]:>11.4g}" for p in params)
+        color = GREEN if t.pnl_pips >= 0 else RED
+        print(f"{PLATINUM}{i:>4}{RESET}{values}{t.signals:>9d}{t.win_rate:>7.1f}%"
+              f"{color}{t.pnl_pips:>12.1f}{RESET}")
+    print(f"{PLATINUM}{LINE_SHORT}{RESET}")
+    print(f"{DIAMOND}⚡ {report.evaluated:,d} candidates over {report.bars:,d} bars | "
+          f"ranked by {report.rank_by} | {report.elapsed:.2f}s wall | "
+          f"{report.trials_per_sec:,.1f} candidates/sec{RESET}")
+    print(f"{GOLD}{LINE_LONG}{RESET}")
@@ -0,0 +1,203 @@
+"""
+ultra_elite_scalping/core/feed.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Streaming price-feed adapters for the event-driven run mode.
+
+A feed is anything with an async ``stream()`` of BarEvent.  Each event is
+the latest OHLCV bar of one pair (a raw tick is simply a bar with
+open = high = low = close).  Feeds push into a CoalescingQueue: when the
+bot falls behind, pending bars of the same pair are merged instead of
+piling up, so memory stays bounded and the bot always sees the newest
+price.
+
+Wire format (TCPFeed / utils/stubs.py ReplayServer), one bar per line:
+    symbol,timestamp_ns,open,high,low,close,volume
+"""
+
+import asyncio
+import logging
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable, NamedTuple
+
+from core.indicators import simulate_bar
+
+logger = logging.getLogger(__name__)
+
+
+class BarEvent(NamedTuple):
+    """One new OHLCV bar for one pair."""
+    symbol:      str
+    open:        float
+    high:        float
+    low:         float
+    close:       float
+    volume:      float
+    timestamp:   int                 # bar time, ns since the epoch
+    received_ns: int                 # time.perf_counter_ns() on arrival
+
+    @property
+    def ohlcv(self) -> tuple[float, float, float, float, float]:
+        return self.open, self.high, self.low, self.close, self.volume
+
+
+def encode_bar(symbol: str, timestamp: int, open_: float, high: float,
+               low: float, close: float, volume: float) -> bytes:
+    return f"{symbol},{timestamp},{open_!r},{high!r},{low!r},{close!r},{volume!r}\n".encode("ascii")
+
+
+def decode_bar(line: bytes, received_ns: int) -> BarEvent:
+    symbol, ts, o, h, l, c, v = line.decode("ascii").split(",")
+    return BarEvent(symbol, float(o), float(h), float(l), float(c), float(v), int(ts), received_ns)
+
+
+def merge_bars(older: BarEvent, newer: BarEvent) -> BarEvent:
+    """One bar spanning both: first open, extreme high/low, last close, summed volume."""
+    return BarEvent(
+        newer.symbol, older.open, max(older.high, newer.high), min(older.low, newer.low),
+        newer.close, older.volume + newer.volume, newer.timestamp, older.received_ns,
+    )
+
+
+class CoalescingQueue:
+    """
+    Latest-per-pair queue.
+
+    ``put()`` never blocks: a bar for a pair that is still waiting is
+    merged into the pending one (see merge_bars; the earliest arrival time
+    is kept so latency stats stay honest).  ``get()`` returns pairs in the
+    order they first became pending.  Size is bounded by the number of
+    pairs, which is the backpressure: a slow consumer sees fewer, wider
+    bars rather than an ever-growing backlog.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[str, BarEvent] = {}
+        self._ready = asyncio.Event()
+        self.received = 0
+        self.delivered = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(self, event: BarEvent) -> None:
+        self.received += 1
+        pending = self._pending.get(event.symbol)
+        if pending is None:
+            self._pending[event.symbol] = event
+        else:
+            self._pending[event.symbol] = merge_bars(pending, event)
+            self.coalesced += 1
+        self._ready.set()
+
+    async def get(self) -> BarEvent:
+        while not self._pending:
+            self._ready.clear()
+            await self._ready.wait()
+        return self.get_nowait()
+
+    def get_nowait(self) -> BarEvent:
+        symbol = next(iter(self._pending))
+        self.delivered += 1
+        return self._pending.pop(symbol)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "received":  self.received,
+            "delivered": self.delivered,
+            "coalesced": self.coalesced,
+            "pending":   len(self._pending),
+        }
+
+
+class PriceFeed(ABC):
+    """Interface of a bar source for ``UltraEliteBot.run_events``."""
+
+    @abstractmethod
+    def stream(self) -> AsyncIterator[BarEvent]:
+        """Async iterator of BarEvents (subclasses implement it as an async generator)."""
+
+
+class SimulatedFeed(PriceFeed):
+    """
+    Demo feed: every pair receives random-walk bars at exponentially
+    distributed intervals (mean *mean_interval* seconds per pair), moving
+    ``prices`` like IndicatorEngine.compute() does.
+    """
+
+    def __init__(
+        self,
+        prices: dict[str, float],
+        mean_interval: float,
+        simulate: Callable[[str, dict[str, float]], tuple] = simulate_bar,
+    ) -> None:
+        self._prices = prices
+        self._interval = mean_interval
+        self._simulate = simulate
+
+    async def stream(self) -> AsyncIterator[BarEvent]:
+        loop = asyncio.get_running_loop()
+        due = {s: loop.time() + random.expovariate(1 / self._interval) for s in self._prices}
+        while True:
+            symbol = min(due, key=due.get)
+            await asyncio.sleep(max(0.0, due[symbol] - loop.time()))
+            due[symbol] += random.expovariate(1 / self._interval)
+            yield self._make(symbol)
+
+    def _make(self, symbol: str) -> BarEvent:
+        return BarEvent(symbol, *self._simulate(symbol, self._prices),
+                        time.time_ns(), time.perf_counter_ns())
+
+
+class TCPFeed(PriceFeed):
+    """
+    Line-oriented TCP feed (see the wire format above).
+
+    Reconnects after *reconnect_delay* seconds when the connection drops;
+    with ``reconnect_delay=None`` the stream ends at the first EOF.
+    """
+
+    def __init__(self, host: str, port: int, reconnect_delay: float | None = 2.0) -> None:
+        self.host = host
+        self.port = port
+        self._reconnect = reconnect_delay
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "TCPFeed":
+        """``tcp://host:port``"""
+        host, _, port = url.removeprefix("tcp://").rpartition(":")
+        return cls(host or "127.0.0.1", int(port), **kwargs)
+
+    async def stream(self) -> AsyncIterator[BarEvent]:
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port, limit=1 << 20)
+            except OSError as exc:
+                if self._reconnect is None:
+                    raise
+                logger.warning("Feed %s:%d unreachable (%s) — retrying", self.host, self.port, exc)
+                await asyncio.sleep(self._reconnect)
+                continue
+            try:
+                while line := await reader.readline():
+                    try:
+                        yield decode_bar(line, time.perf_counter_ns())
+                    except ValueError:
+                        logger.warning("Malformed feed line: %r", line[:80])
+            finally:
+                writer.close()
+            if self._reconnect is None:
+                return
+            logger.warning("Feed %s:%d closed — reconnecting", self.host, self.port)
+            await asyncio.sleep(self._reconnect)
+
+
+def feed_from_url(url: str) -> PriceFeed:
+    """Build a feed from a ``--feed`` argument (currently ``tcp://host:port``)."""
+    if url.startswith("tcp://"):
+        return TCPFeed.from_url(url)
+    raise ValueError(f"Unsupported feed URL: {url!r}")
@@ -4,20 +4,409 @@ ultra_elite_scalping/core/indicators.py
 Author  : Ultra Elite Dev Team
 Version : 3.2.0
 Purpose : Technical indicator calculation engine (12 indicators).
-          In production swap random generation for a live price-feed adapter
-          (e.g. Alpha Vantage, OANDA, Interactive Brokers).
+          Every indicator is updated incrementally in O(1) per new bar from
+          per-pair rolling state.  ``compute()`` still drives the engine with
+          a simulated random walk; live adapters call ``update()`` with real
+          OHLCV bars (e.g. Alpha Vantage, OANDA, Interactive Brokers).
+          Results are slotted ``IndicatorSnapshot`` records at full
+          precision; rounding (DISPLAY_DECIMALS) is left to output code.
 """
 
+import math
 import random
-from typing import Any
+import zlib
+from array import array
+from collections import deque
+from typing import Iterator
 
+import numpy as np
+
+from config.settings import (
+    RSI_PERIOD, STOCH_PERIOD, CCI_PERIOD, MACD_FAST, MACD_SLOW,
+    EMA_FAST, EMA_SLOW, ADX_PERIOD, ATR_PERIOD, BB_PERIOD,
+    MOMENTUM_PERIOD, VWAP_PERIOD, VOLUME_PERIOD, INDICATOR_WARMUP_BARS,
+)
+
+# Mean absolute deviation of a normal distribution is σ·√(2/π); used so CCI
+# can be maintained from running sums instead of a full window rescan.
+_MAD_FACTOR = math.sqrt(2.0 / math.pi)
+
+# Running sums are rebuilt from the window every N updates to cancel drift.
+_RESYNC_EVERY = 1024
+
+# Largest exponent used when solving EMA recursions block-wise in closed form.
+_BLOCK_LOG_LIMIT = 460.0   # ≈ ln(1e200)
+
+# Exported pair state only fits an engine built with the same periods
+STATE_FINGERPRINT: int = zlib.crc32(repr((
+    RSI_PERIOD, STOCH_PERIOD, CCI_PERIOD, MACD_FAST, MACD_SLOW, EMA_FAST, EMA_SLOW,
+    ADX_PERIOD, ATR_PERIOD, BB_PERIOD, MOMENTUM_PERIOD, VWAP_PERIOD, VOLUME_PERIOD,
+)).encode())
+
+
+# Display precision per indicator.  Values are never rounded in the engines;
+# terminal, journal and prompt output round with these.
+DISPLAY_DECIMALS: dict[str, int] = {
+    "price": 5, "rsi": 1, "stoch": 1, "cci": 0, "macd": 5, "ema_fast": 5,
+    "ema_slow": 5, "adx": 1, "volume": 2, "atr": 5, "bb_pos": 2,
+    "momentum": 3, "vwap_diff": 5,
+}
+INDICATOR_FIELDS: tuple[str, ...] = tuple(DISPLAY_DECIMALS)
+
+
+# ── Results ───────────────────────────────────────────────────────────────────
+
+class IndicatorSnapshot:
+    """
+    Indicator values of one pair after one bar, unrounded.
+
+    One slotted object instead of a 13-key dict.  Hot code reads
+    attributes (``snap.rsi``); ``snap["rsi"]`` and ``keys()`` keep
+    mapping-style output code working, and ``rounded()`` returns the
+    display-precision dict.
+    """
+
+    __slots__ = INDICATOR_FIELDS
+
+    def __init__(
+        self,
+        price: float, rsi: float, stoch: float, cci: float, macd: float,
+        ema_fast: float, ema_slow: float, adx: float, volume: float, atr: float,
+        bb_pos: float, momentum: float, vwap_diff: float,
+    ) -> None:
+        self.price = price
+        self.rsi = rsi
+        self.stoch = stoch
+        self.cci = cci
+        self.macd = macd
+        self.ema_fast = ema_fast
+        self.ema_slow = ema_slow
+        self.adx = adx
+        self.volume = volume
+        self.atr = atr
+        self.bb_pos = bb_pos
+        self.momentum = momentum
+        self.vwap_diff = vwap_diff
+
+    def __getitem__(self, key: str) -> float:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IndicatorSnapshot):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in INDICATOR_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"IndicatorSnapshot({', '.join(f'{k}={v!r}' for k, v in self.rounded().items())})"
+
+    @staticmethod
+    def keys() -> tuple[str, ...]:
+        return INDICATOR_FIELDS
+
+    def rounded(self) -> dict[str, float]:
+        return {f: round(getattr(self, f), DISPLAY_DECIMALS[f]) for f in INDICATOR_FIELDS}
+
+
+class IndicatorTable:
+    """
+    Struct-of-arrays table of snapshots: one float64 column per indicator
+    field, one row per pair.  Allocated once and refilled every cycle, so
+    holding a cycle's indicators costs no per-pair objects until a row is
+    read back; pickles as 13 flat buffers (ShardPool results).
+    """
+
+    __slots__ = ("columns", "_columns")
+
+    def __init__(self, rows: int) -> None:
+        self.columns: dict[str, array] = {f: array("d", bytes(8 * rows)) for f in INDICATOR_FIELDS}
+        self._columns = tuple(self.columns.values())
+
+    def __len__(self) -> int:
+        return len(self._columns[0])
+
+    def __getstate__(self) -> dict[str, array]:
+        return self.columns
+
+    def __setstate__(self, columns: dict[str, array]) -> None:
+        self.columns = columns
+        self._columns = tuple(columns.values())
+
+    def put(self, row: int, snap: IndicatorSnapshot) -> None:
+        for column, field in zip(self._columns, INDICATOR_FIELDS):
+            column[row] = getattr(snap, field)
+
+    def row(self, row: int) -> IndicatorSnapshot:
+        return IndicatorSnapshot(*[column[row] for column in self._columns])
+
+    def column(self, field: str) -> np.ndarray:
+        """Zero-copy NumPy view of one column (e.g. for ScoringEngine.score_batch)."""
+        return np.frombuffer(self.columns[field], dtype=np.float64)
+
+
+# ── Incremental building blocks ───────────────────────────────────────────────
+
+class _Ema:
+    """Exponential moving average seeded with the first sample."""
+
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, period: int) -> None:
+        self.alpha = 2.0 / (period + 1)
+        self.value: float | None = None
+
+    def update(self, x: float) -> float:
+        if self.value is None:
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+    def dump(self, out: list[float]) -> None:
+        out.append(math.nan if self.value is None else self.value)
+
+    def load(self, it: Iterator[float]) -> None:
+        self.value = _optional(next(it))
+
+
+class _Wilder:
+    """Wilder smoothing: simple mean of the first *period* samples, then RMA."""
+
+    __slots__ = ("period", "count", "value")
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self.count = 0
+        self.value = 0.0
+
+    def update(self, x: float) -> float:
+        if self.count < self.period:
+            self.count += 1
+            self.value += (x - self.value) / self.count
+        else:
+            self.value += (x - self.value) / self.period
+        return self.value
+
+    def dump(self, out: list[float]) -> None:
+        out += (self.count, self.value)
+
+    def load(self, it: Iterator[float]) -> None:
+        self.count = int(next(it))
+        self.value = next(it)
+
+
+class _RollingStats:
+    """Rolling mean / standard deviation from running sum and sum of squares."""
+
+    __slots__ = ("window", "total", "total_sq", "updates")
+
+    def __init__(self, period: int) -> None:
+        self.window: deque[float] = deque(maxlen=period)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.updates = 0
+
+    def update(self, x: float) -> None:
+        if len(self.window) == self.window.maxlen:
+            old = self.window[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.window.append(x)
+        self.total += x
+        self.total_sq += x * x
+        self.updates += 1
+        if self.updates % _RESYNC_EVERY == 0:
+            self.total = math.fsum(self.window)
+            self.total_sq = math.fsum(v * v for v in self.window)
+
+    @property
+    def mean(self) -> float:
+        return self.total / len(self.window) if self.window else 0.0
+
+    @property
+    def std(self) -> float:
+        n = len(self.window)
+        if n < 2:
+            return 0.0
+        mean = self.total / n
+        return math.sqrt(max(0.0, self.total_sq / n - mean * mean))
+
+    def dump(self, out: list[float]) -> None:
+        _dump_window(out, self.window)
+        out += (self.total, self.total_sq, self.updates)
+
+    def load(self, it: Iterator[float]) -> None:
+        _load_window(it, self.window)
+        self.total = next(it)
+        self.total_sq = next(it)
+        self.updates = int(next(it))
+
+
+class _RollingSum:
+    """Plain rolling sum over a fixed window."""
+
+    __slots__ = ("window", "total", "updates")
+
+    def __init__(self, period: int) -> None:
+        self.window: deque[float] = deque(maxlen=period)
+        self.total = 0.0
+        self.updates = 0
+
+    def update(self, x: float) -> float:
+        if len(self.window) == self.window.maxlen:
+            self.total -= self.window[0]
+        self.window.append(x)
+        self.total += x
+        self.updates += 1
+        if self.updates % _RESYNC_EVERY == 0:
+            self.total = math.fsum(self.window)
+        return self.total
+
+    def dump(self, out: list[float]) -> None:
+        _dump_window(out, self.window)
+        out += (self.total, self.updates)
+
+    def load(self, it: Iterator[float]) -> None:
+        _load_window(it, self.window)
+        self.total = next(it)
+        self.updates = int(next(it))
+
+
+class _RollingExtreme:
+    """
+    Rolling max (or min) via a monotonic deque of (bar_index, value).
+    Amortised O(1) per update.
+    """
+
+    __slots__ = ("period", "is_max", "queue")
+
+    def __init__(self, period: int, is_max: bool) -> None:
+        self.period = period
+        self.is_max = is_max
+        self.queue: deque[tuple[int, float]] = deque()
+
+    def update(self, index: int, x: float) -> float:
+        q = self.queue
+        if self.is_max:
+            while q and q[-1][1] <= x:
+                q.pop()
+        else:
+            while q and q[-1][1] >= x:
+                q.pop()
+        q.append((index, x))
+        while q[0][0] <= index - self.period:
+            q.popleft()
+        return q[0][1]
+
+    def dump(self, out: list[float]) -> None:
+        out.append(len(self.queue))
+        for index, x in self.queue:
+            out += (index, x)
+
+    def load(self, it: Iterator[float]) -> None:
+        self.queue = deque((int(next(it)), next(it)) for _ in range(int(next(it))))
+
+
+class _PairState:
+    """All rolling state needed to advance the 12 indicators for one pair."""
+
+    def __init__(self) -> None:
+        self.bars = 0
+        self.last_bar: tuple[float, float, float, float, float] | None = None
+        self.prev_close: float | None = None
+        self.prev_high: float | None = None
+        self.prev_low: float | None = None
+
+        self.rsi_gain = _Wilder(RSI_PERIOD)
+        self.rsi_loss = _Wilder(RSI_PERIOD)
+
+        self.stoch_high = _RollingExtreme(STOCH_PERIOD, is_max=True)
+        self.stoch_low  = _RollingExtreme(STOCH_PERIOD, is_max=False)
+
+        self.cci_tp = _RollingStats(CCI_PERIOD)
+
+        self.macd_fast = _Ema(MACD_FAST)
+        self.macd_slow = _Ema(MACD_SLOW)
+        self.ema_fast  = _Ema(EMA_FAST)
+        self.ema_slow  = _Ema(EMA_SLOW)
+
+        self.atr      = _Wilder(ATR_PERIOD)
+        self.adx_tr   = _Wilder(ADX_PERIOD)
+        self.adx_pdm  = _Wilder(ADX_PERIOD)
+        self.adx_mdm  = _Wilder(ADX_PERIOD)
+        self.adx      = _Wilder(ADX_PERIOD)
+
+        self.bb_close = _RollingStats(BB_PERIOD)
+        self.momentum_closes: deque[float] = deque(maxlen=MOMENTUM_PERIOD + 1)
+
+        self.vwap_pv  = _RollingSum(VWAP_PERIOD)
+        self.vwap_vol = _RollingSum(VWAP_PERIOD)
+        self.volume   = _RollingSum(VOLUME_PERIOD)
+
+    def blocks(self) -> tuple:
+        """Building blocks in their fixed serialisation order."""
+        return (
+            self.rsi_gain, self.rsi_loss, self.stoch_high, self.stoch_low, self.cci_tp,
+            self.macd_fast, self.macd_slow, self.ema_fast, self.ema_slow,
+            self.atr, self.adx_tr, self.adx_pdm, self.adx_mdm, self.adx,
+            self.bb_close, self.vwap_pv, self.vwap_vol, self.volume,
+        )
+
+    def dump(self) -> bytes:
+        out: list[float] = [self.bars, *(self.last_bar or (math.nan,) * 5)]
+        out += (_nan(self.prev_close), _nan(self.prev_high), _nan(self.prev_low))
+        for block in self.blocks():
+            block.dump(out)
+        _dump_window(out, self.momentum_closes)
+        return array("d", out).tobytes()
+
+    def load(self, blob: bytes) -> None:
+        values = array("d")
+        values.frombytes(blob)
+        it = iter(values)
+        self.bars = int(next(it))
+        last_bar = tuple(next(it) for _ in range(5))
+        self.last_bar = None if math.isnan(last_bar[0]) else last_bar
+        self.prev_close = _optional(next(it))
+        self.prev_high = _optional(next(it))
+        self.prev_low = _optional(next(it))
+        for block in self.blocks():
+            block.load(it)
+        _load_window(it, self.momentum_closes)
+        if next(it, None) is not None:
+            raise ValueError("trailing data in pair state")
+
+
+def _nan(x: float | None) -> float:
+    return math.nan if x is None else x
+
+
+def _optional(x: float) -> float | None:
+    return None if math.isnan(x) else x
+
+
+def _dump_window(out: list[float], window: deque) -> None:
+    out.append(len(window))
+    out += window
+
+
+def _load_window(it: Iterator[float], window: deque) -> None:
+    window.clear()
+    window.extend(next(it) for _ in range(int(next(it))))
+
+
+# ── Engine ────────────────────────────────────────────────────────────────────
 
 class IndicatorEngine:
     """
-    Simulates 12 technical indicators per currency pair.
+    Incremental 12-indicator engine with per-pair rolling state.
 
-    Pairs supplied externally via ``prices`` dict so state is fully managed
-    by the caller (UltraEliteBot).
+    Each call to ``update()`` advances every indicator of one pair by one
+    OHLCV bar in constant time — no lookback window is ever rescanned.
+    ``compute()`` keeps the demo behaviour of the original engine: it moves
+    ``prices[symbol]`` with a random walk and feeds the resulting bar.
 
     Indicators
     ----------
@@ -25,51 +414,338 @@ class IndicatorEngine:
     Volume, ATR, Bollinger Band position, Momentum, VWAP-delta
     """
 
-    # ── Signal-biased pools for demo mode ────────────────────────────────────
-    _RSI_POOL   = [12, 18, 25, 78, 82, 88]
-    _STOCH_POOL = [8, 12, 15, 85, 88, 92]
-    _CCI_POOL   = [-185, -170, -145, 140, 165, 185]
-    _ADX_POOL   = [28, 32, 35, 38, 42]
-    _MACD_POOL  = [0.0018, 0.0022, -0.0017, -0.0020]
+    def __init__(self) -> None:
+        self._states: dict[str, _PairState] = {}
 
-    def compute(self, symbol: str, prices: dict[str, float]) -> dict[str, Any]:
+    def compute(self, symbol: str, prices: dict[str, float]) -> IndicatorSnapshot:
         """
-        Return a dict of indicator values for *symbol*.
+        Feed *symbol* one simulated bar and return its ``IndicatorSnapshot``
+        (unrounded; ``rounded()`` gives display precision).
         Updates ``prices[symbol]`` in-place to simulate price movement.
         """
-        base = prices[symbol]
-        volatility = random.uniform(0.001, 0.0025)
-        prices[symbol] = base + random.uniform(-volatility, volatility)
-        price = prices[symbol]
-
-        rsi   = random.choice(self._RSI_POOL) + random.uniform(-2,  2)
-        stoch = random.choice(self._STOCH_POOL) + random.uniform(-3,  3)
-        cci   = random.choice(self._CCI_POOL) + random.uniform(-15, 15)
-        macd  = random.choice(self._MACD_POOL) + random.uniform(-0.0001, 0.0001)
-
-        ema_fast = price + random.uniform(-0.0015, 0.0015)
-        ema_slow = price + random.uniform(-0.003,  0.003)
-        adx      = random.choice(self._ADX_POOL)
-        volume   = random.uniform(1.8, 3.2)
-        atr      = random.uniform(0.0018, 0.0032)
-
-        # Extra indicators (new in v3.2)
-        bb_pos    = random.uniform(-2.0, 2.0)   # Bollinger Band z-score
-        momentum  = random.uniform(-1.0, 1.0)   # 10-bar price momentum normalised
-        vwap_diff = random.uniform(-0.002, 0.002)
-
-        return {
-            "price":    round(price,    5),
-            "rsi":      round(rsi,      1),
-            "stoch":    round(stoch,    1),
-            "cci":      round(cci,      0),
-            "macd":     round(macd,     5),
-            "ema_fast": round(ema_fast, 5),
-            "ema_slow": round(ema_slow, 5),
-            "adx":      round(adx,      1),
-            "volume":   round(volume,   2),
-            "atr":      round(atr,      5),
-            "bb_pos":   round(bb_pos,   2),
-            "momentum": round(momentum, 3),
-            "vwap_diff":round(vwap_diff,5),
-        }
+        if symbol not in self._states:
+            self.seed(symbol, prices)
+        return self.update(symbol, *simulate_bar(symbol, prices))
+
+    def seed(self, symbol: str, prices: dict[str, float]) -> None:
+        """Demo mode: warm *symbol* up with INDICATOR_WARMUP_BARS random-walk bars."""
+        for _ in range(INDICATOR_WARMUP_BARS):
+            self.update(symbol, *simulate_bar(symbol, prices))
+
+    def update(
+        self,
+        symbol: str,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> IndicatorSnapshot:
+        """Advance *symbol* by one OHLCV bar and return its indicators."""
+        st = self._states.get(symbol)
+        if st is None:
+            st = self._states[symbol] = _PairState()
+        index = st.bars
+        st.bars += 1
+        prev_close = st.prev_close if st.prev_close is not None else open_
+
+        # ── RSI (Wilder) ─────────────────────────────────────────────────────
+        change = close - prev_close
+        avg_gain = st.rsi_gain.update(change if change > 0 else 0.0)
+        avg_loss = st.rsi_loss.update(-change if change < 0 else 0.0)
+        if avg_loss == 0.0:
+            rsi = 50.0 if avg_gain == 0.0 else 100.0
+        else:
+            rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+        # ── Stochastic %K (monotonic deques) ─────────────────────────────────
+        hh = st.stoch_high.update(index, high)
+        ll = st.stoch_low.update(index, low)
+        stoch = 100.0 * (close - ll) / (hh - ll) if hh > ll else 50.0
+
+        # ── CCI (running sums) ───────────────────────────────────────────────
+        typical = (high + low + close) / 3.0
+        st.cci_tp.update(typical)
+        mean_dev = st.cci_tp.std * _MAD_FACTOR
+        cci = (typical - st.cci_tp.mean) / (0.015 * mean_dev) if mean_dev > 0 else 0.0
+
+        # ── MACD / EMAs ──────────────────────────────────────────────────────
+        macd = st.macd_fast.update(close) - st.macd_slow.update(close)
+        ema_fast = st.ema_fast.update(close)
+        ema_slow = st.ema_slow.update(close)
+
+        # ── ATR / ADX (Wilder) ───────────────────────────────────────────────
+        true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        atr = st.atr.update(true_range)
+        if st.prev_high is not None:
+            up = high - st.prev_high
+            down = st.prev_low - low
+            plus_dm = up if up > down and up > 0 else 0.0
+            minus_dm = down if down > up and down > 0 else 0.0
+            s_tr = st.adx_tr.update(true_range)
+            s_pdm = st.adx_pdm.update(plus_dm)
+            s_mdm = st.adx_mdm.update(minus_dm)
+            if s_tr > 0:
+                plus_di = 100.0 * s_pdm / s_tr
+                minus_di = 100.0 * s_mdm / s_tr
+                di_sum = plus_di + minus_di
+                dx = 100.0 * abs(plus_di - minus_di) / di_sum if di_sum > 0 else 0.0
+                st.adx.update(dx)
+        adx = st.adx.value
+
+        # ── Bollinger position / Momentum ────────────────────────────────────
+        st.bb_close.update(close)
+        bb_std = st.bb_close.std
+        bb_pos = (close - st.bb_close.mean) / bb_std if bb_std > 0 else 0.0
+
+        st.momentum_closes.append(close)
+        move = close - st.momentum_closes[0]
+        span = atr * MOMENTUM_PERIOD
+        momentum = max(-1.0, min(1.0, move / span)) if span > 0 else 0.0
+
+        # ── Volume ratio / VWAP delta ────────────────────────────────────────
+        vol_sum = st.volume.update(volume)
+        vol_avg = vol_sum / len(st.volume.window)
+        volume_ratio = volume / vol_avg if vol_avg > 0 else 1.0
+
+        pv = st.vwap_pv.update(typical * volume)
+        v = st.vwap_vol.update(volume)
+        vwap_diff = close - pv / v if v > 0 else 0.0
+
+        st.prev_close = close
+        st.prev_high = high
+        st.prev_low = low
+        st.last_bar = (open_, high, low, close, volume)
+
+        return IndicatorSnapshot(
+            close, rsi, stoch, cci, macd, ema_fast, ema_slow, adx,
+            volume_ratio, atr, bb_pos, momentum, vwap_diff,
+        )
+
+    def bars_seen(self, symbol: str) -> int:
+        """Number of bars fed for *symbol* (0 if unknown)."""
+        st = self._states.get(symbol)
+        return st.bars if st else 0
+
+    def last_bar(self, symbol: str) -> tuple[float, float, float, float, float] | None:
+        """Most recent (open, high, low, close, volume) fed for *symbol*."""
+        st = self._states.get(symbol)
+        return st.last_bar if st else None
+
+    def export_state(self, symbol: str) -> bytes | None:
+        """Rolling state of *symbol* as packed float64s (None if unknown)."""
+        st = self._states.get(symbol)
+        return st.dump() if st else None
+
+    def import_state(self, symbol: str, blob: bytes) -> None:
+        """Replace *symbol*'s rolling state with one from ``export_state``."""
+        st = _PairState()
+        st.load(blob)
+        self._states[symbol] = st
+
+    def symbols(self) -> list[str]:
+        """Pairs that have rolling state."""
+        return list(self._states)
+
+    def reset(self, symbol: str | None = None) -> None:
+        """Drop rolling state for *symbol*, or for every pair."""
+        if symbol is None:
+            self._states.clear()
+        else:
+            self._states.pop(symbol, None)
+
+
+# ── Demo data ─────────────────────────────────────────────────────────────────
+
+def simulate_bar(symbol: str, prices: dict[str, float]) -> tuple[float, float, float, float, float]:
+    """Random-walk OHLCV bar for demo mode; moves ``prices[symbol]``."""
+    open_ = prices[symbol]
+    volatility = random.uniform(0.001, 0.0025)
+    close = open_ + random.uniform(-volatility, volatility)
+    high = max(open_, close) + random.uniform(0, volatility / 2)
+    low = min(open_, close) - random.uniform(0, volatility / 2)
+    volume = random.uniform(500, 1500)
+    prices[symbol] = close
+    return open_, high, low, close, volume
+
+
+# ── Column (batch) path ───────────────────────────────────────────────────────
+
+def indicator_columns(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """
+    Vectorised equivalent of feeding every bar through ``IndicatorEngine.update``.
+
+    Returns one float64 column per indicator key.  Values match the
+    incremental engine up to floating-point rounding; the recursive
+    averages are solved block-wise in closed form so a history of millions
+    of bars is processed without a Python loop per bar.
+    """
+    o, h, lo, c, v = (
+        np.asarray(x, dtype=np.float64) for x in (open_, high, low, close, volume)
+    )
+    n = c.shape[0]
+    if n == 0:
+        return {key: np.empty(0) for key in INDICATOR_FIELDS}
+    prev_close = np.empty(n)
+    prev_close[0] = o[0]
+    prev_close[1:] = c[:-1]
+
+    # RSI
+    change = c - prev_close
+    avg_gain = _wilder_columns(np.maximum(change, 0.0), RSI_PERIOD)
+    avg_loss = _wilder_columns(np.maximum(-change, 0.0), RSI_PERIOD)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(
+            avg_loss == 0.0,
+            np.where(avg_gain == 0.0, 50.0, 100.0),
+            100.0 - 100.0 / (1.0 + avg_gain / avg_loss),
+        )
+
+    # Stochastic
+    hh = _rolling_extreme_columns(h, STOCH_PERIOD, np.maximum, -np.inf)
+    ll = _rolling_extreme_columns(lo, STOCH_PERIOD, np.minimum, np.inf)
+    rng = hh - ll
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stoch = np.where(rng > 0, 100.0 * (c - ll) / rng, 50.0)
+
+    # CCI
+    typical = (h + lo + c) / 3.0
+    tp_mean, tp_std = _rolling_mean_std_columns(typical, CCI_PERIOD)
+    mean_dev = tp_std * _MAD_FACTOR
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cci = np.where(mean_dev > 0, (typical - tp_mean) / (0.015 * mean_dev), 0.0)
+
+    # MACD / EMAs
+    macd = _ema_columns(c, MACD_FAST) - _ema_columns(c, MACD_SLOW)
+    ema_fast = _ema_columns(c, EMA_FAST)
+    ema_slow = _ema_columns(c, EMA_SLOW)
+
+    # ATR / ADX
+    true_range = np.maximum(h - lo, np.maximum(np.abs(h - prev_close), np.abs(lo - prev_close)))
+    atr = _wilder_columns(true_range, ATR_PERIOD)
+    adx = np.zeros(n)
+    if n > 1:
+        up = h[1:] - h[:-1]
+        down = lo[:-1] - lo[1:]
+        plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+        minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+        s_tr = _wilder_columns(true_range[1:], ADX_PERIOD)
+        s_pdm = _wilder_columns(plus_dm, ADX_PERIOD)
+        s_mdm = _wilder_columns(minus_dm, ADX_PERIOD)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            plus_di = np.where(s_tr > 0, 100.0 * s_pdm / s_tr, 0.0)
+            minus_di = np.where(s_tr > 0, 100.0 * s_mdm / s_tr, 0.0)
+            di_sum = plus_di + minus_di
+            dx = np.where(di_sum > 0, 100.0 * np.abs(plus_di - minus_di) / di_sum, 0.0)
+        adx[1:] = _wilder_columns(dx, ADX_PERIOD)
+
+    # Bollinger position / Momentum
+    bb_mean, bb_std = _rolling_mean_std_columns(c, BB_PERIOD)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bb_pos = np.where(bb_std > 0, (c - bb_mean) / bb_std, 0.0)
+    past = c[np.maximum(np.arange(n) - MOMENTUM_PERIOD, 0)]
+    span = atr * MOMENTUM_PERIOD
+    with np.errstate(divide="ignore", invalid="ignore"):
+        momentum = np.where(span > 0, np.clip((c - past) / span, -1.0, 1.0), 0.0)
+
+    # Volume ratio / VWAP delta
+    vol_avg = _rolling_sum_columns(v, VOLUME_PERIOD) / np.minimum(np.arange(1, n + 1), VOLUME_PERIOD)
+    pv = _rolling_sum_columns(typical * v, VWAP_PERIOD)
+    vv = _rolling_sum_columns(v, VWAP_PERIOD)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        volume_ratio = np.where(vol_avg > 0, v / vol_avg, 1.0)
+        vwap_diff = np.where(vv > 0, c - pv / vv, 0.0)
+
+    return {
+        "price": c, "rsi": rsi, "stoch": stoch, "cci": cci, "macd": macd,
+        "ema_fast": ema_fast, "ema_slow": ema_slow, "adx": adx,
+        "volume": volume_ratio, "atr": atr, "bb_pos": bb_pos,
+        "momentum": momentum, "vwap_diff": vwap_diff,
+    }
+
+
+def _ewm_columns(x: np.ndarray, alpha: float, init: float) -> np.ndarray:
+    """
+    Solve y[t] = y[t-1] + alpha·(x[t] − y[t-1]) with y[-1] = init.
+
+    Within a block y[t] = β^(t+1)·y0 + α·β^t·Σ x[k]·β^(−k), so each block is
+    one cumulative sum; block length keeps β^(−k) far from overflow.
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+    beta = 1.0 - alpha
+    block = max(1, min(n, 8192, int(_BLOCK_LOG_LIMIT / -math.log(beta))))
+    k = np.arange(block)
+    inv = beta ** -k.astype(np.float64)
+    decay = beta ** (k + 1.0)
+    prev = init
+    for start in range(0, n, block):
+        xb = x[start:start + block]
+        m = xb.shape[0]
+        y = decay[:m] * prev + alpha * (decay[:m] / beta) * np.cumsum(xb * inv[:m])
+        out[start:start + m] = y
+        prev = y[-1]
+    return out
+
+
+def _ema_columns(x: np.ndarray, period: int) -> np.ndarray:
+    """Column form of ``_Ema`` (seeded with the first sample)."""
+    if x.shape[0] == 0:
+        return np.empty(0)
+    return _ewm_columns(x, 2.0 / (period + 1), x[0])
+
+
+def _wilder_columns(x: np.ndarray, period: int) -> np.ndarray:
+    """Column form of ``_Wilder`` (running mean for *period* samples, then RMA)."""
+    n = x.shape[0]
+    out = np.empty(n)
+    head = min(n, period)
+    out[:head] = np.cumsum(x[:head]) / np.arange(1, head + 1)
+    if n > period:
+        out[period:] = _ewm_columns(x[period:], 1.0 / period, out[period - 1])
+    return out
+
+
+def _rolling_sum_columns(x: np.ndarray, period: int) -> np.ndarray:
+    """Sum over the last *period* samples (shorter at the start)."""
+    csum = np.cumsum(x)
+    out = csum.copy()
+    out[period:] -= csum[:-period]
+    return out
+
+
+def _rolling_mean_std_columns(x: np.ndarray, period: int) -> tuple[np.ndarray, np.ndarray]:
+    """Population mean / std over the last *period* samples (shorter at the start)."""
+    ref = x[0]
+    centred = x - ref                      # keeps the cumulative sums small
+    count = np.minimum(np.arange(1, x.shape[0] + 1), period)
+    mean_c = _rolling_sum_columns(centred, period) / count
+    var = _rolling_sum_columns(centred * centred, period) / count - mean_c * mean_c
+    std = np.where(count >= 2, np.sqrt(np.maximum(var, 0.0)), 0.0)
+    return mean_c + ref, std
+
+
+def _rolling_extreme_columns(x: np.ndarray, period: int, ufunc: np.ufunc, pad: float) -> np.ndarray:
+    """
+    Rolling max/min over the last *period* samples (shorter at the start).
+
+    van Herk / Gil-Werman: per-block prefix and suffix extremes make every
+    window the combination of two lookups, so cost is O(n) for any period.
+    """
+    n = x.shape[0]
+    blocks = -(-(n + period - 1) // period)
+    padded = np.full(blocks * period, pad)
+    padded[period - 1:period - 1 + n] = x
+    grid = padded.reshape(blocks, period)
+    prefix = ufunc.accumulate(grid, axis=1).ravel()
+    suffix = ufunc.accumulate(grid[:, ::-1], axis=1)[:, ::-1].ravel()
+    end = np.arange(period - 1, period - 1 + n)
+    return ufunc(suffix[end - period + 1], prefix[end])
@@ -0,0 +1,259 @@
+"""
+ultra_elite_scalping/utils/journal.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Headless output mode and the append-only JSONL signal journal.
+
+``HeadlessOutput`` has the same calls as utils/display.py but renders
+nothing: scan rows, alerts and status lines become plain dicts handed to
+a ``JournalWriter``.  The writer thread serialises whatever has queued up
+since its last wake-up, appends it in one write and fsyncs at most every
+JOURNAL_FSYNC_SECONDS, so the analysis loop never waits on the disk.
+
+One JSON object per line, always with ``type`` and ``ts`` (epoch seconds):
+
+    start   pairs, threshold
+    scan    symbol, price, rsi, stoch, cci, news, buy, sell, decision[, confidence]
+    signal  n, symbol, direction, confidence, score, entry, tp_pips, sl_pips,
+            indicators, triggers, headline, ai
+    cycle   cycle, signals, pairs, total_signals, max_score, <paper>
+    status  decisions, signal_latency, feed, total_signals, max_score, <paper>
+    stop    total_signals, <paper>
+
+where <paper> is the paper book's open, wins, losses, pnl_pips and
+max_drawdown_pips (core/paper.py).
+
+``read_journal`` filters a journal by type, pair, direction and time.
+
+Usage
+-----
+    python main.py --headless
+    python main.py journal --pair EURUSD --direction BUY --since 2026-10-01
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Iterator
+
+from config.settings import (
+    PAIRS, SIGNAL_THRESHOLD, TP_ATR_MULTIPLIER, SL_ATR_MULTIPLIER,
+    JOURNAL_PATH, JOURNAL_FSYNC_SECONDS,
+)
+from core.indicators import DISPLAY_DECIMALS
+from core.paper import PaperStats
+
+logger = logging.getLogger(__name__)
+
+RECORD_TYPES = ("start", "scan", "signal", "cycle", "status", "stop")
+
+# Indicator fields copied (at display precision) into scan / signal records
+_ROW_INDICATORS = ("price", "rsi", "stoch", "cci")
+_SIGNAL_INDICATORS = ("rsi", "stoch", "cci", "ema_fast", "ema_slow", "macd", "adx", "volume", "atr")
+
+
+class JournalWriter:
+    """
+    Background appender for one JSONL file.
+
+    ``write()`` only enqueues; the writer thread batches, flushes after
+    every batch and fsyncs once *fsync_seconds* have passed since the last
+    sync (0 = after every batch).  ``close()`` drains, syncs and closes.
+    """
+
+    def __init__(self, path: str = JOURNAL_PATH, fsync_seconds: float = JOURNAL_FSYNC_SECONDS) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._fsync_seconds = fsync_seconds
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="journal", daemon=True)
+        self._closed = False
+        self.records = 0
+        self.batches = 0
+        self.syncs = 0
+        self._thread.start()
+
+    def write(self, record: dict) -> None:
+        self._queue.put(record)
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        dumps = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+        last_sync = time.monotonic()
+        unsynced = False
+        stop = False
+        while not stop:
+            timeout = max(0.0, last_sync + self._fsync_seconds - time.monotonic()) if unsynced else None
+            batch: list[str] = []
+            try:
+                record = self._queue.get(timeout=timeout)
+                while record is not None:
+                    batch.append(dumps(record))
+                    record = self._queue.get_nowait()
+                stop = True
+            except queue.Empty:
+                pass
+            if batch:
+                self._file.write("\n".join(batch) + "\n")
+                self._file.flush()
+                self.records += len(batch)
+                self.batches += 1
+                unsynced = True
+            if unsynced and (stop or time.monotonic() - last_sync >= self._fsync_seconds):
+                os.fsync(self._file.fileno())
+                self.syncs += 1
+                last_sync = time.monotonic()
+                unsynced = False
+        self._file.close()
+        logger.info("Journal %s: %d records in %d batches, %d fsyncs",
+                    self.path, self.records, self.batches, self.syncs)
+
+
+class HeadlessOutput:
+    """
+    utils/display.py interface that journals instead of printing.
+
+    A scan record is written once the row's outcome is known, i.e. on the
+    ``print_hold`` / ``print_signal_label`` call that follows
+    ``print_pair_row``, exactly as the two calls share a line in print mode.
+    """
+
+    def __init__(self, writer: JournalWriter | None = None) -> None:
+        self._writer = writer or JournalWriter()
+        self._row: dict | None = None
+
+    def print_banner(self) -> None:
+        self._writer.write({"type": "start", "ts": time.time(),
+                            "pairs": list(PAIRS), "threshold": SIGNAL_THRESHOLD})
+
+    def print_cycle_header(self, cycle: int) -> None:
+        pass
+
+    def print_pair_row(self, symbol: str, data: dict, buy_score: int, sell_score: int,
+                       news_sentiment: str, max_score: int) -> None:
+        self._row = {
+            "type": "scan", "ts": time.time(), "symbol": symbol,
+            **{k: round(data[k], DISPLAY_DECIMALS[k]) for k in _ROW_INDICATORS},
+            "news": news_sentiment, "buy": buy_score, "sell": sell_score,
+        }
+
+    def print_hold(self, buy_score: int, sell_score: int, max_score: int) -> None:
+        self._emit_row(decision="HOLD")
+
+    def print_signal_label(self, direction: str, confidence: float) -> None:
+        self._emit_row(decision=direction, confidence=confidence)
+
+    def print_elite_alert(
+        self,
+        signal_num: int,
+        symbol: str,
+        direction: str,
+        confidence: float,
+        data: dict,
+        triggers: list[str],
+        score: int,
+        wins: int,
+        signals: int,
+        news_headline: str,
+        ai_summary: str,
+    ) -> None:
+        self._writer.write({
+            "type": "signal", "ts": time.time(), "n": signal_num, "symbol": symbol,
+            "direction": direction, "confidence": confidence, "score": score,
+            "entry": round(data["price"], 5),
+            "tp_pips": round(data["atr"] * 10_000 * TP_ATR_MULTIPLIER, 1),
+            "sl_pips": round(data["atr"] * 10_000 * SL_ATR_MULTIPLIER, 1),
+            "indicators": {k: round(data[k], DISPLAY_DECIMALS[k]) for k in _SIGNAL_INDICATORS},
+            "triggers": list(triggers), "headline": news_headline, "ai": ai_summary,
+        })
+
+    def print_cycle_footer(self, cycle: int, signals: int, total_signals: int,
+                           paper: PaperStats, max_score: int, pairs: int) -> None:
+        self._writer.write({"type": "cycle", "ts": time.time(), "cycle": cycle, "signals": signals,
+                            "pairs": pairs, "total_signals": total_signals,
+                            "max_score": max_score, **paper._asdict()})
+
+    def print_event_status(self, total_signals: int, paper: PaperStats, max_score: int,
+                           decisions: dict, signals: dict, feed: dict) -> None:
+        self._writer.write({"type": "status", "ts": time.time(), "decisions": decisions,
+                            "signal_latency": signals, "feed": feed, "total_signals": total_signals,
+                            "max_score": max_score, **paper._asdict()})
+
+    def print_countdown(self, seconds_left: int, next_cycle: int) -> None:
+        pass
+
+    def clear_countdown(self) -> None:
+        pass
+
+    def print_shutdown(self, total_signals: int, paper: PaperStats) -> None:
+        self._writer.write({"type": "stop", "ts": time.time(),
+                            "total_signals": total_signals, **paper._asdict()})
+
+    def close(self) -> None:
+        self._writer.close()
+
+    def _emit_row(self, **outcome) -> None:
+        if self._row is not None:
+            self._row.update(outcome)
+            self._writer.write(self._row)
+            self._row = None
+
+
+# ── Reading ───────────────────────────────────────────────────────────────────
+
+def read_journal(
+    path: str = JOURNAL_PATH,
+    kind: str | None = "signal",
+    symbol: str | None = None,
+    direction: str | None = None,
+    since: float | None = None,
+    until: float | None = None,
+) -> Iterator[dict]:
+    """
+    Records of *path* matching every given filter (None = any); *since* is
+    inclusive and *until* exclusive, both epoch seconds.  *direction*
+    matches signal directions and scan decisions.  A torn last line from
+    an interrupted write is skipped.
+    """
+    # Cheap substring checks on the compact encoding skip most lines unparsed
+    needles = [f'"{k}":"{v}"' for k, v in (("type", kind), ("symbol", symbol)) if v]
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not all(n in line for n in needles):
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if kind and record.get("type") != kind:
+                continue
+            if symbol and record.get("symbol") != symbol:
+                continue
+            if direction and direction not in (record.get("direction"), record.get("decision")):
+                continue
+            ts = record.get("ts", 0.0)
+            if (since is not None and ts < since) or (until is not None and ts >= until):
+                continue
+            yield record
+
+
+def parse_time(value: str) -> float:
+    """Epoch seconds from a number or an ISO-8601 date/time (UTC unless zoned)."""
+    try:
+        return float(value)
+    except ValueError:
+        moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
@@ -8,16 +8,31 @@ Purpose : Application entry point.
 
 Usage
 -----
-    python main.py
+    python main.py                               # live signal loop
+    python main.py --async                       # live loop, pairs analysed concurrently
+    python main.py --events                      # event-driven: analyse each pair on every new bar
+    python main.py --events --feed tcp://127.0.0.1:9100
+    TIMEFRAMES=1s,1m,5m,15m python main.py --events   # multi-timeframe scoring from ticks
+    python main.py --shards 8                    # pairs scanned by 8 worker processes
+    python main.py --dashboard                   # in-place table instead of scrolling output
+    python main.py --headless                    # no rendering; records to logs/signals.jsonl
+    python main.py journal --pair EURUSD --direction BUY --since 2026-10-01
+    python main.py replay-server --data bars.csv --speed 60 --port 9100
+    python main.py backtest --data bars.csv      # historical backtest
+    python main.py optimize --data bars.csv      # tune score weights / thresholds
+    python main.py import-bars --data bars.csv --store data/bars
 
 Environment
 -----------
 Copy .env.example → .env and fill in:
     ANTHROPIC_API_KEY   — Claude AI signal confirmation
     NEWS_API_KEY        — Live forex headline sentiment
-    (optional) ALPHA_VANTAGE_KEY, CYCLE_SECONDS, SIGNAL_THRESHOLD
+    (optional) ALPHA_VANTAGE_KEY, CYCLE_SECONDS, SIGNAL_THRESHOLD, PAIRS_FILE,
+                        SNAPSHOT_PATH
 """
 
+import argparse
+import asyncio
 import logging
 import sys
 import os
@@ -25,7 +40,7 @@ import os
 # Make sure project root is on sys.path when run directly
 sys.path.insert(0, os.path.dirname(__file__))
 
-from core.bot import UltraEliteBot
+from config import settings
 
 logging.basicConfig(
     level=logging.WARNING,
@@ -36,6 +51,192 @@ logging.basicConfig(
     ],
 )
 
+
+# The periodic metrics summary is logged at INFO
+logging.getLogger("utils.metrics").setLevel(logging.INFO)
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Ultra Elite Scalping v3.2")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="analyse all pairs of a cycle concurrently (asyncio)")
+    parser.add_argument("--events", dest="use_events", action="store_true",
+                        help="event-driven mode: analyse a pair as soon as a new bar arrives")
+    parser.add_argument("--feed", default=settings.PRICE_FEED_URL or None,
+                        help="price feed for --events, e.g. tcp://127.0.0.1:9100 (default: simulated)")
+    parser.add_argument("--shards", type=int, metavar="N", nargs="?", const=settings.SHARD_WORKERS,
+                        help="scan the pair universe in N worker processes (default: SHARD_WORKERS)")
+    parser.add_argument("--dashboard", dest="display", action="store_const", const="dashboard",
+                        default=settings.DISPLAY_MODE,
+                        help="redraw one in-place table from a renderer thread instead of printing")
+    parser.add_argument("--headless", dest="display", action="store_const", const="headless",
+                        help="render nothing; journal scan rows and signals to JOURNAL_PATH")
+    sub = parser.add_subparsers(dest="command")
+
+    bt = sub.add_parser("backtest", help="replay historical bars through the strategy")
+    bt.add_argument("--data", required=True,
+                    help="OHLCV CSV (timestamp,symbol,open,high,low,close,volume) or BarStore directory")
+    bt.add_argument("--workers", type=int, default=settings.BACKTEST_WORKERS)
+    bt.add_argument("--threshold", type=int, default=settings.SIGNAL_THRESHOLD)
+
+    opt = sub.add_parser("optimize", help="sweep score weights and thresholds over historical bars")
+    opt.add_argument("--data", required=True,
+                     help="OHLCV CSV (timestamp,symbol,open,high,low,close,volume) or BarStore directory")
+    opt.add_argument("--strategy", choices=("grid", "random"), default="grid")
+    opt.add_argument("--samples", type=int, default=settings.OPTIMIZER_SAMPLES,
+                     help="candidates drawn by --strategy random")
+    opt.add_argument("--seed", type=int, default=None)
+    opt.add_argument("--workers", type=int, default=settings.BACKTEST_WORKERS)
+    opt.add_argument("--rank-by", choices=("pnl", "win_rate", "signals"), default="pnl")
+    opt.add_argument("--min-signals", type=int, default=10,
+                     help="drop candidates with fewer signals from the ranking")
+    opt.add_argument("--top", type=int, default=20, help="rows to print")
+
+    jr = sub.add_parser("journal", help="query the headless signal journal")
+    jr.add_argument("--path", default=settings.JOURNAL_PATH)
+    jr.add_argument("--type", default="signal", choices=("signal", "scan", "cycle", "status", "all"))
+    jr.add_argument("--pair", help="e.g. EURUSD")
+    jr.add_argument("--direction", type=str.upper, choices=("BUY", "SELL", "HOLD"))
+    jr.add_argument("--since", help="ISO-8601 time (UTC unless zoned) or epoch seconds; inclusive")
+    jr.add_argument("--until", help="ISO-8601 time or epoch seconds; exclusive")
+    jr.add_argument("--limit", type=int, default=0, help="stop after N records (0 = all)")
+
+    imp = sub.add_parser("import-bars", help="convert an OHLCV CSV into a BarStore")
+    imp.add_argument("--data", required=True, help="OHLCV CSV")
+    imp.add_argument("--store", default=settings.BAR_STORE_DIR or "data/bars")
+
+    rep = sub.add_parser("replay-server", help="serve recorded bars as a local TCP price feed")
+    rep.add_argument("--data", required=True, help="OHLCV CSV or BarStore directory")
+    rep.add_argument("--speed", type=float, default=1.0, help="multiple of real time (0 = unthrottled)")
+    rep.add_argument("--repeat", type=int, default=1)
+    rep.add_argument("--host", default="127.0.0.1")
+    rep.add_argument("--port", type=int, default=9100)
+    return parser.parse_args(argv)
+
+
+def _run_backtest(args: argparse.Namespace) -> None:
+    from core.backtest import load_csv, run_backtest
+    import utils.display as ui
+
+    if os.path.isdir(args.data):
+        from core.bar_store import BarStore
+        bars = BarStore(args.data).slices()
+    else:
+        bars = load_csv(args.data)
+    report = run_backtest(bars, threshold=args.threshold, workers=args.workers)
+    ui.print_backtest_report(report)
+
+
+def _run_optimizer(args: argparse.Namespace) -> None:
+    from core.backtest import load_csv
+    from core.optimizer import STRATEGIES, RandomSearch, optimize
+    import utils.display as ui
+
+    if os.path.isdir(args.data):
+        from core.bar_store import BarStore
+        bars = BarStore(args.data).slices()
+    else:
+        bars = load_csv(args.data)
+    if args.strategy == "random":
+        strategy = RandomSearch(samples=args.samples, seed=args.seed)
+    else:
+        strategy = STRATEGIES[args.strategy]()
+    report = optimize(bars, strategy=strategy, workers=args.workers,
+                      rank_by=args.rank_by, min_signals=args.min_signals)
+    ui.print_optimizer_report(report, top=args.top)
+
+
+def _query_journal(args: argparse.Namespace) -> None:
+    import itertools
+    import json
+    from utils.journal import parse_time, read_journal
+
+    records = read_journal(
+        args.path,
+        kind=None if args.type == "all" else args.type,
+        symbol=args.pair.upper() if args.pair else None,
+        direction=args.direction,
+        since=parse_time(args.since) if args.since else None,
+        until=parse_time(args.until) if args.until else None,
+    )
+    for record in itertools.islice(records, args.limit or None):
+        print(json.dumps(record, ensure_ascii=False))
+
+
+def _import_bars(args: argparse.Namespace) -> None:
+    from core.backtest import load_csv
+    from core.bar_store import BarStore
+
+    store = BarStore(args.store)
+    for symbol, columns in load_csv(args.data).items():
+        store.append_many(symbol, columns)
+        print(f"{symbol}: {store.rows(symbol):,d} bars")
+    store.close()
+
+
+def _replay_server(args: argparse.Namespace) -> None:
+    import time
+    from core.backtest import load_csv
+    from utils.stubs import ReplayServer
+
+    if os.path.isdir(args.data):
+        from core.bar_store import BarStore
+        store = BarStore(args.data)
+        bars = {s: store.read(s) for s in store.symbols()}
+    else:
+        bars = load_csv(args.data)
+    with ReplayServer(bars, speed=args.speed, repeat=args.repeat,
+                      host=args.host, port=args.port) as server:
+        print(f"Replaying {sum(len(c['timestamp']) for c in bars.values()):,d} bars "
+              f"at {args.speed:g}x on {server.url} — Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
 if __name__ == "__main__":
-    bot = UltraEliteBot()
-    bot.run_ultra()
+    args = _parse_args()
+    if args.command == "backtest":
+        _run_backtest(args)
+    elif args.command == "optimize":
+        _run_optimizer(args)
+    elif args.command == "journal":
+        _query_journal(args)
+    elif args.command == "import-bars":
+        _import_bars(args)
+    elif args.command == "replay-server":
+        _replay_server(args)
+    else:
+        from core.bot import UltraEliteBot
+
+        if settings.METRICS_PORT:
+            from utils.metrics import MetricsServer
+            MetricsServer(settings.METRICS_HOST, settings.METRICS_PORT).start()
+
+        if args.display == "dashboard":
+            # Log lines on stdout would scroll the table away
+            root = logging.getLogger()
+            for handler in list(root.handlers):
+                if not isinstance(handler, logging.FileHandler):
+                    root.removeHandler(handler)
+
+        bot = UltraEliteBot(display=args.display)
+        if args.use_events:
+            from core.feed import feed_from_url
+
+            feed = feed_from_url(args.feed) if args.feed else None
+            try:
+                asyncio.run(bot.run_events(feed))
+            except KeyboardInterrupt:
+                pass
+        elif args.shards:
+            bot.run_sharded(args.shards)
+        elif args.use_async:
+            try:
+                asyncio.run(bot.run_ultra_async())
+            except KeyboardInterrupt:
+                pass
+        else:
+            bot.run_ultra()
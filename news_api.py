@@ -11,14 +11,23 @@ Setup
 1. Register at https://newsapi.org (free tier: 100 req/day)
 2. Add your key to .env:  NEWS_API_KEY=abc123...
 3. The client degrades gracefully if the key is missing or the API is down.
+
+Fetching is incremental: only articles newer than the newest one already
+stored are requested, everything is kept in a SQLite cache (see
+apis/news_cache.py) and requests are paced to fit the daily quota.
 """
 
+import asyncio
 import requests
 import logging
 from config.settings import (
     NEWS_API_URL, NEWS_QUERY, NEWS_LANGUAGE,
-    NEWS_PAGE_SIZE, PAIR_KEYWORDS
+    NEWS_PAGE_SIZE, PAIR_KEYWORDS, NEWS_HEADLINE_LIMIT, NEWS_CACHE_PATH,
+    NEWS_DAILY_QUOTA, NEWS_SESSION_START_HOUR, NEWS_SESSION_END_HOUR,
 )
+from apis.news_cache import HeadlineCache, RequestBudget
+from apis.news_index import HeadlineIndex, HeadlineMatcher
+from utils.metrics import NEWS_FETCHES
 
 logger = logging.getLogger(__name__)
 
@@ -40,53 +49,94 @@ class NewsAPIClient:
     Methods
     -------
     fetch_headlines() → list[dict]
-        Pull the latest forex/macro headlines.
+        Pull new forex/macro headlines (when the quota allows) and return
+        the most recent NEWS_HEADLINE_LIMIT from the persistent cache.
+
+    fetch_headlines_async() → list[dict]
+        Awaitable fetch_headlines(); the HTTP call runs in a worker thread.
 
     sentiment_for_pair(symbol, headlines) → (int, str)
         Return (bonus_score, top_headline_string) for a specific pair.
         bonus_score is in the range −10 … +10.
     """
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        url: str = NEWS_API_URL,
+        cache: HeadlineCache | None = None,
+        budget: RequestBudget | None = None,
+    ) -> None:
         self._key = api_key
+        self._url = url
         self._session = requests.Session()
+        self.cache = cache if cache is not None else HeadlineCache(NEWS_CACHE_PATH)
+        self.budget = budget if budget is not None else RequestBudget(
+            self.cache, NEWS_DAILY_QUOTA, NEWS_SESSION_START_HOUR, NEWS_SESSION_END_HOUR
+        )
+        self._matcher = HeadlineMatcher(PAIR_KEYWORDS, _BULLISH_WORDS, _BEARISH_WORDS)
+        self._index: HeadlineIndex | None = None
 
     # ── Public ────────────────────────────────────────────────────────────────
 
     def fetch_headlines(self) -> list[dict]:
         """
-        Fetch up to NEWS_PAGE_SIZE latest forex/macro articles.
-        Returns empty list on any failure so the bot keeps running.
+        Fetch forex/macro articles newer than the cache cursor, if the
+        request budget allows, and return the latest cached headlines.
+        Falls back to mock headlines when nothing is cached yet.
         """
         if not self._key:
             logger.warning("NEWS_API_KEY not set — using mock headlines")
+            NEWS_FETCHES.labels("no_key").inc()
             return self._mock_headlines()
 
-        try:
-            resp = self._session.get(
-                NEWS_API_URL,
-                params={
-                    "q":        NEWS_QUERY,
-                    "language": NEWS_LANGUAGE,
-                    "pageSize": NEWS_PAGE_SIZE,
-                    "sortBy":   "publishedAt",
-                    "apiKey":   self._key,
-                },
-                timeout=8,
-            )
-            resp.raise_for_status()
-            articles = resp.json().get("articles", [])
-            logger.debug("Fetched %d headlines from NewsAPI", len(articles))
-            return articles
-        except Exception as exc:
-            logger.warning("NewsAPI error: %s — using mock headlines", exc)
-            return self._mock_headlines()
+        if self.budget.allow():
+            params = {
+                "q":        NEWS_QUERY,
+                "language": NEWS_LANGUAGE,
+                "pageSize": NEWS_PAGE_SIZE,
+                "sortBy":   "publishedAt",
+                "apiKey":   self._key,
+            }
+            cursor = self.cache.cursor()
+            if cursor:
+                params["from"] = cursor
+            try:
+                self.budget.record()
+                resp = self._session.get(self._url, params=params, timeout=8)
+                resp.raise_for_status()
+                articles = resp.json().get("articles", [])
+                added = self.cache.add(articles)
+                logger.debug("Fetched %d headlines from NewsAPI (%d new)", len(articles), added)
+                NEWS_FETCHES.labels("ok").inc()
+            except requests.HTTPError as exc:
+                status = exc.response.status_code if exc.response is not None else None
+                if status == 429:
+                    self.budget.exhaust()
+                logger.warning("NewsAPI error: %s — using cached headlines", exc)
+                NEWS_FETCHES.labels(f"http_{status}").inc()
+            except Exception as exc:
+                logger.warning("NewsAPI error: %s — using cached headlines", exc)
+                NEWS_FETCHES.labels(type(exc).__name__).inc()
+        else:
+            logger.debug("NewsAPI budget: %d/%d used today — serving cache",
+                         self.budget.used_today, self.budget.quota)
+            NEWS_FETCHES.labels("budget_skip").inc()
+
+        headlines = self.cache.latest(NEWS_HEADLINE_LIMIT)
+        return headlines or self._mock_headlines()
+
+    async def fetch_headlines_async(self) -> list[dict]:
+        """Awaitable fetch_headlines() for the asyncio run mode."""
+        return await asyncio.to_thread(self.fetch_headlines)
 
     def sentiment_for_pair(
         self, symbol: str, headlines: list[dict]
     ) -> tuple[int, str]:
         """
         Filter headlines relevant to *symbol* and aggregate sentiment.
+        Served from the pair → headline index, so repeated calls with the
+        same headline list cost O(1).
 
         Returns
         -------
@@ -94,29 +144,16 @@ class NewsAPIClient:
             bonus         : integer in [−10, +10]
             headline_text : the single most relevant headline (or fallback msg)
         """
-        keywords = PAIR_KEYWORDS.get(symbol, [])
-        relevant = [
-            h for h in headlines
-            if any(kw.lower() in (h.get("title") or "").lower() for kw in keywords)
-        ]
-
-        if not relevant:
-            return 0, "No relevant headlines found for this pair"
+        return self.index_for(headlines).sentiment_for_pair(symbol)
 
-        top = relevant[0]
-        headline_text = top.get("title") or "—"
-
-        # Score each relevant headline
-        total = 0
-        for article in relevant[:5]:
-            text = ((article.get("title") or "") + " " + (article.get("description") or "")).lower()
-            bull = sum(1 for w in _BULLISH_WORDS if w in text)
-            bear = sum(1 for w in _BEARISH_WORDS if w in text)
-            total += (bull - bear)
-
-        # Clamp to ±10
-        bonus = max(-10, min(10, total * 2))
-        return bonus, headline_text
+    def index_for(self, headlines: list[dict]) -> HeadlineIndex:
+        """
+        HeadlineIndex over *headlines*, rebuilt only when a new list is
+        passed in (i.e. after a news refresh).
+        """
+        if self._index is None or self._index.source is not headlines:
+            self._index = HeadlineIndex(headlines, self._matcher, previous=self._index)
+        return self._index
 
     # ── Private ───────────────────────────────────────────────────────────────
 
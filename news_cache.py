@@ -0,0 +1,183 @@
+"""
+ultra_elite_scalping/apis/news_cache.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Persistent headline history and NewsAPI request budgeting.
+
+HeadlineCache keeps every article ever fetched in SQLite (deduplicated by
+URL) together with the incremental ``from`` cursor and the daily request
+counter, so a restart neither refetches old news nor forgets how much of
+the free-tier quota (100 req/day) has been spent.
+
+RequestBudget spreads the remaining daily quota evenly over the rest of
+the trading session instead of burning it in the first hour.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+from typing import Callable
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url          TEXT PRIMARY KEY,
+    published_at TEXT NOT NULL,
+    title        TEXT,
+    description  TEXT,
+    source       TEXT,
+    fetched_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_published ON articles (published_at DESC);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class HeadlineCache:
+    """
+    SQLite-backed article store.
+
+    Methods
+    -------
+    add(articles) → int
+        Insert new articles (by URL); returns how many were new.
+    latest(limit) → list[dict]
+        Most recent articles first, in NewsAPI article shape.
+    cursor() → str | None
+        ``publishedAt`` of the newest stored article (the ``from`` cursor).
+    """
+
+    def __init__(self, path: str) -> None:
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Used from the asyncio worker threads as well; guarded by _lock
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def add(self, articles: list[dict]) -> int:
+        rows = [
+            (
+                a.get("url") or f"{a.get('publishedAt')}|{a.get('title')}",
+                a.get("publishedAt") or "",
+                a.get("title"),
+                a.get("description"),
+                (a.get("source") or {}).get("name"),
+                time.time(),
+            )
+            for a in articles
+        ]
+        with self._lock, self._db:
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            return self._db.total_changes - before
+
+    def latest(self, limit: int) -> list[dict]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT url, published_at, title, description, source FROM articles "
+                "ORDER BY published_at DESC LIMIT ?", (limit,),
+            ).fetchall()
+        return [
+            {"url": url, "publishedAt": published, "title": title,
+             "description": description, "source": {"name": source}}
+            for url, published, title, description, source in rows
+        ]
+
+    def cursor(self) -> str | None:
+        with self._lock:
+            row = self._db.execute("SELECT MAX(published_at) FROM articles").fetchone()
+        return row[0] if row and row[0] else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def get_meta(self, key: str, default: str | None = None) -> str | None:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO meta VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, value),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class RequestBudget:
+    """
+    Paces API requests so the daily quota lasts the whole session.
+
+    The session runs from *session_start* to *session_end* (UTC hours,
+    end exclusive; 0 → 24 means all day).  A request is allowed when quota
+    remains and at least remaining_session_time / remaining_requests has
+    passed since the previous one.  Usage is persisted in *cache* meta.
+    """
+
+    def __init__(
+        self,
+        cache: HeadlineCache,
+        daily_quota: int,
+        session_start: int = 0,
+        session_end: int = 24,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._cache = cache
+        self.quota = daily_quota
+        self._start = session_start
+        self._end = session_end
+        self._clock = clock
+
+    @property
+    def used_today(self) -> int:
+        return self._usage(self._now())[1]
+
+    def allow(self) -> bool:
+        """True if a request may be sent now."""
+        now = self._now()
+        _, used = self._usage(now)
+        remaining = self.quota - used
+        if remaining <= 0:
+            return False
+        session_start = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(hours=self._start)
+        session_end = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(hours=self._end)
+        if not session_start <= now < session_end:
+            return False
+        last = float(self._cache.get_meta("news_last_request", "0"))
+        interval = (session_end - now).total_seconds() / remaining
+        return now.timestamp() - last >= interval
+
+    def record(self) -> None:
+        """Count one request against today's quota."""
+        now = self._now()
+        day, used = self._usage(now)
+        self._cache.set_meta("news_quota_day", day)
+        self._cache.set_meta("news_quota_used", str(used + 1))
+        self._cache.set_meta("news_last_request", str(now.timestamp()))
+
+    def exhaust(self) -> None:
+        """Mark today's quota as spent (the server answered 429)."""
+        self._cache.set_meta("news_quota_day", self._usage(self._now())[0])
+        self._cache.set_meta("news_quota_used", str(self.quota))
+
+    def _now(self) -> datetime:
+        return datetime.fromtimestamp(self._clock(), tz=timezone.utc)
+
+    def _usage(self, now: datetime) -> tuple[str, int]:
+        day = now.strftime("%Y-%m-%d")
+        if self._cache.get_meta("news_quota_day") != day:
+            return day, 0
+        return day, int(self._cache.get_meta("news_quota_used", "0"))
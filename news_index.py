@@ -0,0 +1,135 @@
+"""
+ultra_elite_scalping/apis/news_index.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : One-pass headline preprocessing for the news sentiment bonus.
+
+Every pair keyword and sentiment word is compiled into a single
+word-boundary regex.  Each headline is scanned once when it arrives,
+yielding the set of pairs it concerns and its sentiment; an inverted
+index pair → headline ids then makes per-pair lookups independent of
+how many headlines or keywords there are.
+"""
+
+import re
+from dataclasses import dataclass
+
+# Inflections accepted after a sentiment word ("drop" → drops, dropped,
+# dropping; "rally" → rallies, rallied; "rise" → rises, rising, risen)
+_SUFFIXES = "(?:s|es|ed|en|ens|ened|er|ers|est|ing)?"
+
+
+def _word_pattern(word: str) -> str:
+    stem = re.escape(word)
+    if word.endswith("y"):
+        return stem[:-1] + "(?:y|ies|ied|ying)"
+    if word.endswith("e"):
+        return stem[:-1] + "(?:e|es|ed|en|er|ers|ing)"
+    # optional doubled final consonant: dropped, slimmer
+    return stem + f"(?:{re.escape(word[-1])}?(?:ed|er|est|ing))?" + _SUFFIXES
+
+
+@dataclass(frozen=True)
+class HeadlineFacts:
+    """What the matcher found in one headline."""
+    pairs:     frozenset[str]
+    sentiment: int             # distinct bullish words − distinct bearish words
+
+
+class HeadlineMatcher:
+    """
+    Compiled matcher for pair keywords and sentiment words.
+
+    Keywords must match whole words (case-insensitive), so "oil" no longer
+    matches "turmoil".  Each pair symbol itself ("EURUSD") is added as a
+    keyword.  Sentiment words also accept their common inflections.
+    """
+
+    def __init__(
+        self,
+        pair_keywords: dict[str, list[str]],
+        bullish: set[str],
+        bearish: set[str],
+    ) -> None:
+        keyword_pairs: dict[str, set[str]] = {}
+        for symbol, keywords in pair_keywords.items():
+            for kw in (*keywords, symbol):
+                keyword_pairs.setdefault(kw.lower(), set()).add(symbol)
+
+        # group number → (pairs, polarity); longest alternatives first so
+        # "federal reserve" is preferred over shorter overlapping terms
+        terms = sorted(
+            [(kw, re.escape(kw), frozenset(pairs), 0) for kw, pairs in keyword_pairs.items()]
+            + [(w, _word_pattern(w), frozenset(), +1) for w in bullish]
+            + [(w, _word_pattern(w), frozenset(), -1) for w in bearish],
+            key=lambda t: -len(t[0]),
+        )
+        self._groups: list[tuple[str, frozenset[str], int]] = [("", frozenset(), 0)]
+        alternatives = []
+        for word, pattern, pairs, polarity in terms:
+            self._groups.append((word, pairs, polarity))
+            alternatives.append(f"({pattern})")
+        self._regex = re.compile(
+            r"(?<![\w])(?:" + "|".join(alternatives) + r")(?![\w])", re.IGNORECASE
+        )
+
+    def analyse(self, headline: dict) -> HeadlineFacts:
+        """Pairs come from the title only; sentiment from title + description."""
+        pairs: set[str] = set()
+        bullish: set[str] = set()
+        bearish: set[str] = set()
+        for field in ("title", "description"):
+            for m in self._regex.finditer(headline.get(field) or ""):
+                word, term_pairs, polarity = self._groups[m.lastindex]
+                if polarity > 0:
+                    bullish.add(word)
+                elif polarity < 0:
+                    bearish.add(word)
+                elif field == "title":
+                    pairs.update(term_pairs)
+        return HeadlineFacts(frozenset(pairs), len(bullish) - len(bearish))
+
+
+class HeadlineIndex:
+    """
+    Inverted index pair → headline ids over one list of headlines.
+
+    Headlines already analysed by *previous* (same title and description)
+    are not rescanned, so rebuilding after a news refresh only costs the
+    new articles.  Per-pair results are memoised.
+    """
+
+    def __init__(
+        self,
+        headlines: list[dict],
+        matcher: HeadlineMatcher,
+        previous: "HeadlineIndex | None" = None,
+    ) -> None:
+        self.source = headlines
+        known = previous._facts_by_key if previous is not None else {}
+        self._facts_by_key: dict[tuple[str, str], HeadlineFacts] = {}
+        self.facts: list[HeadlineFacts] = []
+        self.by_pair: dict[str, list[int]] = {}
+        for i, headline in enumerate(headlines):
+            key = (headline.get("title") or "", headline.get("description") or "")
+            facts = self._facts_by_key.get(key) or known.get(key) or matcher.analyse(headline)
+            self._facts_by_key[key] = facts
+            self.facts.append(facts)
+            for symbol in facts.pairs:
+                self.by_pair.setdefault(symbol, []).append(i)
+        self._results: dict[str, tuple[int, str]] = {}
+
+    def sentiment_for_pair(self, symbol: str, top_n: int = 5) -> tuple[int, str]:
+        result = self._results.get(symbol)
+        if result is None:
+            ids = self.by_pair.get(symbol)
+            if not ids:
+                result = (0, "No relevant headlines found for this pair")
+            else:
+                total = sum(self.facts[i].sentiment for i in ids[:top_n])
+                # Clamp to ±10
+                bonus = max(-10, min(10, total * 2))
+                result = (bonus, self.source[ids[0]].get("title") or "—")
+            self._results[symbol] = result
+        return result
@@ -0,0 +1,348 @@
+"""
+ultra_elite_scalping/core/optimizer.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Parallel parameter sweep over score weights, indicator cut-offs
+          and the signal threshold, evaluated against historical bars.
+
+Indicator columns are computed once, in the parent, into one
+``multiprocessing.shared_memory`` block.  Pool workers attach to it
+read-only, so each task ships only a chunk of candidate parameter sets
+and returns a few numbers per candidate — no bar data is copied.
+
+A candidate is a flat dict: SCORE_WEIGHTS keys, SCORE_CUTOFFS keys and
+``threshold``; anything missing keeps its configured value.  Search
+strategies are pluggable: subclass SearchStrategy and yield candidates.
+
+Usage
+-----
+    python main.py optimize --data bars.csv                   # grid search
+    python main.py optimize --data data/bars --strategy random --samples 5000
+"""
+
+import itertools
+import logging
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+from config.settings import (
+    SCORE_WEIGHTS, SCORE_CUTOFFS, SIGNAL_THRESHOLD, INDICATOR_WARMUP_BARS,
+    BACKTEST_WORKERS, OPTIMIZER_SPACE, OPTIMIZER_SAMPLES, OPTIMIZER_CHUNK,
+)
+from core.backtest import SCORE_INPUTS, score_history, simulate_trades
+from core.pips import pip_size
+from core.bar_store import BarSlice
+from core.indicators import indicator_columns
+from core.scoring import ScoringEngine
+
+logger = logging.getLogger(__name__)
+
+# Rows of the shared block, per bar: the score inputs, then what the trade
+# simulation needs.  Bonuses are stored as float64 and cast back on use.
+SHARED_COLUMNS = SCORE_INPUTS + ("close", "high", "low", "atr", "news_bonus", "ai_bonus")
+PARAMETERS = ("threshold",) + tuple(SCORE_WEIGHTS) + tuple(SCORE_CUTOFFS)
+RANK_KEYS = ("pnl", "win_rate", "signals")
+
+
+@dataclass
+class Trial:
+    """Result of one candidate across every pair."""
+    params:   dict[str, float]
+    signals:  int
+    wins:     int
+    losses:   int
+    pnl_pips: float
+
+    @property
+    def win_rate(self) -> float:
+        closed = self.wins + self.losses
+        return self.wins / closed * 100 if closed else 0.0
+
+
+@dataclass
+class OptimizerReport:
+    trials:    list[Trial]            # ranked, best first
+    evaluated: int                    # candidates tried (before min_signals)
+    strategy:  str
+    rank_by:   str
+    bars:      int
+    elapsed:   float                  # wall-clock seconds
+    params:    tuple[str, ...] = field(default=())   # parameters that were varied
+
+    @property
+    def trials_per_sec(self) -> float:
+        return self.evaluated / self.elapsed if self.elapsed else 0.0
+
+
+# ── Search strategies ─────────────────────────────────────────────────────────
+
+class SearchStrategy:
+    """
+    Base class: ``candidates(space)`` yields parameter dicts.
+
+    *space* maps a parameter name to its candidate values.  Candidates are
+    consumed lazily, so a strategy may be unbounded if callers cap it.
+    """
+
+    name = "custom"
+
+    def candidates(self, space: dict[str, Sequence[float]]) -> Iterator[dict[str, float]]:
+        raise NotImplementedError
+
+
+class GridSearch(SearchStrategy):
+    """Every combination of the listed values."""
+
+    name = "grid"
+
+    def candidates(self, space: dict[str, Sequence[float]]) -> Iterator[dict[str, float]]:
+        names = list(space)
+        for values in itertools.product(*(space[n] for n in names)):
+            yield dict(zip(names, values))
+
+
+class RandomSearch(SearchStrategy):
+    """
+    *samples* uniform draws between each parameter's smallest and largest
+    listed value (integers when every listed value is an integer).
+    """
+
+    name = "random"
+
+    def __init__(self, samples: int = OPTIMIZER_SAMPLES, seed: int | None = None) -> None:
+        self.samples = samples
+        self.seed = seed
+
+    def candidates(self, space: dict[str, Sequence[float]]) -> Iterator[dict[str, float]]:
+        rng = random.Random(self.seed)
+        bounds = {
+            name: (min(values), max(values), all(float(v).is_integer() for v in values))
+            for name, values in space.items()
+        }
+        for _ in range(self.samples):
+            yield {
+                name: rng.randint(int(lo), int(hi)) if integral else rng.uniform(lo, hi)
+                for name, (lo, hi, integral) in bounds.items()
+            }
+
+
+STRATEGIES: dict[str, type[SearchStrategy]] = {
+    GridSearch.name:   GridSearch,
+    RandomSearch.name: RandomSearch,
+}
+
+
+# ── Public ────────────────────────────────────────────────────────────────────
+
+def split_params(params: dict[str, float]) -> tuple[int, dict[str, int], dict[str, float]]:
+    """(threshold, weight overrides, cut-off overrides) of one candidate."""
+    unknown = set(params) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown optimizer parameter(s): {sorted(unknown)}")
+    threshold = int(params.get("threshold", SIGNAL_THRESHOLD))
+    weights = {k: int(v) for k, v in params.items() if k in SCORE_WEIGHTS}
+    cutoffs = {k: v for k, v in params.items() if k in SCORE_CUTOFFS}
+    return threshold, weights, cutoffs
+
+
+def rank(trials: Iterable[Trial], by: str = "pnl", min_signals: int = 0) -> list[Trial]:
+    """Best first by *by* (one of RANK_KEYS), ties broken by PnL then win rate."""
+    if by not in RANK_KEYS:
+        raise ValueError(f"rank_by must be one of {RANK_KEYS}")
+    keys = {
+        "pnl":      lambda t: (t.pnl_pips, t.win_rate),
+        "win_rate": lambda t: (t.win_rate, t.pnl_pips),
+        "signals":  lambda t: (t.signals, t.pnl_pips),
+    }
+    eligible = [t for t in trials if t.signals >= min_signals]
+    return sorted(eligible, key=keys[by], reverse=True)
+
+
+def optimize(
+    bars: dict[str, dict[str, np.ndarray] | BarSlice],
+    space: dict[str, Sequence[float]] = OPTIMIZER_SPACE,
+    strategy: SearchStrategy | None = None,
+    workers: int = BACKTEST_WORKERS,
+    rank_by: str = "pnl",
+    min_signals: int = 0,
+    chunk: int = OPTIMIZER_CHUNK,
+) -> OptimizerReport:
+    """
+    Evaluate every candidate of *strategy* (grid search by default) over
+    all pairs in *bars* and return the trials ranked by *rank_by*.
+    """
+    started = time.perf_counter()
+    strategy = strategy or GridSearch()
+    unknown = set(space) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown optimizer parameter(s): {sorted(unknown)}")
+
+    columns = SharedColumns.build(bars)
+    try:
+        candidates = strategy.candidates(space)
+        if workers <= 1:
+            rows = _evaluate_local(columns, candidates, chunk)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_attach_worker, initargs=(columns.spec,),
+            ) as pool:
+                rows = [r for part in pool.map(_evaluate_chunk, _chunks(candidates, chunk)) for r in part]
+    finally:
+        columns.release()
+
+    trials = [Trial(params, *stats) for params, stats in rows]
+    report = OptimizerReport(
+        trials=rank(trials, rank_by, min_signals),
+        evaluated=len(trials),
+        strategy=strategy.name,
+        rank_by=rank_by,
+        bars=columns.bars,
+        elapsed=time.perf_counter() - started,
+        params=tuple(space),
+    )
+    logger.info("Optimizer: %d candidates (%s) over %d bars in %.2fs",
+                len(trials), report.strategy, report.bars, report.elapsed)
+    return report
+
+
+class SharedColumns:
+    """
+    Indicator and trade columns of every pair, stacked in one shared
+    memory block of shape (len(SHARED_COLUMNS), total bars).
+
+    ``spec`` is the picklable description workers use to attach; the
+    creating process must call ``release()`` to free the block.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, spec: tuple, owner: bool) -> None:
+        self._shm = shm
+        self.spec = spec
+        self._owner = owner
+
+    @classmethod
+    def build(cls, bars: dict[str, dict[str, np.ndarray] | BarSlice]) -> "SharedColumns":
+        """Compute indicator columns for every pair and copy them into shared memory."""
+        per_pair: dict[str, dict[str, np.ndarray]] = {}
+        for symbol, pair_bars in bars.items():
+            if isinstance(pair_bars, BarSlice):
+                pair_bars = pair_bars.load()
+            data = indicator_columns(
+                pair_bars["open"], pair_bars["high"], pair_bars["low"],
+                pair_bars["close"], pair_bars["volume"],
+            )
+            n = data["price"].shape[0]
+            data["close"] = pair_bars["close"]
+            data["high"] = pair_bars["high"]
+            data["low"] = pair_bars["low"]
+            for c in ("news_bonus", "ai_bonus"):
+                data[c] = pair_bars[c] if c in pair_bars else np.zeros(n)
+            per_pair[symbol] = data
+
+        total = sum(d["price"].shape[0] for d in per_pair.values())
+        shape = (len(SHARED_COLUMNS), total)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, 8 * shape[0] * shape[1]))
+        table = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        layout: list[tuple[str, int, int, bool]] = []
+        pos = 0
+        for symbol, data in per_pair.items():
+            n = data["price"].shape[0]
+            for row, c in enumerate(SHARED_COLUMNS):
+                table[row, pos:pos + n] = data[c]
+            layout.append((symbol, pos, pos + n, bool(np.any(data["ai_bonus"]))))
+            pos += n
+        del table                     # no exported buffers may outlive close()
+        return cls(shm, (shm.name, shape, tuple(layout)), owner=True)
+
+    @classmethod
+    def attach(cls, spec: tuple) -> "SharedColumns":
+        # Pool workers share the creator's resource tracker, so attaching
+        # does not hand them ownership of the block.
+        shm = shared_memory.SharedMemory(name=spec[0])
+        return cls(shm, spec, owner=False)
+
+    @property
+    def bars(self) -> int:
+        return self.spec[1][1]
+
+    def views(self) -> list[tuple[str, dict[str, np.ndarray], bool]]:
+        """Read-only per-pair column views: [(symbol, {column: array}, has_ai)]."""
+        _, shape, layout = self.spec
+        table = np.ndarray(shape, dtype=np.float64, buffer=self._shm.buf)
+        table.flags.writeable = False
+        return [
+            (symbol, {c: table[row, start:stop] for row, c in enumerate(SHARED_COLUMNS)}, has_ai)
+            for symbol, start, stop, has_ai in layout
+        ]
+
+    def release(self) -> None:
+        try:
+            self._shm.close()
+        except BufferError:
+            pass                      # a view is still alive; unmapped at exit
+        if self._owner:
+            self._shm.unlink()
+
+
+# ── Private ───────────────────────────────────────────────────────────────────
+
+_WORKER_COLUMNS: "SharedColumns | None" = None     # keeps the mapping alive for the views
+_WORKER_VIEWS: list[tuple[str, dict[str, np.ndarray], bool]] = []
+
+
+def _attach_worker(spec: tuple) -> None:
+    global _WORKER_COLUMNS, _WORKER_VIEWS
+    _WORKER_COLUMNS = SharedColumns.attach(spec)
+    _WORKER_VIEWS = _WORKER_COLUMNS.views()
+
+
+def _evaluate_chunk(candidates: list[dict[str, float]]) -> list[tuple[dict, tuple]]:
+    return _evaluate(_WORKER_VIEWS, candidates)
+
+
+def _evaluate_local(
+    columns: "SharedColumns", candidates: Iterable[dict[str, float]], chunk: int,
+) -> list[tuple[dict, tuple[int, int, int, float]]]:
+    views = columns.views()           # dropped on return, before release()
+    return [r for batch in _chunks(candidates, chunk) for r in _evaluate(views, batch)]
+
+
+def _evaluate(
+    views: list[tuple[str, dict[str, np.ndarray], bool]],
+    candidates: list[dict[str, float]],
+) -> list[tuple[dict, tuple[int, int, int, float]]]:
+    """Backtest each candidate over every pair; (params, (signals, wins, losses, pnl_pips))."""
+    results = []
+    for params in candidates:
+        threshold, weights, cutoffs = split_params(params)
+        scorer = ScoringEngine(weights, cutoffs)
+        signals = wins = losses = 0
+        pnl_pips = 0.0
+        for symbol, cols, has_ai in views:
+            news = cols["news_bonus"].astype(np.int64)
+            ai = cols["ai_bonus"].astype(np.int64) if has_ai else 0
+            result = score_history(scorer, tuple(cols[c] for c in SCORE_INPUTS), news, ai, threshold)
+            entries, _, pnl, open_at_end = simulate_trades(
+                result.direction, cols["close"], cols["high"], cols["low"], cols["atr"],
+                start=INDICATOR_WARMUP_BARS,
+            )
+            signals += len(entries) + open_at_end
+            won = int(np.count_nonzero(pnl > 0))
+            wins += won
+            losses += len(pnl) - won
+            pnl_pips += float(pnl.sum()) / pip_size(symbol)
+        results.append((params, (signals, wins, losses, pnl_pips)))
+    return results
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    it = iter(items)
+    while batch := list(itertools.islice(it, size)):
+        yield batch
+
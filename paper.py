@@ -0,0 +1,202 @@
+"""
+ultra_elite_scalping/core/paper.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Paper-trading fills for live signals: realised PnL and a true
+          win rate instead of counting every signal as a win.
+
+Every emitted signal opens a simulated position at the signal price with
+the take-profit / stop-loss the alert shows: TP_ATR_MULTIPLIER and
+SL_ATR_MULTIPLIER ATRs away.  Each position is closed by the first tick
+(or bar) that touches one of its levels, with the backtest's rules
+(core/backtest.py): the exit is at the level, and a bar touching both
+levels counts as a loss.
+
+Open positions are indexed per pair by trigger price, in two heaps:
+levels hit by a rising price (long TPs, short SLs) in a min-heap and
+levels hit by a falling price (long SLs, short TPs) in a max-heap.  A tick
+only looks at the top of each heap, so it costs O(1) when nothing fills
+and O(log n) per fill, however many positions are open.  The second level
+of a closed position stays in its heap and is skipped when reached; the
+heaps are compacted once such stale entries make up half of them.
+
+Positions live in memory only; a restart starts with an empty book.
+
+Usage
+-----
+    book = PaperBook()
+    book.open("EURUSD", "BUY", entry=1.08540, atr=0.00012)
+    fills = book.on_tick("EURUSD", high=1.08556, low=1.08531)
+    print(book.stats().win_rate)
+"""
+
+import heapq
+import itertools
+from typing import NamedTuple
+
+from config.settings import TP_ATR_MULTIPLIER, SL_ATR_MULTIPLIER
+from core.pips import pip_size
+
+_COMPACT_MIN = 64          # stale entries tolerated before a compaction is considered
+
+
+class Fill(NamedTuple):
+    """One closed paper position."""
+    symbol:    str
+    direction: str
+    entry:     float
+    exit:      float
+    pips:      float
+    won:       bool
+    opened_ns: int
+    closed_ns: int
+
+
+class PaperStats(NamedTuple):
+    """Totals of a PaperBook."""
+    open:              int
+    wins:              int
+    losses:            int
+    pnl_pips:          float
+    max_drawdown_pips: float
+
+    @property
+    def closed(self) -> int:
+        return self.wins + self.losses
+
+    @property
+    def win_rate(self) -> float:
+        """Winning share of closed positions, in percent."""
+        return self.wins / self.closed * 100 if self.closed else 0.0
+
+
+class _Position:
+    __slots__ = ("symbol", "long", "entry", "tp", "sl", "opened_ns", "open")
+
+    def __init__(self, symbol: str, long: bool, entry: float, tp: float, sl: float, opened_ns: int) -> None:
+        self.symbol = symbol
+        self.long = long
+        self.entry = entry
+        self.tp = tp
+        self.sl = sl
+        self.opened_ns = opened_ns
+        self.open = True
+
+
+class _PairBook:
+    """Trigger heaps of one pair: (level, seq, position), the falling side negated."""
+    __slots__ = ("rising", "falling", "open", "stale")
+
+    def __init__(self) -> None:
+        self.rising: list[tuple[float, int, _Position]] = []
+        self.falling: list[tuple[float, int, _Position]] = []
+        self.open = 0
+        self.stale = 0
+
+
+class PaperBook:
+    """
+    Simulated positions for every pair, filled tick by tick.
+
+    ``open()`` adds a position for a signal, ``on_tick()`` fills every
+    position of the pair whose TP or SL the tick reached and returns the
+    fills (an empty list on most ticks), ``stats()`` reports realised
+    PnL and win rate.
+    """
+
+    def __init__(self, tp_atr: float = TP_ATR_MULTIPLIER, sl_atr: float = SL_ATR_MULTIPLIER) -> None:
+        self.tp_atr = tp_atr
+        self.sl_atr = sl_atr
+        self._books: dict[str, _PairBook] = {}
+        self._seq = itertools.count()
+        self.wins = 0
+        self.losses = 0
+        self.pnl_pips = 0.0
+        self._peak = 0.0
+        self.max_drawdown_pips = 0.0
+
+    def open(self, symbol: str, direction: str, entry: float, atr: float, opened_ns: int = 0) -> bool:
+        """Open a position for a BUY / SELL signal; False when there is no ATR to size it."""
+        if direction not in ("BUY", "SELL") or not atr > 0:
+            return False
+        long = direction == "BUY"
+        sign = 1.0 if long else -1.0
+        tp = entry + sign * atr * self.tp_atr
+        sl = entry - sign * atr * self.sl_atr
+        position = _Position(symbol, long, entry, tp, sl, opened_ns)
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _PairBook()
+        seq = next(self._seq)
+        up, down = (tp, sl) if long else (sl, tp)
+        heapq.heappush(book.rising, (up, seq, position))
+        heapq.heappush(book.falling, (-down, seq, position))
+        book.open += 1
+        return True
+
+    def on_tick(self, symbol: str, high: float, low: float | None = None, timestamp: int = 0) -> list[Fill]:
+        """Fill the positions of *symbol* touched by a tick (*low* defaults to *high*) or bar."""
+        fills: list[Fill] = []
+        book = self._books.get(symbol)
+        if book is None or not book.open:
+            return fills
+        if low is None:
+            low = high
+        rising, falling = book.rising, book.falling
+        while rising and rising[0][0] <= high:
+            position = heapq.heappop(rising)[2]
+            if not position.open:
+                book.stale -= 1
+                continue
+            fills.append(self._close(book, position, high, low, timestamp))
+        while falling and -falling[0][0] >= low:
+            position = heapq.heappop(falling)[2]
+            if not position.open:
+                book.stale -= 1
+                continue
+            fills.append(self._close(book, position, high, low, timestamp))
+        if book.stale > _COMPACT_MIN and 2 * book.stale > len(rising) + len(falling):
+            self._compact(book)
+        return fills
+
+    def open_positions(self, symbol: str | None = None) -> int:
+        if symbol is not None:
+            book = self._books.get(symbol)
+            return book.open if book else 0
+        return sum(book.open for book in self._books.values())
+
+    def stats(self) -> PaperStats:
+        return PaperStats(self.open_positions(), self.wins, self.losses,
+                          round(self.pnl_pips, 1), round(self.max_drawdown_pips, 1))
+
+    # ── Private ───────────────────────────────────────────────────────────────
+
+    def _close(self, book: _PairBook, position: _Position, high: float, low: float, timestamp: int) -> Fill:
+        """Settle *position* against the tick's range; its other trigger becomes stale."""
+        if position.long:
+            won = high >= position.tp and not low <= position.sl
+        else:
+            won = low <= position.tp and not high >= position.sl
+        exit_ = position.tp if won else position.sl
+        pips = (exit_ - position.entry) * (1.0 if position.long else -1.0) / pip_size(position.symbol)
+        position.open = False
+        book.open -= 1
+        book.stale += 1
+        if won:
+            self.wins += 1
+        else:
+            self.losses += 1
+        self.pnl_pips += pips
+        self._peak = max(self._peak, self.pnl_pips)
+        self.max_drawdown_pips = max(self.max_drawdown_pips, self._peak - self.pnl_pips)
+        return Fill(position.symbol, "BUY" if position.long else "SELL", position.entry, exit_,
+                    pips, won, position.opened_ns, timestamp)
+
+    @staticmethod
+    def _compact(book: _PairBook) -> None:
+        book.rising = [entry for entry in book.rising if entry[2].open]
+        book.falling = [entry for entry in book.falling if entry[2].open]
+        heapq.heapify(book.rising)
+        heapq.heapify(book.falling)
+        book.stale = 0
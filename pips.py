@@ -0,0 +1,13 @@
+"""
+ultra_elite_scalping/core/pips.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Pip conventions shared by the backtest, the optimiser and paper
+          trading, without pulling in either of them.
+"""
+
+
+def pip_size(symbol: str) -> float:
+    """Price increment of one pip (JPY crosses quote to two decimals)."""
+    return 0.01 if symbol.endswith("JPY") else 0.0001
@@ -0,0 +1,165 @@
+"""
+ultra_elite_scalping/core/scheduler.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Event-driven scheduling for the live bot.
+
+Instead of sweeping every pair on a fixed cycle, each new bar triggers
+the analysis of its own pair as soon as it arrives.  Slower work (news
+refresh, batched AI confirmation, status output, optional full sweeps)
+runs as independently timed periodic jobs on the same event loop.
+
+Usage
+-----
+    scheduler = EventScheduler()
+    scheduler.every(135, refresh_news, name="news")
+    scheduler.every(1.0, confirm_pending, name="ai")
+    await scheduler.run(on_bar, source=SimulatedFeed(prices, 1.0).stream())
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, NamedTuple
+
+from core.feed import BarEvent, CoalescingQueue
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyStats:
+    """
+    Rolling latency sample (last *window* observations) in nanoseconds.
+
+    ``summary()`` reports count, mean, p50, p99 and max in milliseconds.
+    """
+
+    def __init__(self, window: int = 4096) -> None:
+        self._samples: deque[int] = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, since_ns: int) -> int:
+        latency = time.perf_counter_ns() - since_ns
+        self._samples.append(latency)
+        self.count += 1
+        return latency
+
+    def summary(self) -> dict[str, float]:
+        if not self._samples:
+            return {"count": self.count, "mean_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(self._samples)
+        n = len(ordered)
+        return {
+            "count":   self.count,
+            "mean_ms": sum(ordered) / n / 1e6,
+            "p50_ms":  ordered[(n - 1) // 2] / 1e6,
+            "p99_ms":  ordered[min(n - 1, math.ceil(0.99 * n) - 1)] / 1e6,
+            "max_ms":  ordered[-1] / 1e6,
+        }
+
+
+class _PeriodicJob(NamedTuple):
+    name:     str
+    interval: float
+    func:     Callable[[], Awaitable[None] | None]
+    run_now:  bool
+
+
+class EventScheduler:
+    """
+    Dispatches bar events and runs periodic jobs.
+
+    Bars are handled one at a time in arrival order of their pair; while
+    the handler is busy, new bars of a pair are merged in the
+    CoalescingQueue (see core/feed.py), so a burst never builds a backlog.
+    A job that raises is logged and rescheduled rather than stopping the
+    loop.  Synchronous job functions run in a worker thread so they never
+    block bar handling.
+    """
+
+    def __init__(self) -> None:
+        self.queue = CoalescingQueue()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._jobs: list[_PeriodicJob] = []
+
+    # ── Public ────────────────────────────────────────────────────────────────
+
+    def every(
+        self,
+        seconds: float,
+        func: Callable[[], Awaitable[None] | None],
+        name: str | None = None,
+        run_now: bool = False,
+    ) -> None:
+        """Run *func* every *seconds* (ignored when seconds <= 0)."""
+        if seconds > 0:
+            self._jobs.append(_PeriodicJob(name or func.__name__, seconds, func, run_now))
+
+    def publish(self, event: BarEvent) -> None:
+        """Queue a bar from the event loop thread."""
+        self.queue.put(event)
+
+    def publish_threadsafe(self, event: BarEvent) -> None:
+        """Queue a bar from any other thread (e.g. a broker callback)."""
+        if self._loop is None:
+            raise RuntimeError("scheduler is not running")
+        self._loop.call_soon_threadsafe(self.publish, event)
+
+    async def run(
+        self,
+        on_bar: Callable[[BarEvent], Awaitable[None]],
+        source: AsyncIterator[BarEvent] | None = None,
+    ) -> None:
+        """
+        Run until cancelled: start the periodic jobs, pump *source* (if
+        given) into the queue and dispatch every bar to *on_bar*.
+        """
+        self._loop = asyncio.get_running_loop()
+        tasks = [asyncio.create_task(self._run_job(job), name=f"job:{job.name}") for job in self._jobs]
+        if source is not None:
+            tasks.append(asyncio.create_task(self._pump(source), name="source"))
+        try:
+            while True:
+                await self._handle(on_bar, await self.queue.get())
+                # drain what is pending now, then let the source and jobs run
+                for _ in range(len(self.queue)):
+                    await self._handle(on_bar, self.queue.get_nowait())
+                await asyncio.sleep(0)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._loop = None
+
+    # ── Private ───────────────────────────────────────────────────────────────
+
+    @staticmethod
+    async def _handle(on_bar: Callable[[BarEvent], Awaitable[None]], event: BarEvent) -> None:
+        try:
+            await on_bar(event)
+        except Exception:
+            logger.exception("Bar handler failed for %s", event.symbol)
+
+    async def _pump(self, source: AsyncIterator[BarEvent]) -> None:
+        async for event in source:
+            self.queue.put(event)
+
+    async def _run_job(self, job: _PeriodicJob) -> None:
+        loop = asyncio.get_running_loop()
+        next_run = loop.time() + (0 if job.run_now else job.interval)
+        while True:
+            await asyncio.sleep(max(0.0, next_run - loop.time()))
+            try:
+                if asyncio.iscoroutinefunction(job.func):
+                    await job.func()
+                else:
+                    await asyncio.to_thread(job.func)
+            except Exception:
+                logger.exception("Scheduled job %r failed", job.name)
+            # fixed rate; skip missed runs instead of bursting
+            next_run += job.interval
+            if next_run < loop.time():
+                next_run = loop.time() + job.interval
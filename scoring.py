@@ -5,18 +5,79 @@ Author  : Ultra Elite Dev Team
 Version : 3.2.0
 Purpose : Deterministic scoring engine.  News sentiment and AI confirmation
           bonuses are applied here so scoring stays testable in isolation.
+          ``score_batch`` evaluates whole columns of pairs / bars at once
+          with NumPy and matches the scalar path exactly.  Weights and
+          indicator cut-offs default to config/settings.py and can be
+          overridden per engine (see core/optimizer.py).
+          ``score_timeframes`` blends the technical scores of several
+          timeframes (see core/timeframes.py) before the bonuses.
+          ``with_ai`` turns a pre-score into the final score without a
+          second evaluation; trigger labels can be deferred until a
+          signal is actually shown.
 """
 
 from dataclasses import dataclass, field
-from config.settings import SCORE_WEIGHTS
+from typing import Sequence
 
+import numpy as np
+from numpy.typing import ArrayLike
 
-@dataclass
+from config.settings import SCORE_WEIGHTS, SCORE_CUTOFFS
+from core.indicators import IndicatorSnapshot
+
+# Direction codes used by the batch API
+HOLD: int = 0
+BUY:  int = 1
+SELL: int = -1
+DIRECTION_NAMES: dict[int, str] = {BUY: "BUY", SELL: "SELL", HOLD: "HOLD"}
+
+
+@dataclass(slots=True)
 class ScoreResult:
     buy_score:  int
     sell_score: int
     direction:  str          # "BUY" | "SELL" | "HOLD"
-    triggers:   list[str] = field(default_factory=list)
+    triggers:   Sequence[str] = ()       # empty when scored with labels=False
+
+
+@dataclass
+class BatchScoreResult:
+    """
+    Column-wise scores for N rows (pairs or historical bars).
+
+    ``direction`` holds the integer codes BUY / SELL / HOLD.  Trigger labels
+    are not built up front — call ``triggers(i)`` for the rows you display.
+    """
+    buy_score:  np.ndarray
+    sell_score: np.ndarray
+    direction:  np.ndarray
+    _inputs:    tuple = field(repr=False)
+    _scorer:    "ScoringEngine | None" = field(default=None, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.direction)
+
+    def fired(self) -> np.ndarray:
+        """Indices of rows that produced a BUY or SELL."""
+        return np.flatnonzero(self.direction != HOLD)
+
+    def triggers(self, i: int) -> list[str]:
+        """Trigger labels for row *i*, identical to ``ScoreResult.triggers``."""
+        price, ema_fast, rsi, stoch, macd, adx, news, ai = (
+            col[i].item() for col in self._inputs
+        )
+        return (self._scorer or ScoringEngine())._trigger_labels(
+            price, ema_fast, rsi, stoch, macd, adx, int(news), int(ai)
+        )
+
+    def result(self, i: int) -> ScoreResult:
+        """Materialise row *i* as a scalar ScoreResult."""
+        return ScoreResult(
+            buy_score=int(self.buy_score[i]),
+            sell_score=int(self.sell_score[i]),
+            direction=DIRECTION_NAMES[int(self.direction[i])],
+            triggers=self.triggers(i),
+        )
 
 
 class ScoringEngine:
@@ -24,80 +85,96 @@ class ScoringEngine:
     Evaluates indicator data and returns a ScoreResult.
 
     News sentiment and AI confirmation bonuses are passed in as integers
-    so this class stays decoupled from external APIs.
+    so this class stays decoupled from external APIs.  *weights* and
+    *cutoffs* override entries of SCORE_WEIGHTS / SCORE_CUTOFFS for this
+    engine only.
     """
 
+    # ── Indicator cut-offs ───────────────────────────────────────────────────
+    RSI_BUY:    float = SCORE_CUTOFFS["rsi_buy"]
+    RSI_SELL:   float = SCORE_CUTOFFS["rsi_sell"]
+    STOCH_BUY:  float = SCORE_CUTOFFS["stoch_buy"]
+    STOCH_SELL: float = SCORE_CUTOFFS["stoch_sell"]
+    MACD_LEVEL: float = SCORE_CUTOFFS["macd_level"]
+    ADX_TREND:  float = SCORE_CUTOFFS["adx_trend"]
+
+    def __init__(
+        self,
+        weights: dict[str, int] | None = None,
+        cutoffs: dict[str, float] | None = None,
+    ) -> None:
+        unknown = set(weights or ()) - set(SCORE_WEIGHTS) | set(cutoffs or ()) - set(SCORE_CUTOFFS)
+        if unknown:
+            raise ValueError(f"Unknown scoring parameter(s): {sorted(unknown)}")
+        self.weights = {**SCORE_WEIGHTS, **(weights or {})}
+        for name, value in (cutoffs or {}).items():
+            setattr(self, name.upper(), value)
+
     def score(
         self,
-        data: dict,
+        data: IndicatorSnapshot,
         news_bonus: int = 0,
         ai_bonus: int = 0,
         threshold: int = 65,
+        labels: bool = True,
     ) -> ScoreResult:
         """
         Parameters
         ----------
-        data        : indicator dict from IndicatorEngine.compute()
+        data        : IndicatorSnapshot from IndicatorEngine.compute()
         news_bonus  : positive = bullish, negative = bearish (−10 to +10)
         ai_bonus    : Claude AI confirmation points (0 to +20)
         threshold   : minimum score to emit a signal
+        labels      : build the trigger list (see ``triggers()`` to do it later)
 
         Returns
         -------
         ScoreResult with buy/sell scores and a human-readable trigger list.
         """
-        w = SCORE_WEIGHTS
+        w = self.weights
         buy_score = 0
         sell_score = 0
-        triggers: list[str] = []
+        up = data.price > data.ema_fast
 
         # ── Price Action (25 pts) ────────────────────────────────────────────
-        if data["price"] > data["ema_fast"]:
+        if up:
             buy_score  += w["price_action"]
-            triggers.append("PA↑")
         else:
             sell_score += w["price_action"]
-            triggers.append("PA↓")
 
         # ── RSI Extremes (20 pts) ────────────────────────────────────────────
-        if data["rsi"] < 22:
+        rsi = data.rsi
+        if rsi < self.RSI_BUY:
             buy_score  += w["rsi"]
-            triggers.append("RSI-OB")
-        elif data["rsi"] > 82:
+        elif rsi > self.RSI_SELL:
             sell_score += w["rsi"]
-            triggers.append("RSI+OS")
 
         # ── Stochastic (18 pts) ──────────────────────────────────────────────
-        if data["stoch"] < 15:
+        stoch = data.stoch
+        if stoch < self.STOCH_BUY:
             buy_score  += w["stoch_cci"]
-            triggers.append("STOCH-")
-        elif data["stoch"] > 88:
+        elif stoch > self.STOCH_SELL:
             sell_score += w["stoch_cci"]
-            triggers.append("STOCH+")
 
         # ── MACD (15 pts) ────────────────────────────────────────────────────
-        if data["macd"] > 0.0015:
+        macd = data.macd
+        if macd > self.MACD_LEVEL:
             buy_score  += w["macd"]
-            triggers.append("MACD+")
-        elif data["macd"] < -0.0015:
+        elif macd < -self.MACD_LEVEL:
             sell_score += w["macd"]
-            triggers.append("MACD-")
 
         # ── ADX Trend Strength (12 pts) ──────────────────────────────────────
-        if data["adx"] > 30:
-            if data["price"] > data["ema_fast"]:
+        if data.adx > self.ADX_TREND:
+            if up:
                 buy_score  += w["adx"]
             else:
                 sell_score += w["adx"]
-            triggers.append(f"ADX{data['adx']:.0f}")
 
         # ── News Sentiment Bonus (±10 pts) ───────────────────────────────────
         if news_bonus > 0:
             buy_score  += news_bonus
-            triggers.append(f"NEWS+{news_bonus}")
         elif news_bonus < 0:
             sell_score += abs(news_bonus)
-            triggers.append(f"NEWS{news_bonus}")
 
         # ── Claude AI Confirmation Bonus (0-20 pts) ──────────────────────────
         if ai_bonus > 0:
@@ -105,7 +182,6 @@ class ScoringEngine:
                 buy_score  += ai_bonus
             else:
                 sell_score += ai_bonus
-            triggers.append(f"AI+{ai_bonus}")
 
         # ── Determine direction ──────────────────────────────────────────────
         if buy_score >= threshold and buy_score >= sell_score:
@@ -115,9 +191,200 @@ class ScoringEngine:
         else:
             direction = "HOLD"
 
-        return ScoreResult(
-            buy_score=buy_score,
-            sell_score=sell_score,
+        if not labels:
+            return ScoreResult(buy_score, sell_score, direction)
+        return ScoreResult(buy_score, sell_score, direction,
+                           self.triggers(data, news_bonus, ai_bonus))
+
+    def with_ai(self, pre: ScoreResult, ai_bonus: int, threshold: int = 65) -> ScoreResult:
+        """
+        The final score of a pre-score (scored with ai_bonus=0): identical
+        to scoring again with *ai_bonus*, since the bonus only adds to the
+        side leading after the news bonus, but no indicator is re-read.
+        """
+        if ai_bonus <= 0:
+            return pre
+        buy_score, sell_score, direction = self._decide(
+            pre.buy_score, pre.sell_score, 0, ai_bonus, threshold
+        )
+        if not pre.triggers:
+            return ScoreResult(buy_score, sell_score, direction)
+        # labels are capped at five: the AI label only fits if there is room
+        return ScoreResult(buy_score, sell_score, direction,
+                           [*pre.triggers, f"AI+{ai_bonus}"][:5])
+
+    def triggers(self, data: IndicatorSnapshot, news_bonus: int = 0, ai_bonus: int = 0) -> list[str]:
+        """Trigger labels of ``score(data, news_bonus, ai_bonus)``, for deferred display."""
+        return self._trigger_labels(data.price, data.ema_fast, data.rsi, data.stoch,
+                                    data.macd, data.adx, news_bonus, ai_bonus)
+
+    def score_timeframes(
+        self,
+        frames: dict[str, IndicatorSnapshot],
+        news_bonus: int = 0,
+        ai_bonus: int = 0,
+        threshold: int = 65,
+        weights: dict[str, float] | None = None,
+        labels: bool = True,
+    ) -> ScoreResult:
+        """
+        Multi-timeframe ``score()``.
+
+        *frames* maps timeframe → IndicatorSnapshot, decision timeframe first
+        (MultiTimeframeEngine.frames).  The technical buy / sell points of
+        every timeframe are averaged — equally, or by *weights* per
+        timeframe — so a setup only reaches the threshold when the higher
+        timeframes agree.  Bonuses and the threshold then apply once, as in
+        ``score()``; triggers describe the decision timeframe.  A single
+        frame scores exactly like ``score()``.
+        """
+        total = buy = sell = 0.0
+        for tf, data in frames.items():
+            weight = 1.0 if weights is None else weights.get(tf, 0.0)
+            points = self.score(data, threshold=threshold, labels=False)   # indicators only
+            buy += weight * points.buy_score
+            sell += weight * points.sell_score
+            total += weight
+        if total <= 0:
+            raise ValueError("score_timeframes needs at least one weighted timeframe")
+        buy_score, sell_score, direction = self._decide(
+            round(buy / total), round(sell / total), news_bonus, ai_bonus, threshold
+        )
+        if not labels:
+            return ScoreResult(buy_score, sell_score, direction)
+        return ScoreResult(buy_score, sell_score, direction,
+                           self.triggers(next(iter(frames.values())), news_bonus, ai_bonus))
+
+    def score_batch(
+        self,
+        price: ArrayLike,
+        ema_fast: ArrayLike,
+        rsi: ArrayLike,
+        stoch: ArrayLike,
+        macd: ArrayLike,
+        adx: ArrayLike,
+        news_bonus: ArrayLike = 0,
+        ai_bonus: ArrayLike = 0,
+        threshold: int = 65,
+    ) -> BatchScoreResult:
+        """
+        Vectorised ``score()`` over N rows.
+
+        Every argument is a length-N column (or a scalar broadcast to N);
+        results are identical, row by row, to calling ``score()`` on the
+        equivalent indicator snapshots.
+
+        Returns
+        -------
+        BatchScoreResult with int64 score arrays and int8 direction codes.
+        """
+        price, ema_fast, rsi, stoch, macd, adx = (
+            np.asarray(c, dtype=np.float64)
+            for c in (price, ema_fast, rsi, stoch, macd, adx)
+        )
+        n = price.shape[0]
+        news = np.broadcast_to(np.asarray(news_bonus, dtype=np.int64), (n,))
+        ai = np.broadcast_to(np.asarray(ai_bonus, dtype=np.int64), (n,))
+        w = self.weights
+
+        up = price > ema_fast
+        buy = np.where(up, w["price_action"], 0).astype(np.int64)
+        sell = np.where(up, 0, w["price_action"]).astype(np.int64)
+
+        buy += (rsi < self.RSI_BUY) * w["rsi"]
+        sell += ((rsi > self.RSI_SELL) & ~(rsi < self.RSI_BUY)) * w["rsi"]
+
+        buy += (stoch < self.STOCH_BUY) * w["stoch_cci"]
+        sell += ((stoch > self.STOCH_SELL) & ~(stoch < self.STOCH_BUY)) * w["stoch_cci"]
+
+        buy += (macd > self.MACD_LEVEL) * w["macd"]
+        sell += (macd < -self.MACD_LEVEL) * w["macd"]
+
+        trend = adx > self.ADX_TREND
+        buy += (trend & up) * w["adx"]
+        sell += (trend & ~up) * w["adx"]
+
+        buy += np.maximum(news, 0)
+        sell += np.maximum(-news, 0)
+
+        has_ai = ai > 0
+        lead_buy = buy > sell
+        buy += np.where(has_ai & lead_buy, ai, 0)
+        sell += np.where(has_ai & ~lead_buy, ai, 0)
+
+        direction = np.full(n, HOLD, dtype=np.int8)
+        is_buy = (buy >= threshold) & (buy >= sell)
+        direction[is_buy] = BUY
+        direction[~is_buy & (sell >= threshold) & (sell > buy)] = SELL
+
+        return BatchScoreResult(
+            buy_score=buy,
+            sell_score=sell,
             direction=direction,
-            triggers=triggers[:5],
+            _inputs=(price, ema_fast, rsi, stoch, macd, adx, news, ai),
+            _scorer=self,
         )
+
+    # ── Private ───────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _decide(
+        buy_score: int, sell_score: int, news_bonus: int, ai_bonus: int, threshold: int
+    ) -> tuple[int, int, str]:
+        """The bonus and direction steps of ``score()``, which keeps them inline (hot path)."""
+        # ── News Sentiment Bonus (±10 pts) ───────────────────────────────────
+        if news_bonus > 0:
+            buy_score  += news_bonus
+        elif news_bonus < 0:
+            sell_score += abs(news_bonus)
+
+        # ── Claude AI Confirmation Bonus (0-20 pts) ──────────────────────────
+        if ai_bonus > 0:
+            if buy_score > sell_score:
+                buy_score  += ai_bonus
+            else:
+                sell_score += ai_bonus
+
+        # ── Determine direction ──────────────────────────────────────────────
+        if buy_score >= threshold and buy_score >= sell_score:
+            direction = "BUY"
+        elif sell_score >= threshold and sell_score > buy_score:
+            direction = "SELL"
+        else:
+            direction = "HOLD"
+        return buy_score, sell_score, direction
+
+    def _trigger_labels(
+        self,
+        price: float,
+        ema_fast: float,
+        rsi: float,
+        stoch: float,
+        macd: float,
+        adx: float,
+        news_bonus: int,
+        ai_bonus: int,
+    ) -> list[str]:
+        """Human-readable trigger list (first five) shared by both paths."""
+        triggers = ["PA↑" if price > ema_fast else "PA↓"]
+        if rsi < self.RSI_BUY:
+            triggers.append("RSI-OB")
+        elif rsi > self.RSI_SELL:
+            triggers.append("RSI+OS")
+        if stoch < self.STOCH_BUY:
+            triggers.append("STOCH-")
+        elif stoch > self.STOCH_SELL:
+            triggers.append("STOCH+")
+        if macd > self.MACD_LEVEL:
+            triggers.append("MACD+")
+        elif macd < -self.MACD_LEVEL:
+            triggers.append("MACD-")
+        if adx > self.ADX_TREND:
+            triggers.append(f"ADX{adx:.0f}")
+        if news_bonus > 0:
+            triggers.append(f"NEWS+{news_bonus}")
+        elif news_bonus < 0:
+            triggers.append(f"NEWS{news_bonus}")
+        if ai_bonus > 0:
+            triggers.append(f"AI+{ai_bonus}")
+        return triggers[:5]
@@ -6,6 +6,7 @@ Version : 3.2.0
 Purpose : Centralised configuration — currency pairs, thresholds, API endpoints
 """
 
+import json
 import os
 from dotenv import load_dotenv
 
@@ -14,6 +15,7 @@ load_dotenv()
 
 # ── API Keys ──────────────────────────────────────────────────────────────────
 ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY", "")
+ANTHROPIC_BASE_URL: str = os.getenv("ANTHROPIC_BASE_URL", "")   # e.g. a local stub
 NEWS_API_KEY: str = os.getenv("NEWS_API_KEY", "")
 ALPHA_VANTAGE_KEY: str = os.getenv("ALPHA_VANTAGE_KEY", "")
 
@@ -39,6 +41,21 @@ PAIR_KEYWORDS: dict[str, list[str]] = {
     "EURGBP": ["EUR", "euro", "ECB", "GBP", "pound", "sterling"],
 }
 
+# Larger universes: PAIRS_FILE names a JSON file that replaces both tables above,
+#   {"EURUSD": {"price": 1.085, "keywords": ["EUR", "ECB"]}, "XAUUSD": {"price": 2350.0}, ...}
+# Without "keywords", a six-letter symbol matches its two currency codes.
+PAIRS_FILE: str = os.getenv("PAIRS_FILE", "")
+if PAIRS_FILE:
+    with open(PAIRS_FILE, encoding="utf-8") as _f:
+        _universe: dict[str, dict] = json.load(_f)
+    PAIRS = {symbol: float(spec["price"]) for symbol, spec in _universe.items()}
+    PAIR_KEYWORDS = {
+        symbol: list(spec.get("keywords") or (
+            [symbol[:3], symbol[3:]] if len(symbol) == 6 and symbol.isalpha() else []
+        ))
+        for symbol, spec in _universe.items()
+    }
+
 # ── Scoring & Signal Settings ─────────────────────────────────────────────────
 SIGNAL_THRESHOLD: int = int(os.getenv("SIGNAL_THRESHOLD", 65))
 MAX_SCORE: int = 120
@@ -54,18 +71,142 @@ SCORE_WEIGHTS: dict[str, int] = {
     "ai_confirm":   20,   # Claude AI confirmation bonus (new)
 }
 
+# Indicator cut-offs used by ScoringEngine (tune with `main.py optimize`)
+SCORE_CUTOFFS: dict[str, float] = {
+    "rsi_buy":    22,       # RSI below → buy points
+    "rsi_sell":   82,       # RSI above → sell points
+    "stoch_buy":  15,
+    "stoch_sell": 88,
+    "macd_level": 0.0015,   # |MACD| beyond → momentum points
+    "adx_trend":  30,       # ADX above → trend points
+}
+
+# ── Indicator Periods ─────────────────────────────────────────────────────────
+RSI_PERIOD: int = 14
+STOCH_PERIOD: int = 14
+CCI_PERIOD: int = 20
+MACD_FAST: int = 12
+MACD_SLOW: int = 26
+EMA_FAST: int = 9
+EMA_SLOW: int = 21
+ADX_PERIOD: int = 14
+ATR_PERIOD: int = 14
+BB_PERIOD: int = 20
+MOMENTUM_PERIOD: int = 10
+VWAP_PERIOD: int = 20
+VOLUME_PERIOD: int = 20
+INDICATOR_WARMUP_BARS: int = 60   # bars before indicators are trusted (seeded in demo mode)
+
+# ── Trade Levels ──────────────────────────────────────────────────────────────
+TP_ATR_MULTIPLIER: float = 1.2   # take-profit distance in ATRs
+SL_ATR_MULTIPLIER: float = 0.8   # stop-loss distance in ATRs
+
 # ── Cycle Settings ────────────────────────────────────────────────────────────
 CYCLE_SECONDS: int = int(os.getenv("CYCLE_SECONDS", 45))
 PAIR_DELAY: float = 0.6          # seconds between pair scans
 NEWS_REFRESH_CYCLES: int = 3     # refresh news every N cycles
 
+# ── Terminal Output ───────────────────────────────────────────────────────────
+DISPLAY_MODE: str = os.getenv("DISPLAY_MODE", "print")      # "print" (scrolling), "dashboard" or "headless"
+DASHBOARD_FPS: float = float(os.getenv("DASHBOARD_FPS", 10))   # max redraws per second
+DASHBOARD_ALERT_ROWS: int = 8                                 # recent signals kept on screen
+JOURNAL_PATH: str = os.getenv("JOURNAL_PATH", "logs/signals.jsonl")          # headless record journal
+JOURNAL_FSYNC_SECONDS: float = float(os.getenv("JOURNAL_FSYNC_SECONDS", 1.0))  # 0 = fsync every batch
+
+# ── Sharded Scan (main.py --shards) ───────────────────────────────────────────
+SHARD_WORKERS: int = int(os.getenv("SHARD_WORKERS", os.cpu_count() or 1))   # worker processes
+
+# ── Correlation (core/correlation.py) ─────────────────────────────────────────
+# Of a cluster of highly correlated candidates only the strongest goes to
+# Claude and alerts; correlation of per-bar log returns over a rolling window
+CORRELATION_DEDUP: bool = os.getenv("CORRELATION_DEDUP", "1") == "1"
+CORRELATION_WINDOW: int = int(os.getenv("CORRELATION_WINDOW", 100))        # bars
+CORRELATION_MIN_BARS: int = 20           # no clustering before this many bars
+CORRELATION_THRESHOLD: float = float(os.getenv("CORRELATION_THRESHOLD", 0.8))   # signed ρ
+
+# ── Event Scheduler (main.py --events) ────────────────────────────────────────
+SCHEDULER_TICK_SECONDS: float = float(os.getenv("SCHEDULER_TICK_SECONDS", 1.0))  # mean bar interval per pair (demo feed)
+SCHEDULER_AI_SECONDS: float = 0.25                                # AI job: finalise answered candidates
+SCHEDULER_NEWS_SECONDS: float = CYCLE_SECONDS * NEWS_REFRESH_CYCLES
+SCHEDULER_STATUS_SECONDS: float = CYCLE_SECONDS                   # status + latency report
+SCHEDULER_SWEEP_SECONDS: float = float(os.getenv("SCHEDULER_SWEEP_SECONDS", 0))  # 0 = no sweeps
+PRICE_FEED_URL: str = os.getenv("PRICE_FEED_URL", "")    # e.g. tcp://127.0.0.1:9100; "" = simulated
+# Bar sizes aggregated from feed ticks (core/timeframes.py), e.g. "1s,1m,5m,15m"; the
+# first one is the decision timeframe.  "" = score every feed bar on its own.
+TIMEFRAMES: str = os.getenv("TIMEFRAMES", "")
+
+# ── Metrics (utils/metrics.py) ────────────────────────────────────────────────
+METRICS_HOST: str = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT: int = int(os.getenv("METRICS_PORT", 0))      # Prometheus /metrics; 0 = disabled
+METRICS_LOG_SECONDS: float = float(os.getenv("METRICS_LOG_SECONDS", 300))   # log summary interval
+
 # ── News API ──────────────────────────────────────────────────────────────────
-NEWS_API_URL: str = "https://newsapi.org/v2/everything"
+NEWS_API_URL: str = os.getenv("NEWS_API_URL", "https://newsapi.org/v2/everything")
 NEWS_QUERY: str = "forex OR currency OR EUR OR USD OR GBP OR JPY OR AUD OR CAD"
 NEWS_LANGUAGE: str = "en"
 NEWS_PAGE_SIZE: int = 10
+NEWS_HEADLINE_LIMIT: int = 50          # cached headlines handed to the sentiment scorer
+NEWS_CACHE_PATH: str = os.getenv("NEWS_CACHE_PATH", "data/news_cache.sqlite3")
+NEWS_DAILY_QUOTA: int = int(os.getenv("NEWS_DAILY_QUOTA", 100))   # free tier
+NEWS_SESSION_START_HOUR: int = int(os.getenv("NEWS_SESSION_START_HOUR", 0))   # UTC
+NEWS_SESSION_END_HOUR: int = int(os.getenv("NEWS_SESSION_END_HOUR", 24))      # UTC, exclusive
 
 # ── Claude AI ─────────────────────────────────────────────────────────────────
 AI_MODEL: str = "claude-sonnet-4-5-20250929"
-AI_MAX_TOKENS: int = 400
+AI_MAX_TOKENS: int = 160        # reply allowance per pair; replies also end at a stop sequence
 AI_TEMPERATURE: float = 0.2     # low temperature = deterministic analysis
+AI_GATE_MARGIN: int = 15        # call Claude when pre-score ≥ threshold − margin
+AI_MAX_CONCURRENCY: int = int(os.getenv("AI_MAX_CONCURRENCY", 4))   # Claude requests in flight
+AI_BATCH_MODE: bool = os.getenv("AI_BATCH_MODE", "1") == "1"   # several pairs per Claude call
+AI_BATCH_MAX_TOKENS: int = 4096                                # also caps pairs per call (÷ AI_MAX_TOKENS)
+AI_COMPACT_PROMPT: bool = os.getenv("AI_COMPACT_PROMPT", "1") == "1"   # one table row per pair
+AI_PROMPT_CACHE: bool = os.getenv("AI_PROMPT_CACHE", "1") == "1"       # cache the static prompt prefix
+
+# Confirmation scheduler (apis/ai_scheduler.py): best candidates first, within the
+# account's rate limits; a candidate not answered in time gets no AI bonus
+AI_REQUESTS_PER_MINUTE: int = int(os.getenv("AI_REQUESTS_PER_MINUTE", 50))
+AI_TOKENS_PER_MINUTE: int = int(os.getenv("AI_TOKENS_PER_MINUTE", 40_000))   # input + output
+AI_DEADLINE_SECONDS: float = float(os.getenv("AI_DEADLINE_SECONDS", 10))     # then dropped
+AI_STALENESS_PENALTY: float = 2.0    # rank points a candidate loses per second of waiting
+
+# Speculative prefetch: ask Claude early for a pair whose pre-score is trending
+# toward the AI gate; the answer is reused when the real state matches
+AI_SPECULATIVE: bool = os.getenv("AI_SPECULATIVE", "0") == "1"
+AI_SPECULATE_BARS: int = 3           # pre-scores in the trend window (≥ 2)
+
+# Confirmation cache: near-identical setups reuse one Claude answer
+AI_CACHE_SIZE: int = int(os.getenv("AI_CACHE_SIZE", 512))    # entries; 0 disables
+AI_CACHE_TTL: float = float(os.getenv("AI_CACHE_TTL", 300))  # seconds
+AI_CACHE_BUCKETS: dict[str, float] = {
+    "rsi":   5.0,       # RSI points per bucket
+    "stoch": 5.0,
+    "cci":   25.0,
+    "macd":  0.0005,    # magnitude step; the sign is always kept
+    "adx":   5.0,
+}
+
+# ── Bar Store ─────────────────────────────────────────────────────────────────
+BAR_STORE_DIR: str = os.getenv("BAR_STORE_DIR", "")   # empty = do not persist bars
+
+# ── Warm-State Snapshot (core/snapshot.py) ────────────────────────────────────
+SNAPSHOT_PATH: str = os.getenv("SNAPSHOT_PATH", "")       # empty = no snapshots, e.g. data/warm_state.bin
+SNAPSHOT_SECONDS: float = float(os.getenv("SNAPSHOT_SECONDS", 60))        # interval between writes
+
+# ── Backtest ──────────────────────────────────────────────────────────────────
+BACKTEST_WORKERS: int = int(os.getenv("BACKTEST_WORKERS", os.cpu_count() or 1))
+
+# ── Optimizer (main.py optimize) ──────────────────────────────────────────────
+# Candidate values per parameter: SCORE_WEIGHTS / SCORE_CUTOFFS keys or "threshold".
+# Grid search tries every combination; random search samples within each list's range.
+OPTIMIZER_SPACE: dict[str, list[float]] = {
+    "threshold":    [55, 60, 65, 70, 75],
+    "price_action": [15, 20, 25, 30],
+    "rsi":          [10, 15, 20, 25],
+    "stoch_cci":    [10, 14, 18, 22],
+    "macd":         [10, 15, 20],
+    "adx":          [8, 12, 16],
+    "rsi_buy":      [20, 25, 30],
+    "rsi_sell":     [70, 75, 80],
+}
+OPTIMIZER_SAMPLES: int = 2000           # random search candidates
+OPTIMIZER_CHUNK: int = 64               # candidates per process-pool task
@@ -0,0 +1,203 @@
+"""
+ultra_elite_scalping/core/shards.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Sharded scanning of large pair universes across processes.
+
+The pair universe is split into contiguous shards, one per worker
+process.  Each worker owns the IndicatorEngine and ScoringEngine state of
+its shard and, per cycle, returns indicators and the pre-score (without
+AI bonus) of every pair it owns as one IndicatorTable plus score columns
+— flat buffers rather than per-pair objects.  Everything that must be shared stays in
+the coordinator (UltraEliteBot.run_sharded): the news headline index —
+workers only receive each pair's sentiment bonus after a refresh — the
+Claude confirmation queue, display and journaling.  Warm indicator state
+goes in with the pool (``states``) and comes back out with ``export()``,
+so warm-state snapshots work the same as in the single-process modes.
+
+Usage
+-----
+    python main.py --shards 8
+    PAIRS_FILE=config/pairs.json python main.py --shards 8 --headless
+"""
+
+import logging
+import multiprocessing as mp
+import signal
+import time
+from array import array
+from multiprocessing.connection import Connection, wait
+from typing import NamedTuple
+
+from config.settings import SIGNAL_THRESHOLD, SHARD_WORKERS, BAR_STORE_DIR
+from core.bar_store import BarStore
+from core.indicators import IndicatorEngine, IndicatorSnapshot, IndicatorTable
+from core.scoring import ScoringEngine, ScoreResult, DIRECTION_NAMES, BUY, SELL, HOLD
+
+logger = logging.getLogger(__name__)
+
+_CODES = {"BUY": BUY, "SELL": SELL, "HOLD": HOLD}
+
+
+class PairScan(NamedTuple):
+    """One pair's result of a shard scan; *pre* carries no trigger labels."""
+    symbol:     str
+    data:       IndicatorSnapshot
+    news_bonus: int
+    pre:        ScoreResult
+    high:       float            # range of the scanned bar (paper-trading fills)
+    low:        float
+
+
+class ShardPool:
+    """
+    Worker processes that each scan one shard of *prices*.
+
+    ``scan()`` asks every shard for one bar per pair and returns the
+    results in universe order; shards run in parallel, so a cycle costs
+    about one shard's work plus the transfer of the results.
+    """
+
+    def __init__(
+        self,
+        prices: dict[str, float],
+        workers: int = SHARD_WORKERS,
+        threshold: int = SIGNAL_THRESHOLD,
+        states: dict[str, tuple[int, bytes]] | None = None,
+    ) -> None:
+        states = states or {}
+        symbols = list(prices)
+        workers = max(1, min(workers, len(symbols)))
+        bounds = [len(symbols) * i // workers for i in range(workers + 1)]
+        self.shards: list[list[str]] = [symbols[a:b] for a, b in zip(bounds, bounds[1:])]
+
+        # spawn: the parent may already run renderer / journal threads
+        ctx = mp.get_context("spawn")
+        self._conns: list[Connection] = []
+        self._procs: list[mp.Process] = []
+        for i, shard in enumerate(self.shards):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(
+                target=_shard_main, name=f"shard-{i}", daemon=True,
+                args=(child, {s: prices[s] for s in shard}, threshold,
+                      {s: states[s] for s in shard if s in states}),
+            )
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+        self._news: dict[str, int] = {}
+        logger.info("Sharded scan: %d pairs over %d workers", len(symbols), workers)
+
+    def __enter__(self) -> "ShardPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def set_news(self, news: dict[str, tuple[int, str]]) -> None:
+        """Hand every shard the sentiment bonus of its own pairs; *news* maps pair → (bonus, headline)."""
+        self._news = {s: bonus for s, (bonus, _) in news.items()}
+        for conn, shard in zip(self._conns, self.shards):
+            conn.send(("news", {s: self._news[s] for s in shard if s in self._news}))
+
+    def scan(self) -> list[PairScan]:
+        """One bar for every pair of every shard, in universe order."""
+        for conn in self._conns:
+            conn.send(("scan", None))
+        results: dict[Connection, tuple] = {}
+        pending = list(self._conns)
+        while pending:
+            for conn in wait(pending):
+                results[conn] = conn.recv()
+                pending.remove(conn)
+        scans: list[PairScan] = []
+        for conn, shard in zip(self._conns, self.shards):
+            table, buy, sell, direction, high, low = results[conn]
+            for i, symbol in enumerate(shard):
+                pre = ScoreResult(buy[i], sell[i], DIRECTION_NAMES[direction[i]])
+                scans.append(PairScan(symbol, table.row(i), self._news.get(symbol, 0), pre,
+                                      high[i], low[i]))
+        return scans
+
+    def export(self) -> dict[str, tuple[int, bytes]]:
+        """Every shard's indicator state: pair → (last bar ns, export_state bytes)."""
+        for conn in self._conns:
+            conn.send(("export", None))
+        states: dict[str, tuple[int, bytes]] = {}
+        for conn in self._conns:
+            states.update(conn.recv())
+        return states
+
+    def close(self) -> None:
+        for conn in self._conns:
+            try:
+                conn.send(("stop", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self._conns:
+            conn.close()
+        self._conns, self._procs = [], []
+
+
+# ── Private ───────────────────────────────────────────────────────────────────
+
+def _shard_main(
+    conn: Connection,
+    prices: dict[str, float],
+    threshold: int,
+    states: dict[str, tuple[int, bytes]],
+) -> None:
+    """Worker loop: own indicator / scoring state for the pairs in *prices*."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)     # Ctrl+C is handled by the coordinator
+    indicators = IndicatorEngine()
+    last_ns: dict[str, int] = {}
+    for symbol, (ns, blob) in states.items():
+        indicators.import_state(symbol, blob)
+        prices[symbol] = indicators.last_bar(symbol)[3]
+        last_ns[symbol] = ns
+    scorer = ScoringEngine()
+    # Each pair has its own directory in the store, so shards never collide
+    store = BarStore(BAR_STORE_DIR) if BAR_STORE_DIR else None
+    news: dict[str, int] = {}
+    # Result buffers, refilled by every scan: indicators, pre-scores and bar range per row
+    table = IndicatorTable(len(prices))
+    buy = array("i", bytes(4 * len(prices)))
+    sell = array("i", bytes(4 * len(prices)))
+    direction = array("b", bytes(len(prices)))
+    high = array("d", bytes(8 * len(prices)))
+    low = array("d", bytes(8 * len(prices)))
+    try:
+        while True:
+            command, payload = conn.recv()
+            if command == "scan":
+                for row, symbol in enumerate(prices):
+                    data = indicators.compute(symbol, prices)
+                    last_ns[symbol] = time.time_ns()
+                    bar = indicators.last_bar(symbol)
+                    if store is not None:
+                        store.record(symbol, last_ns[symbol], *bar)
+                    high[row], low[row] = bar[1], bar[2]
+                    pre = scorer.score(data, news_bonus=news.get(symbol, 0), ai_bonus=0,
+                                       threshold=threshold, labels=False)
+                    table.put(row, data)
+                    buy[row] = pre.buy_score
+                    sell[row] = pre.sell_score
+                    direction[row] = _CODES[pre.direction]
+                conn.send((table, buy, sell, direction, high, low))
+            elif command == "news":
+                news = payload
+            elif command == "export":
+                conn.send({s: (last_ns[s], indicators.export_state(s)) for s in last_ns})
+            else:
+                break
+    except EOFError:
+        pass
+    finally:
+        if store is not None:
+            store.close()
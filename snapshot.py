@@ -0,0 +1,104 @@
+"""
+ultra_elite_scalping/core/snapshot.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Warm-state snapshots, so a restart resumes with valid indicators
+          instead of INDICATOR_WARMUP_BARS of blind time.
+
+Layout
+------
+    header   magic, version, indicator-period fingerprint, created_ns,
+             signals, wins, max_score, news_cycle_counter, pair count
+    per pair symbol length + UTF-8 symbol, last bar timestamp (ns),
+             state length + IndicatorEngine.export_state() bytes
+    trailer  CRC-32 of everything above
+
+All integers are little-endian.  A snapshot is written to a temporary file
+and renamed over the previous one, so a crash mid-write leaves the last
+complete snapshot in place.  Headlines are not included: they already
+persist in the news cache (apis/news_cache.py).
+"""
+
+import logging
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass, field
+
+from core.indicators import STATE_FINGERPRINT
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"UEWS"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHxxIqqqqqI")   # magic, version, fingerprint, created_ns, 4 counters, pairs
+_PAIR = struct.Struct("<HqI")              # symbol bytes, last bar ns, state bytes
+_CRC = struct.Struct("<I")
+
+COUNTERS = ("signals", "wins", "max_score", "news_cycle_counter")
+
+
+@dataclass
+class Snapshot:
+    counters:   dict[str, int]
+    pairs:      dict[str, tuple[int, bytes]]       # symbol → (last bar ns, state)
+    created_ns: int = field(default_factory=time.time_ns)
+
+
+def write_snapshot(path: str, snapshot: Snapshot) -> int:
+    """Atomically replace *path* with *snapshot*; returns the file size."""
+    parts = [_HEADER.pack(
+        _MAGIC, _VERSION, STATE_FINGERPRINT, snapshot.created_ns,
+        *(snapshot.counters.get(name, 0) for name in COUNTERS), len(snapshot.pairs),
+    )]
+    for symbol, (last_ns, state) in snapshot.pairs.items():
+        name = symbol.encode()
+        parts += (_PAIR.pack(len(name), last_ns, len(state)), name, state)
+    body = b"".join(parts)
+    body += _CRC.pack(zlib.crc32(body))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(body)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+    return len(body)
+
+
+def read_snapshot(path: str) -> Snapshot | None:
+    """
+    The snapshot at *path*, or None when there is none or it cannot be
+    used (corrupt, other format version, other indicator periods).
+    """
+    try:
+        with open(path, "rb") as fh:
+            raw = fh.read()
+    except FileNotFoundError:
+        return None
+    if len(raw) < _HEADER.size + _CRC.size:
+        logger.warning("Snapshot %s is truncated — starting cold", path)
+        return None
+    body, (crc,) = raw[:-_CRC.size], _CRC.unpack_from(raw, len(raw) - _CRC.size)
+    magic, version, fingerprint, created_ns, *values = _HEADER.unpack_from(body)
+    count = values.pop()
+    if magic != _MAGIC or version != _VERSION or zlib.crc32(body) != crc:
+        logger.warning("Snapshot %s is corrupt or from another version — starting cold", path)
+        return None
+    if fingerprint != STATE_FINGERPRINT:
+        logger.warning("Snapshot %s was taken with other indicator periods — starting cold", path)
+        return None
+
+    pairs: dict[str, tuple[int, bytes]] = {}
+    pos = _HEADER.size
+    for _ in range(count):
+        name_len, last_ns, state_len = _PAIR.unpack_from(body, pos)
+        pos += _PAIR.size
+        symbol = body[pos:pos + name_len].decode()
+        pos += name_len
+        pairs[symbol] = (last_ns, body[pos:pos + state_len])
+        pos += state_len
+    return Snapshot(dict(zip(COUNTERS, values)), pairs, created_ns)
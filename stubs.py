@@ -0,0 +1,372 @@
+"""
+ultra_elite_scalping/utils/stubs.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Local stand-ins for the external HTTP APIs and the price feed so
+          the bot, benchmarks and manual experiments can run without
+          network access, keys or a broker connection.
+
+Usage
+-----
+    with FakeAnthropicServer() as fake:
+        client = AIAnalysisClient("test-key", base_url=fake.url)
+        client.confirm_batch(requests)
+        print(len(fake.requests))
+
+    with FakeAnthropicServer(requests_per_minute=30, retry_after=2.0) as fake:
+        ...                                  # calls beyond 30/min get HTTP 429
+        print(fake.rejected)
+
+    with FakeAnthropicServer(prefill=20e-6) as fake:
+        ...                                  # 20 µs per uncached prompt token
+        print(client.usage_stats())
+
+    with FakeNewsAPIServer(daily_quota=100) as fake:
+        fake.publish("ECB signals rate hike as euro rallies")
+        client = NewsAPIClient("test-key", url=fake.url + "/v2/everything")
+        client.fetch_headlines()
+
+    with ReplayServer(load_csv("bars.csv"), speed=100) as replay:
+        asyncio.run(bot.run_events(TCPFeed.from_url(replay.url)))
+"""
+
+import json
+import re
+import socketserver
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from core.feed import encode_bar
+
+_PAIR_LINE = re.compile(r"^\s*PAIR:\s*(\S+)", re.MULTILINE)   # batch prompts only
+_TABLE_ROW = re.compile(r"^(\w+)\|(?:BUY|SELL|HOLD)\|", re.MULTILINE)   # compact prompts
+
+
+def default_claude_reply(body: dict) -> str:
+    """Deterministic SCORE / ANALYSIS answer for every pair (or table row) in the prompt."""
+    prompt = body["messages"][-1]["content"]
+    if isinstance(prompt, list):
+        prompt = "".join(block.get("text", "") for block in prompt)
+    rows = _TABLE_ROW.findall(prompt)
+    symbols = _PAIR_LINE.findall(prompt) or rows
+    if not symbols:
+        return "SCORE: 12\nANALYSIS: Stub confirmation of the technical bias."
+    return "\n\n".join(
+        f"PAIR: {s}\nSCORE: 12\nANALYSIS: Stub confirmation of the {s} bias."
+        for s in symbols
+    ) + ("\nEND" if rows else "")   # the compact prompt asks for a closing END line
+
+
+class _StubServer:
+    """Threaded HTTP (or raw TCP) server on an ephemeral localhost port."""
+
+    def __init__(
+        self,
+        handler: type[socketserver.BaseRequestHandler],
+        host: str,
+        port: int,
+        server_cls: type[socketserver.TCPServer] = ThreadingHTTPServer,
+    ) -> None:
+        self._httpd = server_cls((host, port), handler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self          # reachable from handlers
+        self._thread: threading.Thread | None = None
+        self.requests: list[dict] = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "_StubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: dict | None = None) -> None:
+        raw = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+class _AnthropicHandler(_QuietHandler):
+    def do_POST(self) -> None:
+        stub: FakeAnthropicServer = self.server.stub
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        with stub.lock:
+            limited = stub.over_limit()
+            if limited:
+                stub.rejected += 1
+            else:
+                stub.requests.append(body)
+        if limited:
+            self._send_json(429, {
+                "type": "error",
+                "error": {"type": "rate_limit_error",
+                          "message": "Number of requests has exceeded your rate limit."},
+            }, headers={"retry-after": f"{stub.retry_after:g}"} if stub.retry_after is not None else None)
+            return
+        # ~4 characters per token; a cache_control block caches the prefix up to it
+        system = body.get("system", "")
+        blocks = [{"text": system}] if isinstance(system, str) else system
+        prefix, cached, cache_read, cache_write = "", 0, 0, 0
+        for block in blocks:
+            prefix += block.get("text", "")
+            if "cache_control" in block:
+                cached = len(prefix)
+        if cached:
+            with stub.lock:
+                hit = prefix[:cached] in stub.prompt_cache
+                stub.prompt_cache.add(prefix[:cached])
+            cache_read, cache_write = (cached // 4, 0) if hit else (0, cached // 4)
+        input_tokens = (len(prefix) - cached + len(json.dumps(body["messages"]))) // 4
+        delay = stub.latency + stub.prefill * (input_tokens + cache_write)
+        if delay:
+            time.sleep(delay)
+        text = stub.responder(body)
+        stop_reason, stop_sequence = "end_turn", None
+        for stop in body.get("stop_sequences", ()):
+            if stop in text:
+                text, stop_reason, stop_sequence = text.split(stop, 1)[0], "stop_sequence", stop
+                break
+        self._send_json(200, {
+            "id": f"msg_stub_{len(stub.requests)}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "stub"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": stop_reason,
+            "stop_sequence": stop_sequence,
+            "usage": {"input_tokens": input_tokens, "output_tokens": len(text) // 4,
+                      "cache_read_input_tokens": cache_read,
+                      "cache_creation_input_tokens": cache_write},
+        })
+
+
+class FakeAnthropicServer(_StubServer):
+    """
+    Minimal Anthropic Messages API (``POST /v1/messages``).
+
+    *responder* maps the request body to the reply text; every answered
+    request body is recorded in ``requests``.  *latency* adds a fixed delay
+    per call, *prefill* a further delay per uncached prompt token (a
+    stand-in for time to first token).  With *requests_per_minute*, calls
+    beyond that many in any 60-second window get HTTP 429 (with a
+    ``retry-after`` header unless *retry_after* is None) and are counted in
+    ``rejected``.  System blocks marked with ``cache_control`` are cached
+    like the API does, whatever their length, and reported as cache writes
+    then reads in ``usage``; ``stop_sequences`` cut the reply.
+    """
+
+    def __init__(
+        self,
+        responder: Callable[[dict], str] = default_claude_reply,
+        latency: float = 0.0,
+        prefill: float = 0.0,
+        requests_per_minute: int | None = None,
+        retry_after: float | None = 1.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        super().__init__(_AnthropicHandler, host, port)
+        self.responder = responder
+        self.latency = latency
+        self.prefill = prefill
+        self.prompt_cache: set[str] = set()
+        self.requests_per_minute = requests_per_minute
+        self.retry_after = retry_after
+        self.rejected = 0
+        self._accepted: deque[float] = deque()
+
+    def over_limit(self) -> bool:
+        """Whether one more call now exceeds the limit (caller holds ``lock``)."""
+        if self.requests_per_minute is None:
+            return False
+        now = time.monotonic()
+        while self._accepted and now - self._accepted[0] >= 60:
+            self._accepted.popleft()
+        if len(self._accepted) >= self.requests_per_minute:
+            return True
+        self._accepted.append(now)
+        return False
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class _NewsAPIHandler(_QuietHandler):
+    def do_GET(self) -> None:
+        stub: FakeNewsAPIServer = self.server.stub
+        parts = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        with stub.lock:
+            stub.requests.append(params)
+            over_quota = stub.daily_quota is not None and len(stub.requests) > stub.daily_quota
+            articles = [a for a in stub.articles if a["publishedAt"] >= params.get("from", "")]
+        if parts.path != "/v2/everything":
+            self._send_json(404, {"status": "error", "code": "notFound"})
+        elif not params.get("apiKey"):
+            self._send_json(401, {"status": "error", "code": "apiKeyMissing"})
+        elif over_quota:
+            self._send_json(429, {"status": "error", "code": "rateLimited",
+                                  "message": "You have made too many requests."})
+        else:
+            articles.sort(key=lambda a: a["publishedAt"], reverse=True)
+            page = articles[: int(params.get("pageSize", 100))]
+            self._send_json(200, {"status": "ok", "totalResults": len(articles), "articles": page})
+
+
+class FakeNewsAPIServer(_StubServer):
+    """
+    Minimal NewsAPI ``GET /v2/everything``.
+
+    Serves ``articles`` newest first, honouring ``from`` and ``pageSize``;
+    ``publish()`` adds a fresh article.  Every query is recorded in
+    ``requests``, and calls beyond *daily_quota* get HTTP 429.
+    """
+
+    def __init__(
+        self,
+        articles: list[dict] | None = None,
+        daily_quota: int | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        super().__init__(_NewsAPIHandler, host, port)
+        self.articles: list[dict] = list(articles or [])
+        self.daily_quota = daily_quota
+
+    def publish(self, title: str, description: str = "", published_at: float | None = None) -> dict:
+        published = _iso(time.time() if published_at is None else published_at)
+        with self.lock:
+            article = {
+                "source":      {"id": None, "name": "Stub Wire"},
+                "title":       title,
+                "description": description,
+                "url":         f"https://news.stub/{len(self.articles) + 1}",
+                "publishedAt": published,
+            }
+            self.articles.append(article)
+        return article
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class _ReplayHandler(socketserver.StreamRequestHandler):
+    wbufsize = 1 << 16
+
+    def handle(self) -> None:
+        stub: ReplayServer = self.server.stub
+        with stub.lock:
+            stub.requests.append({"client": self.client_address})
+        try:
+            stub.replay(self.wfile)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class ReplayServer(_StubServer):
+    """
+    Streams recorded bars over TCP in the core/feed.py wire format, in
+    timestamp order across pairs, to every client that connects.
+
+    *bars* is ``{symbol: columns}`` as returned by core.backtest.load_csv()
+    or BarStore.read().  *speed* is the multiple of real time (0 = as fast
+    as possible); *repeat* replays the data that many times, shifting the
+    timestamps so they keep increasing.  ``url`` is ``tcp://host:port``.
+    """
+
+    def __init__(
+        self,
+        bars: dict[str, dict[str, np.ndarray]],
+        speed: float = 1.0,
+        repeat: int = 1,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        super().__init__(_ReplayHandler, host, port, server_cls=_ThreadingTCPServer)
+        self.speed = speed
+        self.repeat = repeat
+        # one timestamp-ordered table across all pairs
+        self._names = list(bars)
+        cols = ("timestamp", "open", "high", "low", "close", "volume")
+        merged = {c: np.concatenate([np.asarray(bars[s][c]) for s in self._names]) for c in cols}
+        pair_ids = np.repeat(np.arange(len(self._names)), [len(bars[s]["timestamp"]) for s in self._names])
+        order = np.argsort(merged["timestamp"], kind="stable")
+        self._columns = {c: v[order] for c, v in merged.items()}
+        self._pair_ids = pair_ids[order]
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"tcp://{host}:{port}"
+
+    def replay(self, out, chunk: int = 512, tick: float = 0.001) -> None:
+        """Write every bar to *out*; paced in *tick*-second slices unless speed is 0."""
+        ts = self._columns["timestamp"]
+        if ts.size == 0:
+            return
+        span = int(ts[-1] - ts[0]) + 1
+        offsets = (ts - ts[0]) / 1e9 / self.speed if self.speed > 0 else None
+        rows = list(zip(
+            (self._names[i] for i in self._pair_ids.tolist()),
+            ts.tolist(),
+            self._columns["open"].tolist(), self._columns["high"].tolist(),
+            self._columns["low"].tolist(), self._columns["close"].tolist(),
+            self._columns["volume"].tolist(),
+        ))
+        started = time.perf_counter()
+        for lap in range(self.repeat):
+            shift = lap * span
+            lap_start = started + lap * span / 1e9 / self.speed if offsets is not None else 0.0
+            i = 0
+            while i < len(rows):
+                if offsets is None:
+                    j = min(i + chunk, len(rows))
+                else:
+                    # everything due by now, at least one bar
+                    elapsed = time.perf_counter() - lap_start
+                    j = max(i + 1, int(np.searchsorted(offsets, elapsed, side="right")))
+                    if offsets[i] > elapsed:
+                        time.sleep(min(offsets[i] - elapsed, 1.0))
+                        continue
+                out.write(b"".join(
+                    encode_bar(sym, t + shift, o, h, l, c, v) for sym, t, o, h, l, c, v in rows[i:j]
+                ))
+                out.flush()
+                i = j
+                if offsets is not None:
+                    time.sleep(tick)
@@ -0,0 +1,26 @@
+"""
+ultra_elite_scalping/tests/conftest.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Shared pytest fixtures; puts the project root on sys.path.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.indicators import IndicatorEngine, IndicatorSnapshot  # noqa: E402
+
+
+@pytest.fixture
+def snapshots() -> dict[str, IndicatorSnapshot]:
+    """Warm indicator snapshots of ten demo pairs, reproducible per test."""
+    random.seed(7)
+    engine = IndicatorEngine()
+    prices = {f"P{i:02d}USD": 1.0 + i / 100 for i in range(10, 20)}
+    return {symbol: engine.compute(symbol, prices) for symbol in prices}
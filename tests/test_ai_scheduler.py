@@ -0,0 +1,152 @@
+"""
+ultra_elite_scalping/tests/test_ai_scheduler.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : ConfirmationScheduler against FakeAnthropicServer: priority order,
+          429 handling and deadlines.
+"""
+
+import time
+
+import pytest
+
+from apis.ai_api import AIAnalysisClient, ConfirmRequest
+from apis.ai_cache import ConfirmationCache
+from apis.ai_scheduler import Candidate, ConfirmationScheduler, RateBudget
+from utils.stubs import FakeAnthropicServer
+
+
+def _candidates(snapshots, margins: dict[str, float], since_ns: int) -> list[Candidate]:
+    return [Candidate(ConfirmRequest(symbol, snapshots[symbol], "BUY", "ECB holds rates"),
+                      margin, since_ns, symbol)
+            for symbol, margin in margins.items()]
+
+
+def _scheduler(fake: FakeAnthropicServer, **kwargs) -> ConfirmationScheduler:
+    # no cache, so every candidate really goes to the server
+    client = AIAnalysisClient("test-key", cache=ConfirmationCache(0), base_url=fake.url)
+    return ConfirmationScheduler(client, **kwargs)
+
+
+def _sent(fake: FakeAnthropicServer, symbols) -> list[str]:
+    """Pair of every request the server answered, in arrival order."""
+    return [next(s for s in symbols if s in str(body["messages"])) for body in fake.requests]
+
+
+def _collect(scheduler: ConfirmationScheduler, count: int, timeout: float, poll=None) -> list:
+    outcomes = []
+    give_up = time.monotonic() + timeout
+    while len(outcomes) < count and time.monotonic() < give_up:
+        outcomes += scheduler.collect()
+        if poll is not None:
+            poll()
+        time.sleep(0.01)
+    return outcomes
+
+
+def test_candidates_go_out_by_priority(snapshots):
+    margins = {symbol: float(m) for symbol, m in zip(snapshots, (3, 17, -2, 9, 25, 1, 12, 6, 20, 14))}
+    with FakeAnthropicServer(latency=0.01) as fake:
+        scheduler = _scheduler(fake, workers=1, batch_size=1, budget=RateBudget(6000, 10**7))
+        try:
+            outcomes = scheduler.confirm(_candidates(snapshots, margins, time.perf_counter_ns()))
+        finally:
+            scheduler.close()
+    assert {o.status for o in outcomes} == {"ok"}
+    assert _sent(fake, snapshots) == sorted(margins, key=margins.get, reverse=True)
+
+
+def test_rate_limit_shrinks_budget_and_requeues(snapshots):
+    symbols = list(snapshots)[:4]
+    with FakeAnthropicServer(requests_per_minute=2, retry_after=0.2) as fake:
+        # the budget believes in far more than the server allows
+        scheduler = _scheduler(fake, workers=1, batch_size=1, budget=RateBudget(600, 10**7), deadline=10)
+        scheduler.submit(*_candidates(snapshots, dict.fromkeys(symbols, 10.0), time.perf_counter_ns()))
+
+        def lift_limit_after_first_429() -> None:
+            with fake.lock:
+                if fake.rejected:
+                    fake.requests_per_minute = None
+
+        try:
+            outcomes = _collect(scheduler, len(symbols), timeout=8, poll=lift_limit_after_first_429)
+            stats = scheduler.stats()
+        finally:
+            scheduler.close()
+    assert fake.rejected >= 1
+    assert stats["throttles"] >= 1 and stats["rate_scale"] < 1.0
+    # the throttled candidate went back into the queue and was answered later
+    assert sorted(o.symbol for o in outcomes) == sorted(symbols)
+    assert {o.status for o in outcomes} == {"ok"}
+    assert len(fake.requests) == len(symbols)
+
+
+def test_candidates_past_deadline_are_dropped_not_mocked(snapshots):
+    symbols = list(snapshots)[:5]
+    with FakeAnthropicServer(requests_per_minute=1, retry_after=30) as fake:
+        scheduler = _scheduler(fake, workers=2, batch_size=1, budget=RateBudget(600, 10**7), deadline=0.5)
+        try:
+            started = time.monotonic()
+            outcomes = scheduler.confirm(
+                _candidates(snapshots, dict.fromkeys(symbols, 10.0), time.perf_counter_ns()))
+            elapsed = time.monotonic() - started
+            stats = scheduler.stats()
+        finally:
+            scheduler.close()
+    statuses = sorted(o.status for o in outcomes)
+    assert statuses == ["dropped"] * 4 + ["ok"]
+    for outcome in outcomes:
+        if outcome.status == "dropped":
+            assert outcome.bonus == 0
+            assert "Stub" not in outcome.summary and "dropped" in outcome.summary
+    assert stats["dropped"] == 4
+    assert elapsed < 2.0
+
+
+def test_stale_candidate_is_dropped_without_a_request(snapshots):
+    symbol = next(iter(snapshots))
+    with FakeAnthropicServer() as fake:
+        scheduler = _scheduler(fake, deadline=0.5)
+        try:
+            stale = time.perf_counter_ns() - 2 * 10**9
+            outcomes = scheduler.confirm(_candidates(snapshots, {symbol: 10.0}, stale))
+        finally:
+            scheduler.close()
+    assert [o.status for o in outcomes] == ["dropped"]
+    assert fake.requests == []
+
+
+def test_budget_throttle_pauses_and_recovers():
+    now = [0.0]
+    budget = RateBudget(60, 100_000, clock=lambda: now[0])
+    assert budget.delay(100) == 0.0
+    budget.take(100)
+    budget.throttled(retry_after=5.0)
+    assert budget.scale == 0.5
+    assert budget.delay(100) == pytest.approx(5.0)
+    now[0] += 5.0
+    budget.succeeded()
+    assert budget.scale == pytest.approx(0.55)
+    assert budget.delay(100) < 5.0
+
+
+def test_cancelled_speculation_does_not_pile_up_behind_a_backlog(snapshots):
+    real, watched = list(snapshots)[:2], list(snapshots)[2]
+    with FakeAnthropicServer(latency=0.2) as fake:
+        # one request a minute: the first real candidate goes out, the second waits
+        scheduler = _scheduler(fake, workers=1, batch_size=1, budget=RateBudget(1, 10**7), deadline=30)
+        try:
+            scheduler.submit(*_candidates(snapshots, dict.fromkeys(real, 10.0), time.perf_counter_ns()))
+            for margin in [-40.0] + [-30.0, -20.0, -45.0] * 300:
+                # rising toward the gate queues a speculative request, the drop cancels it
+                [candidate] = _candidates(snapshots, {watched: margin}, time.perf_counter_ns())
+                scheduler.observe(candidate, "BUY")
+                scheduler.collect()
+            stats = scheduler.stats()
+            heap = len(scheduler._spec_heap)
+        finally:
+            scheduler.close()
+    assert stats["spec_queued"] == stats["spec_cancelled"] == 300
+    assert stats["queued"] == 1
+    assert heap <= 2
@@ -0,0 +1,86 @@
+"""
+ultra_elite_scalping/tests/test_paper.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : PaperBook fills, win/loss rules and heap bookkeeping.
+"""
+
+import random
+
+import pytest
+
+from core.paper import PaperBook
+from core.pips import pip_size
+
+
+def test_take_profit_and_stop_loss_fill_at_their_levels():
+    book = PaperBook(tp_atr=1.2, sl_atr=0.8)
+    book.open("EURUSD", "BUY", 1.0, 0.001)
+    book.open("EURUSD", "SELL", 1.0, 0.001)
+    assert book.on_tick("EURUSD", 1.0005) == []
+    fills = {f.direction: f for f in book.on_tick("EURUSD", 1.0013, timestamp=42)}
+    assert fills["BUY"].won and fills["BUY"].exit == pytest.approx(1.0012)
+    assert not fills["SELL"].won and fills["SELL"].exit == pytest.approx(1.0008)
+    assert fills["BUY"].pips == pytest.approx(12.0) and fills["SELL"].pips == pytest.approx(-8.0)
+    assert fills["BUY"].closed_ns == 42
+    stats = book.stats()
+    assert (stats.open, stats.wins, stats.losses, stats.pnl_pips) == (0, 1, 1, 4.0)
+    assert stats.win_rate == 50.0
+
+
+@pytest.mark.parametrize("direction", ["BUY", "SELL"])
+def test_bar_touching_both_levels_is_a_loss(direction):
+    book = PaperBook(tp_atr=1.2, sl_atr=0.8)
+    book.open("EURUSD", direction, 1.0, 0.001)
+    [fill] = book.on_tick("EURUSD", high=1.0015, low=0.9985)
+    assert not fill.won
+    assert fill.pips == pytest.approx(-8.0)
+    assert book.stats().losses == 1 and book.open_positions() == 0
+
+
+def test_jpy_pips():
+    assert pip_size("USDJPY") == 0.01
+    assert pip_size("EURUSD") == 0.0001
+    book = PaperBook(tp_atr=1.2, sl_atr=0.8)
+    book.open("USDJPY", "BUY", 150.0, 0.1)
+    [fill] = book.on_tick("USDJPY", 150.2)
+    assert fill.won and fill.pips == pytest.approx(12.0)
+
+
+def test_invalid_signals_open_nothing():
+    book = PaperBook()
+    assert not book.open("EURUSD", "HOLD", 1.0, 0.001)
+    assert not book.open("EURUSD", "BUY", 1.0, 0.0)
+    assert book.open_positions() == 0 and book.on_tick("EURUSD", 1.0) == []
+
+
+def test_compaction_keeps_open_positions_right(monkeypatch):
+    compactions = []
+    compact = PaperBook._compact
+    monkeypatch.setattr(PaperBook, "_compact", staticmethod(lambda pair: compactions.append(compact(pair))))
+    random.seed(3)
+    book = PaperBook(tp_atr=1.2, sl_atr=0.8)
+    atr = 0.001
+    expected = 0
+    for _ in range(2_000):
+        book.open("EURUSD", random.choice(("BUY", "SELL")), 1.0 + random.uniform(-atr, atr), atr)
+        expected += 1
+    price = 1.0
+    closed = 0
+    for _ in range(5_000):
+        price += random.gauss(0.0, 0.1 * atr)
+        fills = book.on_tick("EURUSD", price)
+        closed += len(fills)
+        for fill in fills:
+            if random.random() < 0.3:       # re-open some, as new signals would
+                book.open("EURUSD", fill.direction, price, atr)
+                expected += 1
+        pair = book._books["EURUSD"]
+        live = {id(entry[2]) for entry in pair.rising if entry[2].open}
+        assert book.open_positions("EURUSD") == expected - closed == len(live)
+        # every open position sits in both heaps; anything else is counted stale
+        assert len(pair.rising) + len(pair.falling) == 2 * pair.open + pair.stale
+    stats = book.stats()
+    assert stats.closed == closed > 1_000
+    assert compactions
@@ -0,0 +1,199 @@
+"""
+ultra_elite_scalping/core/timeframes.py
+========================================
+Author  : Ultra Elite Dev Team
+Version : 3.2.0
+Purpose : Incremental multi-timeframe bars built from ticks.
+
+``BarAggregator`` keeps the forming OHLCV bar of every configured
+timeframe for every pair in two flat arrays per pair (bar ends as int64
+ns, OHLCV as float64) and advances all of them with a handful of
+comparisons per tick — no history is scanned and nothing is allocated
+unless a bar closes.  Bars are aligned to the epoch (a 5m bar always
+starts on a multiple of five minutes) and close when the first tick of a
+later period arrives; periods without ticks produce no bar.  Input may be
+raw ticks (open = high = low = close) or finer bars.
+
+``MultiTimeframeEngine`` feeds every closed bar into one IndicatorEngine
+per timeframe and keeps each pair's latest IndicatorSnapshot per timeframe
+for ScoringEngine.score_timeframes().  The first timeframe is the
+decision timeframe: the bot scores a pair when that bar closes.
+
+Usage
+-----
+    TIMEFRAMES=1s,1m,5m,15m python main.py --events
+"""
+
+from array import array
+from typing import NamedTuple
+
+from config.settings import TIMEFRAMES, INDICATOR_WARMUP_BARS
+from core.indicators import IndicatorEngine, IndicatorSnapshot, simulate_bar
+
+_UNITS = {"s": 1_000_000_000, "m": 60_000_000_000, "h": 3_600_000_000_000}
+
+
+class TimeframeBar(NamedTuple):
+    """One closed bar of one timeframe."""
+    symbol:    str
+    timeframe: str
+    open:      float
+    high:      float
+    low:       float
+    close:     float
+    volume:    float
+    timestamp: int                   # bar start, ns since the epoch
+
+    @property
+    def ohlcv(self) -> tuple[float, float, float, float, float]:
+        return self.open, self.high, self.low, self.close, self.volume
+
+
+def parse_timeframes(spec: str) -> dict[str, int]:
+    """``"1s,1m,5m"`` → {"1s": 1e9, "1m": 6e10, "5m": 3e11} (ns), in the given order."""
+    out: dict[str, int] = {}
+    for name in (part.strip() for part in spec.split(",")):
+        if not name:
+            continue
+        count, unit = name[:-1], name[-1:]
+        if unit not in _UNITS or not count.isdigit() or int(count) <= 0:
+            raise ValueError(f"Invalid timeframe {name!r}: expected e.g. 30s, 1m, 4h")
+        out[name] = int(count) * _UNITS[unit]
+    return out
+
+
+class BarAggregator:
+    """
+    Forming bars of several timeframes for many pairs.
+
+    ``update()`` folds one tick (or finer bar) into every timeframe of its
+    pair and returns the bars it closed, shortest timeframe first — an
+    empty tuple on the vast majority of ticks.
+    """
+
+    def __init__(self, timeframes: dict[str, int]) -> None:
+        if not timeframes:
+            raise ValueError("BarAggregator needs at least one timeframe")
+        self.timeframes = dict(timeframes)
+        # (timeframe, index into the end array, offset into the OHLCV array, period ns)
+        self._layout = tuple((name, i, 5 * i, period)
+                             for i, (name, period) in enumerate(self.timeframes.items()))
+        self._ends: dict[str, array] = {}
+        self._bars: dict[str, array] = {}
+        self.ticks = 0
+        self.closed = 0
+
+    def update(
+        self,
+        symbol: str,
+        timestamp: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> tuple[TimeframeBar, ...] | list[TimeframeBar]:
+        self.ticks += 1
+        ends = self._ends.get(symbol)
+        if ends is None:
+            ends = self._ends[symbol] = array("q", bytes(8 * len(self._layout)))
+            self._bars[symbol] = array("d", bytes(40 * len(self._layout)))
+        bars = self._bars[symbol]
+        closed: list[TimeframeBar] | tuple = ()
+        for name, i, j, period in self._layout:
+            end = ends[i]
+            if timestamp < end:
+                # Same period (or a late tick): extend the forming bar
+                if high > bars[j + 1]:
+                    bars[j + 1] = high
+                if low < bars[j + 2]:
+                    bars[j + 2] = low
+                bars[j + 3] = close
+                bars[j + 4] += volume
+                continue
+            if end:
+                if not closed:
+                    closed = []
+                closed.append(TimeframeBar(symbol, name, bars[j], bars[j + 1], bars[j + 2],
+                                           bars[j + 3], bars[j + 4], end - period))
+            ends[i] = timestamp - timestamp % period + period
+            bars[j] = open_
+            bars[j + 1] = high
+            bars[j + 2] = low
+            bars[j + 3] = close
+            bars[j + 4] = volume
+        if closed:
+            self.closed += len(closed)
+        return closed
+
+    def forming(self, symbol: str, timeframe: str) -> TimeframeBar | None:
+        """The not yet closed bar of *symbol* on *timeframe* (None before the first tick)."""
+        ends = self._ends.get(symbol)
+        for name, i, j, period in self._layout:
+            if name == timeframe and ends is not None and ends[i]:
+                b = self._bars[symbol]
+                return TimeframeBar(symbol, name, b[j], b[j + 1], b[j + 2], b[j + 3], b[j + 4],
+                                    ends[i] - period)
+        return None
+
+
+class MultiTimeframeEngine:
+    """
+    BarAggregator + one IndicatorEngine per timeframe.
+
+    ``frames(symbol)`` returns the latest indicators of every
+    timeframe, decision timeframe first, once each has seen
+    INDICATOR_WARMUP_BARS bars.
+    """
+
+    def __init__(self, timeframes: dict[str, int] | str = TIMEFRAMES) -> None:
+        if isinstance(timeframes, str):
+            timeframes = parse_timeframes(timeframes)
+        self.aggregator = BarAggregator(timeframes)
+        self.primary = next(iter(timeframes))
+        self.engines: dict[str, IndicatorEngine] = {tf: IndicatorEngine() for tf in timeframes}
+        self._latest: dict[str, dict[str, IndicatorSnapshot]] = {}
+
+    def update(
+        self,
+        symbol: str,
+        timestamp: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> tuple[TimeframeBar, ...] | list[TimeframeBar]:
+        """Fold one tick in; closed bars advance their timeframe's indicators."""
+        closed = self.aggregator.update(symbol, timestamp, open_, high, low, close, volume)
+        if closed:
+            latest = self._latest.setdefault(symbol, {})
+            for bar in closed:
+                latest[bar.timeframe] = self.engines[bar.timeframe].update(symbol, *bar.ohlcv)
+        return closed
+
+    def ready(self, symbol: str) -> bool:
+        """Every timeframe of *symbol* is warmed up and has indicators."""
+        latest = self._latest.get(symbol, {})
+        return all(
+            tf in latest and engine.bars_seen(symbol) > INDICATOR_WARMUP_BARS
+            for tf, engine in self.engines.items()
+        )
+
+    def frames(self, symbol: str) -> dict[str, IndicatorSnapshot]:
+        """Latest indicators per timeframe, in timeframe order."""
+        latest = self._latest.get(symbol, {})
+        return {tf: latest[tf] for tf in self.engines if tf in latest}
+
+    def seed(self, symbol: str, prices: dict[str, float]) -> None:
+        """Demo mode: warm every timeframe of *symbol* up with random-walk bars."""
+        latest = self._latest.setdefault(symbol, {})
+        for tf, engine in self.engines.items():
+            walk = {symbol: prices[symbol]}          # each timeframe starts at the live price
+            for _ in range(INDICATOR_WARMUP_BARS + 1):
+                latest[tf] = engine.update(symbol, *simulate_bar(symbol, walk))
+
+    def export_state(self, symbol: str) -> dict[str, bytes]:
+        """Rolling indicator state of *symbol* per timeframe (see IndicatorEngine.export_state)."""
+        states = {tf: engine.export_state(symbol) for tf, engine in self.engines.items()}
+        return {tf: blob for tf, blob in states.items() if blob is not None}